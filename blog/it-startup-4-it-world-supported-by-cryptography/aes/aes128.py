@@ -0,0 +1,127 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Tuple
+
+from .aes16 import INV_SBOX, SBOX
+
+KEY_CACHE_SIZE = 256  # Number of expanded keys kept
+ROUNDS = 10
+
+# Round constants for the key schedule
+RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+
+def xtime(a: int) -> int:
+    """Multiply by x (i.e. 2) in GF(2^8)"""
+    a <<= 1
+    return a ^ 0x11B if a & 0x100 else a
+
+
+def gf_multiply(a: int, b: int) -> int:
+    """Multiply two elements of GF(2^8)"""
+    product = 0
+    while b:
+        if b & 1:
+            product ^= a
+        a = xtime(a)
+        b >>= 1
+    return product
+
+
+# GF(2^8) multiplication tables for MixColumns and its inverse
+MUL2, MUL3, MUL9, MUL11, MUL13, MUL14 = (
+    bytes(gf_multiply(x, factor) for x in range(256))
+    for factor in (2, 3, 9, 11, 13, 14)
+)
+
+# ShiftRows on the column-major state of FIPS-197: byte (row, col) is at row + 4 * col
+SHIFT_ROWS = [row + 4 * ((col + row) % 4) for col in range(4) for row in range(4)]
+INV_SHIFT_ROWS = [row + 4 * ((col - row) % 4) for col in range(4) for row in range(4)]
+_shift_rows = itemgetter(*SHIFT_ROWS)
+_inv_shift_rows = itemgetter(*INV_SHIFT_ROWS)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def expand_key(key: bytes) -> Tuple[bytes, ...]:
+    """
+    Expand a 16-byte key into the 11 round keys of AES-128.
+
+    Results are kept in a bounded LRU cache keyed by the key bytes;
+    functools.lru_cache is safe to call from several threads.
+    """
+    if len(key) != 16:
+        raise ValueError("Key must be 16 bytes long.")
+    words = [key[i : i + 4] for i in range(0, 16, 4)]
+    for i in range(4, 4 * (ROUNDS + 1)):
+        word = words[i - 1]
+        if i % 4 == 0:
+            word = (word[1:] + word[:1]).translate(SBOX)  # RotWord, SubWord
+            word = bytes([word[0] ^ RCON[i // 4 - 1]]) + word[1:]
+        words.append(bytes(a ^ b for a, b in zip(words[i - 4], word)))
+    return tuple(b"".join(words[i : i + 4]) for i in range(0, len(words), 4))
+
+
+def _add_round_key(state: bytes, key: bytes) -> bytes:
+    return (int.from_bytes(state, "big") ^ int.from_bytes(key, "big")).to_bytes(
+        16, "big"
+    )
+
+
+def _mix_columns(state: bytes) -> bytes:
+    out: List[int] = []
+    for c in range(0, 16, 4):
+        a0, a1, a2, a3 = state[c : c + 4]
+        out += (
+            MUL2[a0] ^ MUL3[a1] ^ a2 ^ a3,
+            a0 ^ MUL2[a1] ^ MUL3[a2] ^ a3,
+            a0 ^ a1 ^ MUL2[a2] ^ MUL3[a3],
+            MUL3[a0] ^ a1 ^ a2 ^ MUL2[a3],
+        )
+    return bytes(out)
+
+
+def _inv_mix_columns(state: bytes) -> bytes:
+    out: List[int] = []
+    for c in range(0, 16, 4):
+        a0, a1, a2, a3 = state[c : c + 4]
+        out += (
+            MUL14[a0] ^ MUL11[a1] ^ MUL13[a2] ^ MUL9[a3],
+            MUL9[a0] ^ MUL14[a1] ^ MUL11[a2] ^ MUL13[a3],
+            MUL13[a0] ^ MUL9[a1] ^ MUL14[a2] ^ MUL11[a3],
+            MUL11[a0] ^ MUL13[a1] ^ MUL9[a2] ^ MUL14[a3],
+        )
+    return bytes(out)
+
+
+class AES128:
+    """
+    AES-128 (FIPS-197): 10 rounds with key expansion and MixColumns.
+
+    Exposes the same encrypt_block/decrypt_block interface as AES16, so it can
+    be used with the functions of the modes module.
+    """
+
+    def __init__(self, key: bytes):
+        self.round_keys = expand_key(bytes(key))
+
+    def encrypt_block(self, block: bytes) -> bytes:
+        """Encrypt one 16-byte block"""
+        round_keys = self.round_keys
+        state = _add_round_key(block, round_keys[0])
+        for round_key in round_keys[1:ROUNDS]:
+            state = state.translate(SBOX)
+            state = bytes(_shift_rows(state))
+            state = _add_round_key(_mix_columns(state), round_key)
+        state = state.translate(SBOX)
+        state = bytes(_shift_rows(state))
+        return _add_round_key(state, round_keys[ROUNDS])
+
+    def decrypt_block(self, block: bytes) -> bytes:
+        """Decrypt one 16-byte block"""
+        round_keys = self.round_keys
+        state = _add_round_key(block, round_keys[ROUNDS])
+        for round_key in reversed(round_keys[1:ROUNDS]):
+            state = bytes(_inv_shift_rows(state)).translate(INV_SBOX)
+            state = _inv_mix_columns(_add_round_key(state, round_key))
+        state = bytes(_inv_shift_rows(state)).translate(INV_SBOX)
+        return _add_round_key(state, round_keys[0])
@@ -1,6 +1,8 @@
 
 
-from typing import List
+from functools import cached_property
+from operator import itemgetter
+from typing import Callable, List, Optional
 from rich import print
 from rich.table import Table
 
@@ -27,93 +29,166 @@ sbox = [
 # Reverse S-box for decryption
 inv_sbox = [sbox.index(x) for x in range(256)]
 
+# Translation tables for bytes.translate
+SBOX = bytes(sbox)
+INV_SBOX = bytes(inv_sbox)
+
+# ShiftRows as index permutations of the flat, row-major 16-byte state
+SHIFT_ROWS = [row * 4 + (col + row) % 4 for row in range(4) for col in range(4)]
+INV_SHIFT_ROWS = [row * 4 + (col - row) % 4 for row in range(4) for col in range(4)]
+
+# Bytes processed per pass of encrypt_into/decrypt_into; bounds their scratch memory
+INTO_CHUNK_SIZE = 64 * 1024
+
+# Called with (state, step) after every step when tracing is enabled
+Trace = Callable[[bytes, str], None]
+
+
+def print_state(state: bytes, step: str):
+    """Print the state matrix in a readable format"""
+    table = Table(title=step)
+    table.add_column("Column 1")
+    table.add_column("Column 2")
+    table.add_column("Column 3")
+    table.add_column("Column 4")
+    for i in range(0, 16, 4):
+        table.add_row(*[f"{x:02x}" for x in state[i:i + 4]])
+    print(table)
+
+
 class AES16:
-    def __init__(self, key: str):
+    def __init__(self, key: str, trace: Optional[Trace] = None):
         if len(key) != 16:
             raise ValueError("Key must be 16 characters long.")
-        self.key = [ord(char) for char in key]
-
-    def sub_bytes(self, state: List[List[int]], sbox: List[int]) -> List[List[int]]:
-        """Substitute bytes in the state matrix using the S-box"""
-        state = [[sbox[byte] for byte in row] for row in state]
+        self.key = bytes(ord(char) for char in key)
+        self.trace = trace
+        self._key_int = int.from_bytes(self.key, "big")
+        self._shift_rows = itemgetter(*SHIFT_ROWS)
+        self._inv_shift_rows = itemgetter(*INV_SHIFT_ROWS)
+
+    def sub_bytes(self, state: bytes, sbox: bytes) -> bytes:
+        """Substitute bytes in the state using the S-box"""
+        state = state.translate(sbox)
         self.print_state(state, "SubBytes")
         return state
 
-    def shift_rows(self, state: List[List[int]], inverse: bool = False) -> List[List[int]]:
+    def shift_rows(self, state: bytes, inverse: bool = False) -> bytes:
         """Shift rows of the state matrix"""
         if inverse:
-            state[1] = state[1][-1:] + state[1][:-1]  # Rotate second row right
-            state[2] = state[2][-2:] + state[2][:-2]  # Rotate third row right by 2
-            state[3] = state[3][-3:] + state[3][:-3]  # Rotate fourth row right by 3
+            state = bytes(self._inv_shift_rows(state))
         else:
-            state[1] = state[1][1:] + state[1][:1]  # Rotate second row left
-            state[2] = state[2][2:] + state[2][:2]  # Rotate third row left by 2
-            state[3] = state[3][3:] + state[3][:3]  # Rotate fourth row left by 3
+            state = bytes(self._shift_rows(state))
         self.print_state(state, "ShiftRows")
         return state
 
-    def add_round_key(self, state: List[List[int]], key: List[List[int]]) -> List[List[int]]:
-        """XOR the state matrix with the key matrix"""
-        state = [[state[i][j] ^ key[i][j] for j in range(4)] for i in range(4)]
+    def add_round_key(self, state: bytes, key: bytes) -> bytes:
+        """XOR the state with the key"""
+        state = (int.from_bytes(state, "big") ^ int.from_bytes(key, "big")).to_bytes(16, "big")
         self.print_state(state, "AddRoundKey")
         return state
 
+    def encrypt_block(self, block: bytes) -> bytes:
+        """Encrypt one 16-byte block"""
+        if self.trace is not None:
+            self.print_state(block, "Initial State")
+            self.print_state(self.key, "Key Matrix")
+            state = self.add_round_key(block, self.key)
+            state = self.sub_bytes(state, SBOX)
+            state = self.shift_rows(state)
+            return self.add_round_key(state, self.key)
+
+        key = self._key_int
+        state = (int.from_bytes(block, "big") ^ key).to_bytes(16, "big").translate(SBOX)
+        state = bytes(self._shift_rows(state))
+        return (int.from_bytes(state, "big") ^ key).to_bytes(16, "big")
+
+    def decrypt_block(self, block: bytes) -> bytes:
+        """Decrypt one 16-byte block"""
+        if self.trace is not None:
+            self.print_state(block, "Initial State")
+            self.print_state(self.key, "Key Matrix")
+            state = self.add_round_key(block, self.key)
+            state = self.shift_rows(state, inverse=True)
+            state = self.sub_bytes(state, INV_SBOX)
+            return self.add_round_key(state, self.key)
+
+        key = self._key_int
+        state = (int.from_bytes(block, "big") ^ key).to_bytes(16, "big")
+        state = bytes(self._inv_shift_rows(state)).translate(INV_SBOX)
+        return (int.from_bytes(state, "big") ^ key).to_bytes(16, "big")
+
     def encrypt(self, plaintext: str) -> List[int]:
         """Encrypt the plaintext"""
         if len(plaintext) != 16:
             raise ValueError("Plaintext must be 16 characters long.")
-        state = [[ord(plaintext[i * 4 + j]) for j in range(4)] for i in range(4)]
-        key_matrix = [[self.key[i * 4 + j] for j in range(4)] for i in range(4)]
-
-        print("[bold]Initial State[/bold]")
-        self.print_state(state, "Initial State")
-        self.print_state(key_matrix, "Key Matrix")
-
-        state = self.add_round_key(state, key_matrix)
-        state = self.sub_bytes(state, sbox)
-        state = self.shift_rows(state)
-        state = self.add_round_key(state, key_matrix)
-
-        encrypted = [byte for row in state for byte in row]
-        print(f"[bold]Encrypted: {encrypted}[/bold]")
-        return encrypted
+        return list(self.encrypt_block(bytes(ord(char) for char in plaintext)))
 
     def decrypt(self, ciphertext: List[int]) -> str:
         """Decrypt the ciphertext"""
         if len(ciphertext) != 16:
             raise ValueError("Ciphertext must be a list of 16 integers.")
-        state = [ciphertext[i:i + 4] for i in range(0, 16, 4)]
-        key_matrix = [[self.key[i * 4 + j] for j in range(4)] for i in range(4)]
-
-        print("[bold]Initial State (Ciphertext)[/bold]")
-        self.print_state(state, "Initial State")
-        self.print_state(key_matrix, "Key Matrix")
-
-        state = self.add_round_key(state, key_matrix)
-        state = self.shift_rows(state, inverse=True)
-        state = self.sub_bytes(state, inv_sbox)
-        state = self.add_round_key(state, key_matrix)
-
-        decrypted = ''.join(chr(byte) for row in state for byte in row)
-        print(f"[bold]Decrypted: {decrypted}[/bold]")
-        return decrypted
-
-    def print_state(self, state: List[List[int]], step: str):
-        """Print the state matrix in a readable format"""
-        table = Table(title=step)
-        table.add_column("Column 1")
-        table.add_column("Column 2")
-        table.add_column("Column 3")
-        table.add_column("Column 4")
-        for row in state:
-            table.add_row(*[f"{x:02x}" for x in row])
-        print(table)
+        return "".join(chr(byte) for byte in self.decrypt_block(bytes(ciphertext)))
+
+    @cached_property
+    def _encrypt_tables(self) -> List[bytes]:
+        """Per output byte i: x -> sbox[x ^ key[SHIFT_ROWS[i]]] ^ key[i]"""
+        return [
+            bytes(sbox[x ^ self.key[SHIFT_ROWS[i]]] ^ self.key[i] for x in range(256))
+            for i in range(16)
+        ]
+
+    @cached_property
+    def _decrypt_tables(self) -> List[bytes]:
+        """Per output byte i: x -> inv_sbox[x ^ key[INV_SHIFT_ROWS[i]]] ^ key[i]"""
+        return [
+            bytes(inv_sbox[x ^ self.key[INV_SHIFT_ROWS[i]]] ^ self.key[i] for x in range(256))
+            for i in range(16)
+        ]
+
+    def _translate_into(self, src, dst, tables: List[bytes], sources: List[int]):
+        """
+        Run the whole cipher over src into dst, one byte column at a time.
+
+        Byte i of every block is computed from byte sources[i] of the same
+        block through tables[i], so each 16-byte-strided column of a chunk is
+        a single bytes.translate. All columns of a chunk are read before any
+        is written, which makes src is dst safe.
+        """
+        with memoryview(src) as src_view, memoryview(dst) as dst_view:
+            src_view, dst_view = src_view.cast("B"), dst_view.cast("B")
+            size = len(src_view)
+            if size % 16:
+                raise ValueError("Data must be a multiple of 16 bytes long.")
+            if len(dst_view) != size:
+                raise ValueError("Destination must be as long as the source.")
+            for start in range(0, size, INTO_CHUNK_SIZE):
+                end = min(start + INTO_CHUNK_SIZE, size)
+                columns = [
+                    src_view[start + sources[i] : end : 16].tobytes().translate(tables[i])
+                    for i in range(16)
+                ]
+                for i, column in enumerate(columns):
+                    dst_view[start + i : end : 16] = column
+
+    def encrypt_into(self, src, dst):
+        """Encrypt the blocks of buffer src into buffer dst (may be the same buffer)"""
+        self._translate_into(src, dst, self._encrypt_tables, SHIFT_ROWS)
+
+    def decrypt_into(self, src, dst):
+        """Decrypt the blocks of buffer src into buffer dst (may be the same buffer)"""
+        self._translate_into(src, dst, self._decrypt_tables, INV_SHIFT_ROWS)
+
+    def print_state(self, state: bytes, step: str):
+        """Pass the state to the trace callback, if any"""
+        if self.trace is not None:
+            self.trace(state, step)
 
 # Example usage
 if __name__ == "__main__":
     key = "a" * 16
-    aes16 = AES16(key)
+    aes16 = AES16(key, trace=print_state)
     plaintext = "simpleplaintext!"
     encrypted = aes16.encrypt(plaintext)
+    print(f"[bold]Encrypted: {encrypted}[/bold]")
     decrypted = aes16.decrypt(encrypted)
-
+    print(f"[bold]Decrypted: {decrypted}[/bold]")
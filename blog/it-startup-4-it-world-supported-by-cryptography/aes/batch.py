@@ -0,0 +1,45 @@
+import numpy as np
+
+from .aes16 import AES16, INV_SHIFT_ROWS, SHIFT_ROWS, inv_sbox, sbox
+
+SBOX_ARRAY = np.array(sbox, dtype=np.uint8)
+INV_SBOX_ARRAY = np.array(inv_sbox, dtype=np.uint8)
+SHIFT_ROWS_ARRAY = np.array(SHIFT_ROWS)
+INV_SHIFT_ROWS_ARRAY = np.array(INV_SHIFT_ROWS)
+
+
+def as_blocks(data: bytes) -> np.ndarray:
+    """View data (a multiple of 16 bytes) as an (N, 16) uint8 array"""
+    if len(data) % 16:
+        raise ValueError("Data must be a multiple of 16 bytes long.")
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 16)
+
+
+class BatchAES16:
+    """
+    AES16 over N blocks at once.
+
+    Blocks are rows of an (N, 16) uint8 array: SubBytes is a fancy index into
+    the S-box, ShiftRows a column permutation and AddRoundKey a broadcast XOR.
+    """
+
+    def __init__(self, key: str):
+        self.key = np.frombuffer(AES16(key).key, dtype=np.uint8)
+
+    def encrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """Encrypt an (N, 16) uint8 array of blocks"""
+        state = SBOX_ARRAY[blocks ^ self.key]
+        return state[:, SHIFT_ROWS_ARRAY] ^ self.key
+
+    def decrypt(self, blocks: np.ndarray) -> np.ndarray:
+        """Decrypt an (N, 16) uint8 array of blocks"""
+        state = (blocks ^ self.key)[:, INV_SHIFT_ROWS_ARRAY]
+        return INV_SBOX_ARRAY[state] ^ self.key
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt data of a multiple of 16 bytes, block by block (ECB)"""
+        return self.encrypt(as_blocks(data)).tobytes()
+
+    def decrypt_bytes(self, data: bytes) -> bytes:
+        """Decrypt data of a multiple of 16 bytes, block by block (ECB)"""
+        return self.decrypt(as_blocks(data)).tobytes()
@@ -0,0 +1,28 @@
+import time
+
+from .aes128 import AES128, expand_key
+
+
+def main():
+    # Run from the parent directory: python -m aes.bench_aes128
+    key = bytes(range(16))
+    block = bytes(16)
+    requests = 20_000
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        expand_key.cache_clear()
+        AES128(key).encrypt_block(block)
+    cold = requests / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        AES128(key).encrypt_block(block)
+    warm = requests / (time.perf_counter() - start)
+
+    print(f"cold key (expand every time): {cold:10,.0f} requests/s")
+    print(f"warm key (cached schedule):   {warm:10,.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import contextlib
+import io
+import time
+
+from .aes16 import AES16, print_state
+
+
+def blocks_per_second(aes16: AES16, blocks: int) -> float:
+    plaintext = "simpleplaintext!"
+    start = time.perf_counter()
+    for _ in range(blocks):
+        aes16.decrypt(aes16.encrypt(plaintext))
+    return blocks / (time.perf_counter() - start)
+
+
+def main():
+    # Run from the parent directory: python -m aes.bench_aes16
+    # Each block is encrypted and decrypted once
+    key = "a" * 16
+    with contextlib.redirect_stdout(io.StringIO()):
+        traced = blocks_per_second(AES16(key, trace=print_state), 200)
+    silent = blocks_per_second(AES16(key), 200_000)
+    print(f"traced (rich tables): {traced:12,.0f} blocks/s")
+    print(f"silent:               {silent:12,.0f} blocks/s")
+    print(f"speedup:              {silent / traced:12.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import random
+import time
+
+from .aes16 import AES16
+from .batch import BatchAES16, as_blocks
+
+
+def main():
+    # Run from the parent directory: python -m aes.bench_batch
+    key = "0123456789abcdef"
+    data = random.Random(0).randbytes(16 * 100_000)
+    blocks = len(data) // 16
+
+    scalar = AES16(key)
+    start = time.perf_counter()
+    for i in range(0, len(data), 16):
+        scalar.encrypt_block(data[i : i + 16])
+    scalar_rate = blocks / (time.perf_counter() - start)
+
+    batch = BatchAES16(key)
+    array = as_blocks(data)
+    start = time.perf_counter()
+    batch.encrypt(array)
+    batch_rate = blocks / (time.perf_counter() - start)
+
+    print(f"AES16.encrypt_block: {scalar_rate:14,.0f} blocks/s")
+    print(f"BatchAES16.encrypt:  {batch_rate:14,.0f} blocks/s")
+    print(f"speedup:             {batch_rate / scalar_rate:14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
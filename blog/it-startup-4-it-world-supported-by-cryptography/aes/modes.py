@@ -0,0 +1,243 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from .aes16 import AES16
+
+BLOCK_SIZE = 16
+MODES = ("ECB", "CBC", "CTR")
+MIN_PARALLEL_BLOCKS = 1024  # Smaller payloads are not worth a process pool
+
+
+def xor_bytes(a: bytes, b: bytes) -> bytes:
+    """XOR two byte strings of the same length"""
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(len(a), "big")
+
+
+def pkcs7_pad(data: bytes, block_size: int = BLOCK_SIZE) -> bytes:
+    """Pad data to a multiple of block_size (PKCS#7)"""
+    length = block_size - len(data) % block_size
+    return bytes(data) + bytes([length]) * length
+
+
+def pkcs7_unpad(data: bytes, block_size: int = BLOCK_SIZE) -> bytes:
+    """Remove PKCS#7 padding, checking that it is well formed"""
+    if not data or len(data) % block_size:
+        raise ValueError("Padded data must be a non-empty multiple of the block size.")
+    length = data[-1]
+    if not 1 <= length <= block_size or data[-length:] != bytes([length]) * length:
+        raise ValueError("Invalid PKCS#7 padding.")
+    return data[:-length]
+
+
+def _ecb_encrypt(cipher: AES16, data: bytes, _) -> bytes:
+    encrypt = cipher.encrypt_block
+    return b"".join(
+        encrypt(data[i : i + BLOCK_SIZE]) for i in range(0, len(data), BLOCK_SIZE)
+    )
+
+
+def _ecb_decrypt(cipher: AES16, data: bytes, _) -> bytes:
+    decrypt = cipher.decrypt_block
+    return b"".join(
+        decrypt(data[i : i + BLOCK_SIZE]) for i in range(0, len(data), BLOCK_SIZE)
+    )
+
+
+def _cbc_encrypt(cipher: AES16, data: bytes, previous: bytes) -> bytes:
+    encrypt = cipher.encrypt_block
+    out = []
+    for i in range(0, len(data), BLOCK_SIZE):
+        previous = encrypt(xor_bytes(data[i : i + BLOCK_SIZE], previous))
+        out.append(previous)
+    return b"".join(out)
+
+
+def _cbc_decrypt(cipher: AES16, data: bytes, previous: bytes) -> bytes:
+    """Each plaintext block only needs its own and the previous ciphertext block"""
+    chained = previous + data[:-BLOCK_SIZE]
+    return xor_bytes(_ecb_decrypt(cipher, data, None), chained)
+
+
+def _ctr_xor(cipher: AES16, data: bytes, counter: int) -> bytes:
+    """XOR data with the keystream starting at counter block `counter`"""
+    encrypt = cipher.encrypt_block
+    blocks = -(-len(data) // BLOCK_SIZE)
+    keystream = b"".join(
+        encrypt(((counter + i) % (1 << 128)).to_bytes(BLOCK_SIZE, "big"))
+        for i in range(blocks)
+    )
+    return xor_bytes(data, keystream[: len(data)])
+
+
+def _run(
+    fn: Callable[[AES16, bytes, object], bytes],
+    cipher: AES16,
+    data: bytes,
+    arg_at: Callable[[int], object],
+    workers: int,
+) -> bytes:
+    """
+    Apply fn to data, split into block-aligned chunks across a process pool.
+
+    Args:
+        fn: The chunk function, called as fn(cipher, chunk, arg_at(offset)).
+        cipher (AES16): The block cipher; it must not have a trace callback.
+        data (bytes): The input.
+        arg_at: The per-chunk argument for a chunk starting at `offset`.
+        workers (int): The number of worker processes; 1 runs in this process.
+    """
+    blocks = -(-len(data) // BLOCK_SIZE)
+    if workers <= 1 or blocks < MIN_PARALLEL_BLOCKS:
+        return fn(cipher, data, arg_at(0))
+    step = -(-blocks // workers) * BLOCK_SIZE
+    offsets = range(0, len(data), step)
+    chunks = [data[offset : offset + step] for offset in offsets]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(fn, [cipher] * len(chunks), chunks, map(arg_at, offsets))
+        return b"".join(results)
+
+
+def _check_mode(mode: str, iv: Optional[bytes]) -> None:
+    if mode not in MODES:
+        raise ValueError(f"Mode must be one of {MODES}.")
+    if mode != "ECB" and (iv is None or len(iv) != BLOCK_SIZE):
+        raise ValueError(f"{mode} mode needs a 16-byte IV.")
+
+
+def encrypt_bytes(
+    cipher: AES16,
+    data: bytes,
+    mode: str = "CBC",
+    iv: Optional[bytes] = None,
+    workers: int = 1,
+) -> bytes:
+    """
+    Encrypt data of any length.
+
+    ECB and CBC pad with PKCS#7; CTR does not pad and uses `iv` as the first
+    counter block. ECB and CTR split the work across `workers` processes;
+    CBC encryption is sequential by construction.
+    """
+    _check_mode(mode, iv)
+    data = bytes(data)
+    if mode == "ECB":
+        return _run(_ecb_encrypt, cipher, pkcs7_pad(data), lambda offset: None, workers)
+    if mode == "CBC":
+        return _cbc_encrypt(cipher, pkcs7_pad(data), iv)
+    counter = int.from_bytes(iv, "big")
+    return _run(
+        _ctr_xor, cipher, data, lambda offset: counter + offset // BLOCK_SIZE, workers
+    )
+
+
+def decrypt_bytes(
+    cipher: AES16,
+    data: bytes,
+    mode: str = "CBC",
+    iv: Optional[bytes] = None,
+    workers: int = 1,
+) -> bytes:
+    """
+    Decrypt data produced by encrypt_bytes.
+
+    All three modes split the work across `workers` processes: a CBC
+    plaintext block only depends on two ciphertext blocks, never on the
+    previous plaintext.
+    """
+    _check_mode(mode, iv)
+    data = bytes(data)
+    if mode != "CTR" and len(data) % BLOCK_SIZE:
+        raise ValueError(f"{mode} ciphertext must be a multiple of the block size.")
+    if mode == "ECB":
+        return pkcs7_unpad(
+            _run(_ecb_decrypt, cipher, data, lambda offset: None, workers)
+        )
+    if mode == "CBC":
+
+        def previous(offset: int) -> bytes:
+            return data[offset - BLOCK_SIZE : offset] if offset else iv
+
+        return pkcs7_unpad(_run(_cbc_decrypt, cipher, data, previous, workers))
+    counter = int.from_bytes(iv, "big")
+    return _run(
+        _ctr_xor, cipher, data, lambda offset: counter + offset // BLOCK_SIZE, workers
+    )
+
+
+class StreamEncryptor:
+    """
+    Encrypt chunked input in constant memory.
+
+    `update()` returns the ciphertext of every complete block received so far;
+    `finalize()` pads (ECB, CBC) or flushes the partial block (CTR).
+    """
+
+    def __init__(self, cipher: AES16, mode: str = "CBC", iv: Optional[bytes] = None):
+        _check_mode(mode, iv)
+        self.cipher = cipher
+        self.mode = mode
+        self.previous = iv
+        self.counter = int.from_bytes(iv, "big") if iv else 0
+        self.buffer = bytearray()
+
+    def _process(self, blocks: bytes) -> bytes:
+        if self.mode == "ECB":
+            return _ecb_encrypt(self.cipher, blocks, None)
+        if self.mode == "CBC":
+            out = _cbc_encrypt(self.cipher, blocks, self.previous)
+            self.previous = out[-BLOCK_SIZE:]
+            return out
+        out = _ctr_xor(self.cipher, blocks, self.counter)
+        self.counter += len(blocks) // BLOCK_SIZE
+        return out
+
+    def _take(self, keep: int = 0) -> bytes:
+        """Remove the complete blocks from the buffer, leaving at least `keep` bytes"""
+        size = max(len(self.buffer) - keep, 0) // BLOCK_SIZE * BLOCK_SIZE
+        blocks = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return blocks
+
+    def update(self, data: bytes) -> bytes:
+        self.buffer += data
+        blocks = self._take()
+        return self._process(blocks) if blocks else b""
+
+    def finalize(self) -> bytes:
+        tail = bytes(self.buffer)
+        self.buffer.clear()
+        if self.mode == "CTR":
+            return _ctr_xor(self.cipher, tail, self.counter) if tail else b""
+        return self._process(pkcs7_pad(tail))
+
+
+class StreamDecryptor(StreamEncryptor):
+    """
+    Decrypt chunked input in constant memory.
+
+    For ECB and CBC the last block is held back until `finalize()`, which
+    strips the padding.
+    """
+
+    def _process(self, blocks: bytes) -> bytes:
+        if self.mode == "ECB":
+            return _ecb_decrypt(self.cipher, blocks, None)
+        if self.mode == "CBC":
+            out = _cbc_decrypt(self.cipher, blocks, self.previous)
+            self.previous = blocks[-BLOCK_SIZE:]
+            return out
+        return super()._process(blocks)
+
+    def update(self, data: bytes) -> bytes:
+        self.buffer += data
+        blocks = self._take(keep=0 if self.mode == "CTR" else 1)
+        return self._process(blocks) if blocks else b""
+
+    def finalize(self) -> bytes:
+        if self.mode == "CTR":
+            return super().finalize()
+        tail = bytes(self.buffer)
+        self.buffer.clear()
+        if len(tail) != BLOCK_SIZE:
+            raise ValueError("Ciphertext must be a multiple of the block size.")
+        return pkcs7_unpad(self._process(tail))
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from .aes128 import AES128, expand_key, gf_multiply
+
+
+def test_gf_multiply():
+    # FIPS-197 section 4.2
+    assert gf_multiply(0x57, 0x83) == 0xC1
+    assert gf_multiply(0x57, 0x13) == 0xFE
+
+
+def test_expand_key():
+    # FIPS-197 appendix A.1
+    round_keys = expand_key(bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c"))
+    assert len(round_keys) == 11
+    assert round_keys[1].hex() == "a0fafe1788542cb123a339392a6c7605"
+    assert round_keys[10].hex() == "d014f9a8c9ee2589e13f0cc8b6630ca6"
+
+
+@pytest.mark.parametrize(
+    "key, plaintext, ciphertext",
+    [
+        # FIPS-197 appendix B
+        (
+            "2b7e151628aed2a6abf7158809cf4f3c",
+            "3243f6a8885a308d313198a2e0370734",
+            "3925841d02dc09fbdc118597196a0b32",
+        ),
+        # FIPS-197 appendix C.1
+        (
+            "000102030405060708090a0b0c0d0e0f",
+            "00112233445566778899aabbccddeeff",
+            "69c4e0d86a7b0430d8cdb78070b4c55a",
+        ),
+    ],
+)
+def test_fips197_vectors(key, plaintext, ciphertext):
+    aes = AES128(bytes.fromhex(key))
+    assert aes.encrypt_block(bytes.fromhex(plaintext)).hex() == ciphertext
+    assert aes.decrypt_block(bytes.fromhex(ciphertext)).hex() == plaintext
+
+
+def test_expanded_keys_are_cached():
+    expand_key.cache_clear()
+    key = bytes(range(16))
+    assert AES128(key).round_keys is AES128(key).round_keys
+    assert expand_key.cache_info().hits == 1
+
+
+def test_cache_from_many_threads():
+    expand_key.cache_clear()
+    keys = [bytes([i]) * 16 for i in range(8)]
+    results = {}
+
+    def worker(n):
+        for key in keys * 10:
+            results[(n, key)] = AES128(key).encrypt_block(bytes(16))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for key in keys:
+        assert len({results[(n, key)] for n in range(4)}) == 1
+
+
+def test_invalid_key():
+    with pytest.raises(ValueError):
+        AES128(b"short")
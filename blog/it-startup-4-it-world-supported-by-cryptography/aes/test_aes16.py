@@ -0,0 +1,112 @@
+import mmap
+
+import pytest
+
+from . import aes16 as aes16_module
+from .aes16 import AES16, SHIFT_ROWS, INV_SHIFT_ROWS
+
+# Outputs of the original list-of-lists implementation
+VECTORS = [
+    (
+        "a" * 16,
+        "simpleplaintext!",
+        [168, 81, 159, 227, 147, 227, 182, 182, 23, 56, 2, 81, 104, 147, 181, 56],
+    ),
+    (
+        "0123456789abcdef",
+        "Two One Nine Two",
+        [115, 107, 126, 78, 13, 216, 198, 22, 78, 252, 89, 49, 98, 126, 97, 175],
+    ),
+]
+
+
+def test_shift_rows_permutations_are_inverse():
+    assert [SHIFT_ROWS[i] for i in INV_SHIFT_ROWS] == list(range(16))
+    assert SHIFT_ROWS[4:8] == [5, 6, 7, 4]  # Second row rotated left by one
+
+
+@pytest.mark.parametrize("key, plaintext, ciphertext", VECTORS)
+def test_encrypt_decrypt(key, plaintext, ciphertext):
+    aes16 = AES16(key)
+    assert aes16.encrypt(plaintext) == ciphertext
+    assert aes16.decrypt(ciphertext) == plaintext
+
+
+@pytest.mark.parametrize("key, plaintext, ciphertext", VECTORS)
+def test_traced_path_matches_fast_path(key, plaintext, ciphertext):
+    steps = []
+    aes16 = AES16(key, trace=lambda state, step: steps.append(step))
+    assert aes16.encrypt(plaintext) == ciphertext
+    assert steps == [
+        "Initial State",
+        "Key Matrix",
+        "AddRoundKey",
+        "SubBytes",
+        "ShiftRows",
+        "AddRoundKey",
+    ]
+    assert aes16.decrypt(ciphertext) == plaintext
+
+
+def test_block_api():
+    aes16 = AES16("k" * 16)
+    block = bytes(range(16))
+    assert aes16.decrypt_block(aes16.encrypt_block(block)) == block
+
+
+def test_invalid_lengths():
+    with pytest.raises(ValueError):
+        AES16("short")
+    with pytest.raises(ValueError):
+        AES16("a" * 16).encrypt("short")
+    with pytest.raises(ValueError):
+        AES16("a" * 16).decrypt([0] * 15)
+
+
+def test_encrypt_into_matches_block_api(monkeypatch):
+    monkeypatch.setattr(aes16_module, "INTO_CHUNK_SIZE", 64)  # Cover several chunks
+    aes16 = AES16("0123456789abcdef")
+    data = bytes(range(256)) * 2
+    expected = b"".join(
+        aes16.encrypt_block(data[i : i + 16]) for i in range(0, 512, 16)
+    )
+
+    dst = bytearray(len(data))
+    aes16.encrypt_into(data, dst)
+    assert dst == expected
+
+    back = bytearray(len(data))
+    aes16.decrypt_into(memoryview(dst), back)
+    assert back == data
+
+
+def test_encrypt_into_in_place():
+    aes16 = AES16("0123456789abcdef")
+    data = bytes(range(256))
+    buffer = bytearray(data)
+    aes16.encrypt_into(buffer, buffer)
+    assert buffer == b"".join(
+        aes16.encrypt_block(data[i : i + 16]) for i in range(0, 256, 16)
+    )
+    view = memoryview(buffer)[32:96]
+    aes16.decrypt_into(view, view)
+    assert buffer[32:96] == data[32:96]
+
+
+def test_encrypt_into_mmap():
+    aes16 = AES16("0123456789abcdef")
+    with mmap.mmap(-1, 4096) as ring:
+        ring[:] = bytes(range(256)) * 16
+        aes16.encrypt_into(ring, ring)
+        aes16.decrypt_into(ring, ring)
+        assert ring[:] == bytes(range(256)) * 16
+
+
+def test_encrypt_into_invalid_buffers():
+    aes16 = AES16("0123456789abcdef")
+    with pytest.raises(ValueError):
+        aes16.encrypt_into(bytes(17), bytearray(17))
+    with pytest.raises(ValueError):
+        aes16.encrypt_into(bytes(16), bytearray(32))
+    with pytest.raises(TypeError):
+        aes16.encrypt_into(bytes(16), bytes(16))
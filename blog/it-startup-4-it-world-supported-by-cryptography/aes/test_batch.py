@@ -0,0 +1,34 @@
+import random
+
+import numpy as np
+import pytest
+
+from .aes16 import AES16
+from .batch import BatchAES16, as_blocks
+
+KEY = "0123456789abcdef"
+
+
+def test_batch_matches_scalar():
+    data = random.Random(0).randbytes(16 * 100)
+    scalar = AES16(KEY)
+    batch = BatchAES16(KEY)
+    expected = b"".join(
+        scalar.encrypt_block(data[i : i + 16]) for i in range(0, len(data), 16)
+    )
+    assert batch.encrypt_bytes(data) == expected
+    assert batch.decrypt_bytes(expected) == data
+
+
+def test_batch_matches_str_api():
+    plaintext = "simpleplaintext!"
+    blocks = as_blocks(plaintext.encode())
+    encrypted = BatchAES16("a" * 16).encrypt(blocks)
+    assert encrypted[0].tolist() == AES16("a" * 16).encrypt(plaintext)
+
+
+def test_batch_empty_and_invalid():
+    batch = BatchAES16(KEY)
+    assert batch.encrypt(np.zeros((0, 16), dtype=np.uint8)).shape == (0, 16)
+    with pytest.raises(ValueError):
+        batch.encrypt_bytes(b"a" * 17)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from . import modes
+from .aes16 import AES16
+from .modes import (
+    StreamDecryptor,
+    StreamEncryptor,
+    decrypt_bytes,
+    encrypt_bytes,
+    pkcs7_pad,
+    pkcs7_unpad,
+)
+
+IV = bytes(range(16))
+
+
+@pytest.fixture
+def cipher():
+    return AES16("0123456789abcdef")
+
+
+def test_pkcs7():
+    assert pkcs7_pad(b"") == b"\x10" * 16
+    assert pkcs7_pad(b"abc") == b"abc" + b"\x0d" * 13
+    assert pkcs7_unpad(pkcs7_pad(b"a" * 16)) == b"a" * 16
+    with pytest.raises(ValueError):
+        pkcs7_unpad(b"a" * 15 + b"\x02")
+    with pytest.raises(ValueError):
+        pkcs7_unpad(b"a" * 15)
+
+
+@pytest.mark.parametrize("mode", modes.MODES)
+@pytest.mark.parametrize("length", [0, 1, 15, 16, 17, 100])
+def test_round_trip(cipher, mode, length):
+    data = random.Random(length).randbytes(length)
+    ciphertext = encrypt_bytes(cipher, data, mode, IV)
+    assert decrypt_bytes(cipher, ciphertext, mode, IV) == data
+    if mode == "CTR":
+        assert len(ciphertext) == length
+    else:
+        assert len(ciphertext) == (length // 16 + 1) * 16
+
+
+def test_modes_against_block_cipher(cipher):
+    block = b"Two One Nine Two"
+    ecb = encrypt_bytes(cipher, block, "ECB")
+    assert ecb[:16] == cipher.encrypt_block(block)
+    cbc = encrypt_bytes(cipher, block, "CBC", IV)
+    assert cbc[:16] == cipher.encrypt_block(bytes(a ^ b for a, b in zip(block, IV)))
+    ctr = encrypt_bytes(cipher, block, "CTR", IV)
+    assert ctr == bytes(a ^ b for a, b in zip(block, cipher.encrypt_block(IV)))
+
+
+def test_ctr_counter_wraps(cipher):
+    iv = b"\xff" * 16
+    ciphertext = encrypt_bytes(cipher, b"a" * 32, "CTR", iv)
+    assert ciphertext[16:] == bytes(
+        a ^ b for a, b in zip(b"a" * 16, cipher.encrypt_block(bytes(16)))
+    )
+
+
+def test_invalid_arguments(cipher):
+    with pytest.raises(ValueError):
+        encrypt_bytes(cipher, b"data", "OFB", IV)
+    with pytest.raises(ValueError):
+        encrypt_bytes(cipher, b"data", "CBC")
+    with pytest.raises(ValueError):
+        decrypt_bytes(cipher, b"a" * 17, "CBC", IV)
+    with pytest.raises(ValueError):
+        decrypt_bytes(cipher, b"a" * 17, "ECB")
+
+
+@pytest.mark.parametrize("mode", modes.MODES)
+def test_parallel_matches_sequential(cipher, monkeypatch, mode):
+    monkeypatch.setattr(modes, "MIN_PARALLEL_BLOCKS", 4)
+    data = random.Random(0).randbytes(1000)
+    sequential = encrypt_bytes(cipher, data, mode, IV)
+    assert encrypt_bytes(cipher, data, mode, IV, workers=3) == sequential
+    assert decrypt_bytes(cipher, sequential, mode, IV, workers=3) == data
+
+
+@pytest.mark.parametrize("mode", modes.MODES)
+def test_stream_matches_one_shot(cipher, mode):
+    rng = random.Random(1)
+    data = rng.randbytes(500)
+    encryptor = StreamEncryptor(cipher, mode, IV)
+    ciphertext = b""
+    offset = 0
+    while offset < len(data):
+        size = rng.randrange(0, 40)
+        ciphertext += encryptor.update(data[offset : offset + size])
+        offset += size
+    ciphertext += encryptor.finalize()
+    assert ciphertext == encrypt_bytes(cipher, data, mode, IV)
+
+    decryptor = StreamDecryptor(cipher, mode, IV)
+    plaintext = b"".join(
+        decryptor.update(ciphertext[i : i + 7]) for i in range(0, len(ciphertext), 7)
+    )
+    assert plaintext + decryptor.finalize() == data
@@ -0,0 +1,53 @@
+import contextlib
+import io
+import random
+import string
+import time
+
+from .enigma import Enigma, Plugboard, Reflector, Rotor
+
+
+def build_enigma(trace=None) -> Enigma:
+    plugboard = Plugboard([("A", "Z"), ("S", "O")])
+    rotors = [
+        Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q"),
+        Rotor("AJDKSIRUXBLHWTMCQGZNPYFVOE", "E"),
+        Rotor("BDFHJLCPRTXVZNYEIWGAKMUSQO", "V"),
+    ]
+    return Enigma(plugboard, rotors, Reflector("YRUHQSLDPXNGOKMIEBFZCWVJAT"), trace)
+
+
+def chars_per_second(enigma: Enigma, text: str) -> float:
+    start = time.perf_counter()
+    enigma.encipher(text)
+    return len(text) / (time.perf_counter() - start)
+
+
+def main():
+    # Run from the parent directory: python -m enigma.bench_enigma
+    rng = random.Random(0)
+    text = "".join(rng.choice(string.ascii_uppercase) for _ in range(2_000_000))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        traced = chars_per_second(build_enigma(trace=print), text[:20_000])
+    step_by_step = chars_per_second(
+        build_enigma(trace=lambda line: None), text[:100_000]
+    )
+
+    enigma = build_enigma()
+    start = time.perf_counter()
+    enigma.compile()
+    compile_time = time.perf_counter() - start
+    compiled = chars_per_second(enigma, text[:30_000])  # Below the bulk threshold
+    bulk = chars_per_second(enigma, text)
+
+    print(f"traced (print):    {traced:12,.0f} chars/s")
+    print(f"step by step:      {step_by_step:12,.0f} chars/s")
+    print(
+        f"compiled tables:   {compiled:12,.0f} chars/s (compile: {compile_time:.2f}s)"
+    )
+    print(f"bulk translate:    {bulk:12,.0f} chars/s")
+
+
+if __name__ == "__main__":
+    main()
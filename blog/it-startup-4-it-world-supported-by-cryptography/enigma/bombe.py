@@ -0,0 +1,297 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, permutations
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .enigma import ALPHABET, Enigma, Plugboard, Reflector, Rotor
+
+# (start position, letter) cells scored per vectorized batch; the number of start
+# positions per batch shrinks as the ciphertext grows, bounding memory
+BATCH_CELLS = 1 << 21
+
+
+class Candidate(NamedTuple):
+    score: float
+    rotor_order: Tuple[int, ...]  # Indexes into the rotor set, fastest rotor first
+    positions: Tuple[int, ...]  # Start positions, fastest rotor first
+    plugboard: Tuple[Tuple[str, str], ...]
+    plaintext: str
+
+
+class SearchResult(NamedTuple):
+    candidates: List[Candidate]
+    keys_tried: int
+    elapsed: float
+
+    @property
+    def keys_per_second(self) -> float:
+        return self.keys_tried / self.elapsed if self.elapsed else 0.0
+
+
+def build_machine(
+    candidate: Candidate, rotor_set: Sequence[Rotor], reflector: Reflector
+) -> Enigma:
+    """Build an Enigma set up with the key of `candidate`."""
+    rotors = [
+        Rotor(rotor_set[i].wiring, rotor_set[i].notch, position)
+        for i, position in zip(candidate.rotor_order, candidate.positions)
+    ]
+    return Enigma(Plugboard(list(candidate.plugboard)), rotors, reflector)
+
+
+def state_tables(rotors: Sequence[Rotor], reflector: Reflector) -> np.ndarray:
+    """
+    Substitution of the machine without plugboard for every rotor state.
+
+    Returns:
+        np.ndarray: uint8 array of shape (26 ** len(rotors), 26); row `state`
+            matches `Enigma.state_table` for that state number.
+    """
+    states = np.arange(26 ** len(rotors))
+    stages = [
+        (rotor, ((states // 26**i) % 26)[:, None]) for i, rotor in enumerate(rotors)
+    ]
+    index = np.broadcast_to(np.arange(26), (len(states), 26))
+    for rotor, position in stages:
+        index = (np.array(rotor.forward)[(index + position) % 26] - position) % 26
+    index = np.array([ord(char) - ord("A") for char in reflector.wiring])[index]
+    for rotor, position in reversed(stages):
+        index = (np.array(rotor.backward)[(index + position) % 26] - position) % 26
+    return index.astype(np.uint8)
+
+
+def state_sequences(
+    rotors: Sequence[Rotor], starts: np.ndarray, length: int
+) -> np.ndarray:
+    """
+    State numbers at each of `length` key presses for every start state.
+
+    Vectorized form of `Enigma.positions_after`.
+
+    Returns:
+        np.ndarray: Array of shape (len(starts), length).
+    """
+    presses = np.broadcast_to(np.arange(length), (len(starts), length))
+    states = np.zeros((len(starts), length), dtype=np.int64)
+    for i, rotor in enumerate(rotors):
+        position = ((starts // 26**i) % 26)[:, None]
+        states += ((position + presses) % 26) * 26**i
+        if rotor.carry < 0:
+            presses = np.zeros_like(presses)
+        else:
+            first = (rotor.carry - position - 1) % 26 + 1
+            presses = np.where(presses < first, 0, (presses - first) // 26 + 1)
+    return states
+
+
+def index_of_coincidence(plaintexts: np.ndarray) -> np.ndarray:
+    """Index of coincidence of every row of a (B, L) array of letter indexes."""
+    rows, length = plaintexts.shape
+    offsets = 26 * np.arange(rows)[:, None]
+    counts = np.bincount((plaintexts + offsets).ravel(), minlength=26 * rows)
+    counts = counts.reshape(rows, 26)
+    return (counts * (counts - 1)).sum(axis=1) / max(length * (length - 1), 1)
+
+
+def bigram_log_probs(corpus: str) -> np.ndarray:
+    """Bigram log-probabilities of the letters of `corpus`, with add-one smoothing."""
+    letters = np.array(
+        [ord(char) - ord("A") for char in corpus.upper() if char in ALPHABET],
+        dtype=np.intp,
+    )
+    counts = np.ones((26, 26))
+    np.add.at(counts, (letters[:-1], letters[1:]), 1)
+    return np.log(counts / counts.sum(axis=1, keepdims=True))
+
+
+def score(plaintexts: np.ndarray, log_probs: Optional[np.ndarray] = None) -> np.ndarray:
+    """Score every row: bigram log-likelihood if `log_probs` is given, else IoC."""
+    if log_probs is None:
+        return index_of_coincidence(plaintexts)
+    return log_probs[plaintexts[:, :-1], plaintexts[:, 1:]].sum(axis=1)
+
+
+def hill_climb_plugboard(
+    tables: np.ndarray,
+    states: np.ndarray,
+    ciphertext: np.ndarray,
+    pairs: int,
+    log_probs: Optional[np.ndarray] = None,
+) -> Tuple[float, np.ndarray, int]:
+    """
+    Greedily add the plugboard pair that improves the score most, `pairs` times.
+
+    The plugboard is applied on both sides of the state tables, so every
+    candidate pair of a step is scored in one vectorized batch.
+
+    Returns:
+        Tuple[float, np.ndarray, int]: Best score, plugboard permutation and
+            number of plugboards tried.
+    """
+    plugboard = np.arange(26)
+    best = score(plugboard[tables[states, ciphertext]][None, :], log_probs)[0]
+    tried = 1
+    for _ in range(pairs):
+        free = [letter for letter in range(26) if plugboard[letter] == letter]
+        trials = list(combinations(free, 2))
+        if not trials:
+            break
+        a, b = np.array(trials).T
+        boards = np.repeat(plugboard[None, :], len(trials), axis=0)
+        rows = np.arange(len(trials))
+        boards[rows, a], boards[rows, b] = b, a
+        plaintexts = np.take_along_axis(
+            boards, tables[states, boards[:, ciphertext]].astype(np.int64), axis=1
+        )
+        scores = score(plaintexts, log_probs)
+        tried += len(trials)
+        if scores.max() <= best:
+            break
+        best = scores.max()
+        plugboard = boards[scores.argmax()]
+    return float(best), plugboard, tried
+
+
+def search_rotor_order(
+    rotor_order: Tuple[int, ...],
+    rotor_set: Sequence[Rotor],
+    reflector: Reflector,
+    ciphertext: np.ndarray,
+    top_k: int,
+    plugboard_pairs: int = 0,
+    log_probs: Optional[np.ndarray] = None,
+) -> Tuple[List[Candidate], int]:
+    """
+    Try every start position of one rotor order.
+
+    Returns:
+        Tuple[List[Candidate], int]: The best `top_k` candidates and the keys tried.
+    """
+    rotors = [rotor_set[i] for i in rotor_order]
+    tables = state_tables(rotors, reflector)
+    best_scores = np.empty(0)
+    best_starts = np.empty(0, dtype=np.int64)
+    batch_size = max(1, BATCH_CELLS // len(ciphertext))
+    for first in range(0, len(tables), batch_size):
+        starts = np.arange(first, min(first + batch_size, len(tables)))
+        states = state_sequences(rotors, starts, len(ciphertext))
+        scores = score(tables[states, ciphertext], log_probs)
+        best_scores = np.concatenate([best_scores, scores])
+        best_starts = np.concatenate([best_starts, starts])
+        if len(best_scores) > top_k:
+            keep = np.argpartition(-best_scores, top_k)[:top_k]
+            best_scores, best_starts = best_scores[keep], best_starts[keep]
+
+    keys_tried = len(tables)
+    candidates = []
+    for start, start_score in zip(best_starts, best_scores):
+        states = state_sequences(rotors, np.array([start]), len(ciphertext))[0]
+        plugboard = np.arange(26)
+        if plugboard_pairs:
+            start_score, plugboard, tried = hill_climb_plugboard(
+                tables, states, ciphertext, plugboard_pairs, log_probs
+            )
+            keys_tried += tried
+        plaintext = plugboard[tables[states, plugboard[ciphertext]]]
+        candidates.append(
+            Candidate(
+                score=float(start_score),
+                rotor_order=tuple(rotor_order),
+                positions=tuple(int(start // 26**i % 26) for i in range(len(rotors))),
+                plugboard=tuple(
+                    (ALPHABET[a], ALPHABET[b]) for a, b in enumerate(plugboard) if a < b
+                ),
+                plaintext="".join(ALPHABET[i] for i in plaintext),
+            )
+        )
+    return candidates, keys_tried
+
+
+def search(
+    ciphertext: str,
+    rotor_set: Sequence[Rotor],
+    reflector: Reflector,
+    slots: int = 3,
+    top_k: int = 5,
+    plugboard_pairs: int = 0,
+    log_probs: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+) -> SearchResult:
+    """
+    Search every rotor order and start position for the key of `ciphertext`.
+
+    Each rotor order is one task of a process pool; within it all
+    26 ** slots start positions are enciphered and scored in NumPy batches.
+
+    Args:
+        ciphertext (str): The ciphertext; only its letters are used.
+        rotor_set (Sequence[Rotor]): The rotors to choose from.
+        reflector (Reflector): The reflector.
+        slots (int): The number of rotors in the machine.
+        top_k (int): The number of candidates to return.
+        plugboard_pairs (int): Plugboard pairs to hill-climb for each candidate.
+        log_probs (Optional[np.ndarray]): Bigram log-probabilities (see
+            `bigram_log_probs`); the index of coincidence is used if omitted.
+        workers (Optional[int]): The number of worker processes.
+
+    Returns:
+        SearchResult: The best candidates first, with the keys tried.
+    """
+    letters = np.array(
+        [ord(char) - ord("A") for char in ciphertext.upper() if char in ALPHABET],
+        dtype=np.intp,
+    )
+    if not len(letters):
+        raise ValueError("The ciphertext has no letters.")
+    orders = list(permutations(range(len(rotor_set)), slots))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = [
+            executor.submit(
+                search_rotor_order,
+                order,
+                rotor_set,
+                reflector,
+                letters,
+                top_k,
+                plugboard_pairs,
+                log_probs,
+            )
+            for order in orders
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    candidates = [candidate for found, _ in results for candidate in found]
+    candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+    keys_tried = sum(tried for _, tried in results)
+    return SearchResult(candidates[:top_k], keys_tried, elapsed)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Run from the parent directory: python -m enigma.bombe
+    rotor_set = [
+        Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q"),
+        Rotor("AJDKSIRUXBLHWTMCQGZNPYFVOE", "E"),
+        Rotor("BDFHJLCPRTXVZNYEIWGAKMUSQO", "V"),
+        Rotor("ESOVPZJAYQUIRHXLNFTGKDCMWB", "J"),
+        Rotor("VZBRGITYUPSDNHLXAWMJQOFECK", "Z"),
+    ]
+    reflector = Reflector("YRUHQSLDPXNGOKMIEBFZCWVJAT")
+    plaintext = (
+        "WEATHER REPORT FOR THE NORTH SEA THIS MORNING SHOWS LIGHT WINDS FROM THE "
+        "WEST AND GOOD VISIBILITY ALL SHIPS SHOULD EXPECT CALM WATER UNTIL EVENING"
+    )
+    key = Candidate(0.0, (3, 0, 4), (7, 22, 13), (), "")
+    ciphertext = build_machine(key, rotor_set, reflector).encipher(plaintext)
+
+    result = search(ciphertext, rotor_set, reflector)
+    for candidate in result.candidates:
+        print(candidate.score, candidate.rotor_order, candidate.positions)
+        print(f"  {candidate.plaintext[:60]}")
+    print(f"{result.keys_tried:,} keys in {result.elapsed:.2f}s")
+    print(f"{result.keys_per_second:,.0f} keys/s")
@@ -1,4 +1,18 @@
-from typing import List, Tuple, Dict
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, product
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CHUNK_SIZE = 1 << 16  # Characters per task of Enigma.encipher_parallel
+BLOCK_SIZE = 1 << 20  # Characters read at a time by Enigma.encipher_file
+
+# str.translate table that drops every ASCII character but A-Z
+_DROP_NON_LETTERS = {code: None for code in range(128) if not "A" <= chr(code) <= "Z"}
+_NON_LETTER_RUNS = re.compile(r"([^A-Z]+)")
+
+_worker_enigma = None
 
 
 class Plugboard:
@@ -17,19 +31,21 @@ class Rotor:
         self.wiring = wiring
         self.notch = notch
         self.position = position
+        # Wiring as letter indexes, and its inverse for the backward pass
+        self.forward: List[int] = [ord(char) - ord("A") for char in wiring]
+        self.backward: List[int] = [0] * 26
+        for index, target in enumerate(self.forward):
+            self.backward[target] = index
+        # Position at which rotate() carries to the next rotor (-1 if never)
+        self.carry: int = wiring.find(notch)
 
     def encipher_forward(self, char: str) -> str:
         index = (ord(char) - ord("A") + self.position) % 26
-        return chr((ord(self.wiring[index]) - ord("A") - self.position) % 26 + ord("A"))
+        return chr((self.forward[index] - self.position) % 26 + ord("A"))
 
     def encipher_backward(self, char: str) -> str:
-        index = (
-            self.wiring.index(
-                chr((ord(char) - ord("A") + self.position) % 26 + ord("A"))
-            )
-            - self.position
-        ) % 26
-        return chr(index + ord("A"))
+        index = (ord(char) - ord("A") + self.position) % 26
+        return chr((self.backward[index] - self.position) % 26 + ord("A"))
 
     def rotate(self) -> bool:
         self.position = (self.position + 1) % 26
@@ -46,38 +62,267 @@ class Reflector:
 
 
 class Enigma:
-    def __init__(self, plugboard: Plugboard, rotors: List[Rotor], reflector: Reflector):
+    def __init__(
+        self,
+        plugboard: Plugboard,
+        rotors: List[Rotor],
+        reflector: Reflector,
+        trace: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Args:
+            plugboard (Plugboard): The plugboard.
+            rotors (List[Rotor]): The rotors, fastest first.
+            reflector (Reflector): The reflector.
+            trace (Optional[Callable[[str], None]]): Called with a line for every
+                step of every character (e.g. `print`); disables the compiled tables.
+        """
         self.plugboard = plugboard
         self.rotors = rotors
         self.reflector = reflector
+        self.trace = trace
+        # Full substitution for each rotor state seen so far, keyed by state number.
+        # The wiring is assumed not to change once the machine is built.
+        self.tables: Dict[int, str] = {}
+        self.translations: Dict[int, Dict[int, int]] = {}
+
+    def state(self, positions: Sequence[int]) -> int:
+        """Number of the rotor state with the given positions (fastest rotor first)."""
+        state = 0
+        for position in reversed(positions):
+            state = state * 26 + position
+        return state
+
+    def state_table(self, positions: Sequence[int]) -> str:
+        """
+        Substitution of the whole machine for one rotor state.
+
+        Returns:
+            str: The 26 letters that A..Z encipher to in that state.
+        """
+        state = self.state(positions)
+        table = self.tables.get(state)
+        if table is None:
+            stages = list(zip(self.rotors, positions))
+            reflector = [ord(char) - ord("A") for char in self.reflector.wiring]
+            letters = []
+            for char in ALPHABET:
+                index = ord(self.plugboard.swap(char)) - ord("A")
+                for rotor, position in stages:
+                    index = (rotor.forward[(index + position) % 26] - position) % 26
+                index = reflector[index]
+                for rotor, position in reversed(stages):
+                    index = (rotor.backward[(index + position) % 26] - position) % 26
+                letters.append(self.plugboard.swap(chr(index + ord("A"))))
+            table = self.tables[state] = "".join(letters)
+        return table
+
+    def compile(self) -> None:
+        """Build the tables of all 26 ** len(rotors) rotor states up front."""
+        for positions in product(range(26), repeat=len(self.rotors)):
+            self.state_table(positions)
+
+    def positions_after(self, presses: int) -> List[int]:
+        """
+        Rotor positions after `presses` more key presses, without stepping through them.
+
+        Follows the carry rule of `Rotor.rotate`: each rotor steps the next one
+        every time it lands on its carry position.
+
+        Args:
+            presses (int): The number of letters enciphered from the current state.
+
+        Returns:
+            List[int]: The positions, fastest rotor first.
+        """
+        positions = []
+        for rotor in self.rotors:
+            positions.append((rotor.position + presses) % 26)
+            if rotor.carry < 0:
+                presses = 0
+            else:
+                # Steps until the rotor first lands on its carry position (1..26)
+                first = (rotor.carry - rotor.position - 1) % 26 + 1
+                presses = 0 if presses < first else (presses - first) // 26 + 1
+        return positions
+
+    def seek(self, presses: int) -> None:
+        """Move the rotors forward by `presses` key presses in O(len(rotors))."""
+        for rotor, position in zip(self.rotors, self.positions_after(presses)):
+            rotor.position = position
+
+    def encipher_at(self, text: str, presses: int) -> str:
+        """
+        Encipher `text` as if `presses` letters had already been typed.
+
+        The rotors are left where they were, so any slice of a long text can be
+        enciphered on its own: pass the number of letters that precede it.
+        """
+        saved = [rotor.position for rotor in self.rotors]
+        try:
+            self.seek(presses)
+            return self.encipher(text)
+        finally:
+            for rotor, position in zip(self.rotors, saved):
+                rotor.position = position
+
+    def encipher_parallel(
+        self, text: str, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+    ) -> str:
+        """
+        Encipher a large text in chunks across a process pool.
+
+        Each chunk is enciphered by a worker seeked to the number of letters
+        before it, so the output and the final rotor positions are the same as
+        with `encipher`.
+        """
+        chunks = [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+        presses = [sum(map(str.isalpha, chunk)) for chunk in chunks]
+        offsets = accumulate(presses[:-1], initial=0)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            result = "".join(executor.map(_encipher_chunk, chunks, offsets))
+        self.seek(sum(presses))
+        return result
+
+    def encipher_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Encipher chunks lazily; the rotor state carries over from chunk to chunk."""
+        for chunk in chunks:
+            yield self.encipher(chunk)
+
+    def encipher_file(
+        self, src: str, dst: str, block_size: int = BLOCK_SIZE, encoding: str = "utf-8"
+    ) -> None:
+        """
+        Encipher the text file `src` into `dst` in blocks of `block_size` chars.
+
+        Line endings are copied as they are, not translated.
+        """
+        with open(src, encoding=encoding, newline="") as reader, open(
+            dst, "w", encoding=encoding, newline=""
+        ) as writer:
+            blocks = iter(lambda: reader.read(block_size), "")
+            for enciphered in self.encipher_stream(blocks):
+                writer.write(enciphered)
 
     def encipher(self, text: str) -> str:
+        if self.trace is not None:
+            return self._encipher_traced(text)
+        if not text.isascii():
+            return self._encipher_chars(text)
+
+        text = text.upper()
+        letters = text.translate(_DROP_NON_LETTERS)
+        enciphered = self._encipher_letters(letters)
+        if len(letters) == len(text):
+            return enciphered
+
+        # Put the separators back between the enciphered runs of letters
+        result = []
+        offset = 0
+        for i, part in enumerate(_NON_LETTER_RUNS.split(text)):
+            if i % 2:
+                result.append(part)
+            else:
+                result.append(enciphered[offset : offset + len(part)])
+                offset += len(part)
+        return "".join(result)
+
+    def _encipher_letters(self, letters: str) -> str:
+        """
+        Encipher a string of A-Z letters only.
+
+        The rotor states repeat every 26 ** len(rotors) letters. For long inputs
+        the letters are grouped by state with strided slices, and each group is
+        enciphered by a single bulk str.translate.
+        """
+        period = 26 ** len(self.rotors)
+        if len(letters) < 2 * period:
+            return self._encipher_chars(letters)
+
+        result = [""] * len(letters)
+        for offset in range(period):
+            positions = self.positions_after(offset)
+            state = self.state(positions)
+            translation = self.translations.get(state)
+            if translation is None:
+                table = self.state_table(positions)
+                translation = self.translations[state] = str.maketrans(ALPHABET, table)
+            result[offset::period] = letters[offset::period].translate(translation)
+        self.seek(len(letters))
+        return "".join(result)
+
+    def _encipher_chars(self, text: str) -> str:
+        """Encipher character by character with one table lookup per letter."""
+        rotors = self.rotors
+        carries = [rotor.carry for rotor in rotors]
+        weights = [26**i for i in range(len(rotors))]
+        positions = [rotor.position for rotor in rotors]
+        state = self.state(positions)
+        tables = self.tables
+        result = []
+        try:
+            for char in text:
+                if not char.isalpha():
+                    result.append(char)
+                    continue
+
+                char = char.upper()
+                if "A" <= char <= "Z":
+                    table = tables.get(state) or self.state_table(positions)
+                    result.append(table[ord(char) - ord("A")])
+                    # Step like Rotor.rotate(), keeping the state number in sync
+                    for i in range(len(rotors)):
+                        if positions[i] == 25:
+                            positions[i] = 0
+                            state -= 25 * weights[i]
+                        else:
+                            positions[i] += 1
+                            state += weights[i]
+                        if positions[i] != carries[i]:
+                            break
+                else:  # Letters outside A-Z take the step-by-step path
+                    for rotor, position in zip(rotors, positions):
+                        rotor.position = position
+                    result.append(self._encipher_traced(char))
+                    positions = [rotor.position for rotor in rotors]
+                    state = self.state(positions)
+        finally:
+            for rotor, position in zip(rotors, positions):
+                rotor.position = position
+
+        return "".join(result)
+
+    def _encipher_traced(self, text: str) -> str:
+        """Encipher step by step through every component, reporting to the trace."""
+        trace = self.trace or (lambda line: None)
         result = []
         for index, char in enumerate(text):
             if not char.isalpha():
                 result.append(char)
                 continue
 
-            print(f"Encipher index: #{index}")
+            trace(f"Encipher index: #{index}")
             char = char.upper()
-            print(f"Initial character: {char}")
+            trace(f"Initial character: {char}")
 
             char = self.plugboard.swap(char)
-            print(f"After plugboard (forward): {char}")
+            trace(f"After plugboard (forward): {char}")
 
             for rotor in self.rotors:
                 char = rotor.encipher_forward(char)
-                print(f"After rotor (forward) {rotor.position}: {char}")
+                trace(f"After rotor (forward) {rotor.position}: {char}")
 
             char = self.reflector.reflect(char)
-            print(f"After reflector: {char}")
+            trace(f"After reflector: {char}")
 
             for rotor in reversed(self.rotors):
                 char = rotor.encipher_backward(char)
-                print(f"After rotor (backward) {rotor.position}: {char}")
+                trace(f"After rotor (backward) {rotor.position}: {char}")
 
             char = self.plugboard.swap(char)
-            print(f"After plugboard (backward): {char}\n")
+            trace(f"After plugboard (backward): {char}\n")
 
             result.append(char)
 
@@ -88,6 +333,15 @@ class Enigma:
         return "".join(result)
 
 
+def _init_worker(enigma: Enigma) -> None:
+    global _worker_enigma
+    _worker_enigma = enigma
+
+
+def _encipher_chunk(chunk: str, presses: int) -> str:
+    return _worker_enigma.encipher_at(chunk, presses)
+
+
 def main():
     # Fixed settings
     plugboard_connections = [("A", "Z"), ("S", "O")]
@@ -101,10 +355,15 @@ def main():
     reflector_wiring = "YRUHQSLDPXNGOKMIEBFZCWVJAT"
     reflector = Reflector(reflector_wiring)
 
+    # Encipher a file in constant memory: python enigma.py <src> <dst>
+    if len(sys.argv) == 3:
+        Enigma(plugboard, rotors, reflector).encipher_file(sys.argv[1], sys.argv[2])
+        return
+
     # Get user input for the text to encipher
     text = input("Enter text to encipher: ")
 
-    enigma = Enigma(plugboard, rotors, reflector)
+    enigma = Enigma(plugboard, rotors, reflector, trace=print)
     ciphertext = enigma.encipher(text)
     print(f"Ciphertext: {ciphertext}")
 
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from . import bombe
+from .bombe import (
+    bigram_log_probs,
+    build_machine,
+    hill_climb_plugboard,
+    index_of_coincidence,
+    search,
+    search_rotor_order,
+    state_sequences,
+    state_tables,
+)
+from .enigma import Enigma, Plugboard, Reflector, Rotor
+
+ROTOR_SET = [
+    Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q"),
+    Rotor("AJDKSIRUXBLHWTMCQGZNPYFVOE", "E"),
+    Rotor("BDFHJLCPRTXVZNYEIWGAKMUSQO", "V"),
+]
+REFLECTOR = Reflector("YRUHQSLDPXNGOKMIEBFZCWVJAT")
+
+PLAINTEXT = (
+    "THE QUICK SOLUTION TO MOST PERFORMANCE PROBLEMS IS TO MEASURE FIRST AND "
+    "THEN TO CHANGE ONE THING AT A TIME WHILE KEEPING THE TESTS GREEN THE "
+    "CLUSTER HANDLES MILLIONS OF REQUESTS EVERY DAY AND THE TEAM WANTS TO "
+    "KNOW WHERE THE TIME GOES BEFORE THEY SPEND ANY MORE MONEY ON HARDWARE "
+    "SO THEY WRITE BENCHMARKS AND READ THE RESULTS WITH CARE"
+)
+
+
+def encipher(plaintext, order, positions, connections=()):
+    rotors = [
+        Rotor(ROTOR_SET[i].wiring, ROTOR_SET[i].notch, position)
+        for i, position in zip(order, positions)
+    ]
+    return Enigma(Plugboard(list(connections)), rotors, REFLECTOR).encipher(plaintext)
+
+
+def test_state_tables_match_enigma():
+    rotors = [ROTOR_SET[2], ROTOR_SET[0], ROTOR_SET[1]]
+    tables = state_tables(rotors, REFLECTOR)
+    enigma = Enigma(Plugboard([]), rotors, REFLECTOR)
+    for positions in [(0, 0, 0), (3, 17, 25), (25, 1, 9)]:
+        state = enigma.state(positions)
+        expected = enigma.state_table(positions)
+        assert "".join(chr(x + 65) for x in tables[state]) == expected
+
+
+def test_state_sequences_match_positions_after():
+    rotors = [Rotor(r.wiring, r.notch) for r in ROTOR_SET]
+    enigma = Enigma(Plugboard([]), rotors, REFLECTOR)
+    starts = np.array([0, 1234, 17575])
+    sequences = state_sequences(rotors, starts, 800)
+    for row, start in zip(sequences, starts):
+        for rotor, i in zip(rotors, range(3)):
+            rotor.position = start // 26**i % 26
+        for presses in [0, 1, 25, 26, 700, 799]:
+            assert row[presses] == enigma.state(enigma.positions_after(presses))
+
+
+def test_index_of_coincidence():
+    uniform = np.tile(np.arange(26), 4)[None, :]
+    constant = np.zeros((1, 104), dtype=np.int64)
+    scores = index_of_coincidence(np.concatenate([uniform, constant]))
+    assert scores[0] == pytest.approx(26 * 4 * 3 / (104 * 103))
+    assert scores[1] == pytest.approx(1.0)
+
+
+def test_search_recovers_rotor_order_and_positions():
+    ciphertext = encipher(PLAINTEXT, (2, 0, 1), (11, 4, 19))
+    result = search(ciphertext, ROTOR_SET, REFLECTOR, top_k=3, workers=2)
+    best = result.candidates[0]
+    assert best.rotor_order == (2, 0, 1)
+    assert best.positions == (11, 4, 19)
+    assert best.plaintext == PLAINTEXT.replace(" ", "")
+    assert result.keys_tried == 6 * 26**3
+    assert result.keys_per_second > 0
+    assert build_machine(best, ROTOR_SET, REFLECTOR).encipher(ciphertext) == PLAINTEXT
+
+
+def test_search_without_letters():
+    with pytest.raises(ValueError):
+        search("1234 !?", ROTOR_SET, REFLECTOR, workers=1)
+    assert np.allclose(bigram_log_probs("123"), np.log(1 / 26))
+
+
+def test_batches_shrink_with_ciphertext_length(monkeypatch):
+    ciphertext = encipher(PLAINTEXT, (0, 1, 2), (3, 2, 1))
+    letters = np.array([ord(c) - 65 for c in ciphertext if c.isalpha()])
+    expected, _ = search_rotor_order((0, 1, 2), ROTOR_SET, REFLECTOR, letters, 1)
+    # Fewer cells than letters: one start position per batch
+    monkeypatch.setattr(bombe, "BATCH_CELLS", 100)
+    candidates, tried = search_rotor_order((0, 1, 2), ROTOR_SET, REFLECTOR, letters, 1)
+    assert candidates == expected
+    assert candidates[0].positions == (3, 2, 1)
+    assert tried == 26**3
+
+
+def test_hill_climb_plugboard():
+    connections = [("E", "Q"), ("T", "X")]
+    ciphertext = encipher(PLAINTEXT, (0, 1, 2), (5, 6, 7), connections)
+    rotors = list(ROTOR_SET)
+    letters = np.array([ord(c) - 65 for c in ciphertext if c.isalpha()])
+    tables = state_tables(rotors, REFLECTOR)
+    start = np.array([5 + 6 * 26 + 7 * 26**2])
+    states = state_sequences(rotors, start, len(letters))[0]
+    log_probs = bigram_log_probs(PLAINTEXT)
+    _, plugboard, tried = hill_climb_plugboard(tables, states, letters, 2, log_probs)
+    assert plugboard[ord("E") - 65] == ord("Q") - 65
+    assert plugboard[ord("T") - 65] == ord("X") - 65
+    assert tried > 1
@@ -1,4 +1,9 @@
-from .enigma import Plugboard, Rotor, Reflector, Enigma
+import random
+import string
+
+import pytest
+
+from .enigma import ALPHABET, Plugboard, Rotor, Reflector, Enigma
 
 
 def test_plugboard_swap():
@@ -41,3 +46,130 @@ def test_enigma_encipher_single_character():
     enigma = Enigma(plugboard, rotors, reflector)
 
     assert enigma.encipher("S") == "K"
+
+
+def build_enigma(positions=(0, 0, 0), trace=None):
+    plugboard = Plugboard([("A", "Z"), ("S", "O")])
+    rotors = [
+        Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q", positions[0]),
+        Rotor("AJDKSIRUXBLHWTMCQGZNPYFVOE", "E", positions[1]),
+        Rotor("BDFHJLCPRTXVZNYEIWGAKMUSQO", "V", positions[2]),
+    ]
+    reflector = Reflector("YRUHQSLDPXNGOKMIEBFZCWVJAT")
+    return Enigma(plugboard, rotors, reflector, trace=trace)
+
+
+def random_text(length, seed=0):
+    rng = random.Random(seed)
+    return "".join(rng.choice(string.ascii_letters + " ,.!") for _ in range(length))
+
+
+def test_rotor_backward_inverts_forward():
+    rotor = Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q", 5)
+    for char in string.ascii_uppercase:
+        assert rotor.encipher_backward(rotor.encipher_forward(char)) == char
+
+
+@pytest.mark.parametrize("positions", [(0, 0, 0), (15, 3, 20), (25, 25, 25)])
+def test_compiled_matches_step_by_step(positions):
+    text = random_text(2000) + " Señor, café!"
+    lines = []
+    traced = build_enigma(positions, trace=lines.append)
+    compiled = build_enigma(positions)
+    assert compiled.encipher(text) == traced.encipher(text)
+    assert [r.position for r in compiled.rotors] == [r.position for r in traced.rotors]
+    assert lines  # The traced machine reported its steps
+
+
+def test_compiled_is_reciprocal():
+    text = random_text(500).upper()
+    ciphertext = build_enigma((1, 2, 3)).encipher(text)
+    assert build_enigma((1, 2, 3)).encipher(ciphertext) == text
+
+
+def test_compile_builds_every_state():
+    enigma = build_enigma()
+    enigma.compile()
+    assert len(enigma.tables) == 26**3
+    assert enigma.encipher("S") == "K"
+
+
+def test_encipher_is_silent_without_trace(capsys):
+    build_enigma().encipher("HELLO")
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("positions", [(0, 0, 0), (15, 3, 20), (25, 4, 21)])
+def test_positions_after_matches_stepping(positions):
+    enigma = build_enigma(positions)
+    stepped = build_enigma(positions)
+    for presses in range(1, 2000):
+        stepped.encipher("A")
+        assert enigma.positions_after(presses) == [r.position for r in stepped.rotors]
+
+
+def test_positions_after_rotor_without_carry():
+    rotors = [Rotor("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "-"), Rotor(ALPHABET, "A")]
+    enigma = Enigma(Plugboard([]), rotors, Reflector("YRUHQSLDPXNGOKMIEBFZCWVJAT"))
+    assert enigma.positions_after(1000) == [1000 % 26, 0]
+
+
+def test_encipher_at_matches_slices():
+    text = random_text(3000)
+    full = build_enigma((3, 1, 4)).encipher(text)
+    enigma = build_enigma((3, 1, 4))
+    for start in [0, 1, 777, 2999]:
+        presses = sum(map(str.isalpha, text[:start]))
+        assert enigma.encipher_at(text[start:], presses) == full[start:]
+    assert [r.position for r in enigma.rotors] == [3, 1, 4]
+
+
+def test_encipher_parallel_matches_sequential():
+    text = random_text(20_000)
+    sequential = build_enigma((7, 7, 7))
+    parallel = build_enigma((7, 7, 7))
+    assert parallel.encipher_parallel(text, workers=2, chunk_size=3001) == (
+        sequential.encipher(text)
+    )
+    assert [r.position for r in parallel.rotors] == [
+        r.position for r in sequential.rotors
+    ]
+
+
+@pytest.mark.parametrize(
+    "length, bulk_path", [(10, False), (5000, False), (3 * 26**3, True)]
+)
+def test_bulk_translate_matches_step_by_step(length, bulk_path):
+    # Bulk translation needs two rotor periods (2 * 26 ** 3) of letters
+    text = random_text(length, seed=length)
+    step_by_step = build_enigma((4, 5, 6), trace=lambda line: None)
+    bulk = build_enigma((4, 5, 6))
+    assert bulk.encipher(text) == step_by_step.encipher(text)
+    assert bool(bulk.translations) == bulk_path
+    assert [r.position for r in bulk.rotors] == [
+        r.position for r in step_by_step.rotors
+    ]
+
+
+def test_encipher_stream_carries_rotor_state():
+    text = random_text(10_000)
+    expected = build_enigma((9, 8, 7)).encipher(text)
+    chunks = (text[i : i + 777] for i in range(0, len(text), 777))
+    stream = build_enigma((9, 8, 7)).encipher_stream(chunks)
+    assert "".join(stream) == expected
+
+
+def test_encipher_file(tmp_path):
+    text = random_text(5000) + "\nSeñor, café!\n"
+    src, dst = tmp_path / "plain.txt", tmp_path / "cipher.txt"
+    src.write_text(text, encoding="utf-8")
+    build_enigma().encipher_file(str(src), str(dst), block_size=1000)
+    assert dst.read_text(encoding="utf-8") == build_enigma().encipher(text)
+
+
+def test_encipher_file_keeps_line_endings(tmp_path):
+    text = "Attack\r\nat dawn\rthen\nretreat"
+    src, dst = tmp_path / "plain.txt", tmp_path / "cipher.txt"
+    src.write_bytes(text.encode("utf-8"))
+    build_enigma().encipher_file(str(src), str(dst))
+    assert dst.read_bytes() == build_enigma().encipher(text).encode("utf-8")
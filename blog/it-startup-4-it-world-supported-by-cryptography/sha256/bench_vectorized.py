@@ -0,0 +1,29 @@
+import random
+import time
+
+from .sha256 import sha256
+from .vectorized import sha256_many
+
+
+def main():
+    # Run from the parent directory: python -m sha256.bench_vectorized
+    rng = random.Random(0)
+    messages = [rng.randbytes(rng.randrange(16, 120)) for _ in range(20_000)]
+
+    start = time.perf_counter()
+    scalar = [sha256(message) for message in messages]
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = sha256_many(messages)
+    vectorized_elapsed = time.perf_counter() - start
+
+    assert scalar == vectorized
+    print(f"messages:    {len(messages)}")
+    print(f"sha256:      {len(messages) / scalar_elapsed:12,.0f} msg/s")
+    print(f"sha256_many: {len(messages) / vectorized_elapsed:12,.0f} msg/s")
+    print(f"speedup:     {scalar_elapsed / vectorized_elapsed:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import dbm
+from typing import BinaryIO, Iterator, Tuple
+
+from .sha256 import SHA256
+
+MIN_SIZE = 2 * 1024
+AVG_SIZE = 8 * 1024
+MAX_SIZE = 64 * 1024
+
+# Gear table: 256 pseudo-random 64-bit values, derived from the project hash
+GEAR = [int.from_bytes(SHA256(bytes([i])).digest()[:8], "big") for i in range(256)]
+
+# (offset, length, hex digest) of one chunk
+Record = Tuple[int, int, str]
+
+
+def _mask(bits: int) -> int:
+    """Mask over the `bits` highest bits of the 64-bit fingerprint."""
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+def find_cut_point(
+    data: memoryview,
+    min_size: int = MIN_SIZE,
+    avg_size: int = AVG_SIZE,
+    max_size: int = MAX_SIZE,
+) -> int:
+    """
+    Find the end of the first chunk of `data` with a Gear rolling hash (FastCDC).
+
+    The first `min_size` bytes are skipped. Up to `avg_size` a stricter mask is
+    used and after it a looser one, which pulls chunk sizes towards `avg_size`.
+
+    Returns:
+        int: The length of the first chunk.
+    """
+    size = len(data)
+    if size <= min_size:
+        return size
+    bits = avg_size.bit_length() - 1
+    mask_small, mask_large = _mask(bits + 2), _mask(bits - 2)
+    normal = min(avg_size, size)
+    end = min(max_size, size)
+    fingerprint = 0
+    for i in range(min_size, normal):
+        fingerprint = ((fingerprint << 1) + GEAR[data[i]]) & 0xFFFFFFFFFFFFFFFF
+        if not fingerprint & mask_small:
+            return i + 1
+    for i in range(normal, end):
+        fingerprint = ((fingerprint << 1) + GEAR[data[i]]) & 0xFFFFFFFFFFFFFFFF
+        if not fingerprint & mask_large:
+            return i + 1
+    return end
+
+
+def chunk_stream(
+    stream: BinaryIO,
+    min_size: int = MIN_SIZE,
+    avg_size: int = AVG_SIZE,
+    max_size: int = MAX_SIZE,
+) -> Iterator[Record]:
+    """
+    Split a binary stream into content-defined chunks and hash each one.
+
+    At most `2 * max_size` bytes of the stream are buffered at any time, so
+    memory use does not depend on the stream size.
+
+    Yields:
+        Record: (offset, length, digest) for every chunk, in stream order.
+    """
+    buffer = bytearray(2 * max_size)
+    filled = 0
+    offset = 0
+    eof = False
+    while True:
+        with memoryview(buffer) as view:
+            while not eof and filled < max_size:
+                read = stream.readinto(view[filled:])
+                eof = not read
+                filled += read or 0
+            if not filled:
+                return
+            cut = find_cut_point(view[:filled], min_size, avg_size, max_size)
+            digest = SHA256(view[:cut]).hexdigest()
+        yield offset, cut, digest
+        buffer[: filled - cut] = buffer[cut:filled]
+        filled -= cut
+        offset += cut
+
+
+class DigestIndex:
+    """On-disk set of chunk digests, backed by `dbm`."""
+
+    def __init__(self, path: str) -> None:
+        self.db = dbm.open(path, "c")
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.db
+
+    def add(self, digest: str, length: int) -> None:
+        self.db[digest] = str(length)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "DigestIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def dedup_stream(
+    stream: BinaryIO, index: DigestIndex, **sizes: int
+) -> Iterator[Record]:
+    """
+    Yield only the chunks of `stream` whose digest is not in `index` yet.
+
+    New digests are added to the index as they are seen, so repeated chunks,
+    within the stream or from earlier runs, are skipped by later stages.
+    """
+    for offset, length, digest in chunk_stream(stream, **sizes):
+        if digest in index:
+            continue
+        index.add(digest, length)
+        yield offset, length, digest
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from typing import Tuple
+
+from .sha256 import SHA256
+
+BLOCK_SIZE = SHA256.block_size
+DIGEST_SIZE = SHA256.digest_size
+KEY_CACHE_SIZE = 128  # Number of keys whose midstates are kept
+
+IPAD = bytes(x ^ 0x36 for x in range(256))
+OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key_midstates(key: bytes) -> Tuple[SHA256, SHA256]:
+    """
+    Compress the ipad and opad blocks of `key` once.
+
+    The returned hashers hold the hash state after the key block and must only
+    be used through `copy()`. The cache is bounded and keeps the most recently
+    used keys.
+
+    Returns:
+        Tuple[SHA256, SHA256]: The inner and outer hashers.
+    """
+    if len(key) > BLOCK_SIZE:
+        key = SHA256(key).digest()
+    key = key.ljust(BLOCK_SIZE, b"\x00")
+    return SHA256(key.translate(IPAD)), SHA256(key.translate(OPAD))
+
+
+def hmac_sha256(key: bytes, message: bytes) -> bytes:
+    """HMAC-SHA256 of `message`, compressing only the message and one outer block."""
+    inner, outer = key_midstates(bytes(key))
+    inner = inner.copy()
+    inner.update(message)
+    outer = outer.copy()
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+def pbkdf2_hmac_sha256(
+    password: bytes, salt: bytes, iterations: int, dklen: int = DIGEST_SIZE
+) -> bytes:
+    """
+    PBKDF2 with HMAC-SHA256 as the pseudorandom function (RFC 8018).
+
+    The password midstates are computed once, so every iteration costs two
+    compressions instead of four.
+
+    Args:
+        password (bytes): The password, used as the HMAC key.
+        salt (bytes): The salt.
+        iterations (int): The iteration count.
+        dklen (int): The length of the derived key in bytes.
+
+    Returns:
+        bytes: The derived key.
+    """
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    inner, outer = key_midstates(bytes(password))
+    derived = bytearray()
+    block_index = 1
+    while len(derived) < dklen:
+        u = hmac_sha256(password, salt + block_index.to_bytes(4, "big"))
+        result = int.from_bytes(u, "big")
+        for _ in range(iterations - 1):
+            hasher = inner.copy()
+            hasher.update(u)
+            u = hasher.digest()
+            hasher = outer.copy()
+            hasher.update(u)
+            u = hasher.digest()
+            result ^= int.from_bytes(u, "big")
+        derived += result.to_bytes(DIGEST_SIZE, "big")
+        block_index += 1
+    return bytes(derived[:dklen])
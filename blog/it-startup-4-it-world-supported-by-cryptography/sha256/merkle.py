@@ -0,0 +1,133 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .sha256 import SHA256
+
+LEAF_SIZE = 1 << 20  # 1 MiB leaves
+
+# Proof steps are (sibling_is_left, sibling_digest) pairs, from the leaf upwards.
+Proof = List[Tuple[bool, bytes]]
+
+
+def hash_leaf(leaf: bytes) -> bytes:
+    """Hash a leaf, prefixed with 0x00 to keep leaves and nodes apart."""
+    hasher = SHA256(b"\x00")
+    hasher.update(leaf)
+    return hasher.digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """Hash two child digests, prefixed with 0x01."""
+    return SHA256(b"\x01" + left + right).digest()
+
+
+def _hash_file_leaf(path: str, offset: int, length: int) -> bytes:
+    """Hash one leaf of a file; runs in a worker process that maps the file itself."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return hash_leaf(view[offset : offset + length])
+
+
+class MerkleTree:
+    """
+    Merkle tree over fixed-size leaves of the input.
+
+    Leaves are hashed in a process pool, so hashing scales with the number of
+    cores; parent nodes are combined level by level. A node without a sibling
+    is carried up to the next level unchanged.
+    """
+
+    def __init__(self, leaves: List[bytes]) -> None:
+        """
+        Builds the tree from already hashed leaves.
+
+        Args:
+            leaves (List[bytes]): The leaf digests, in input order.
+        """
+        self.levels: List[List[bytes]] = [leaves or [hash_leaf(b"")]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [
+                hash_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)
+            ]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, leaf_size: int = LEAF_SIZE, max_workers: Optional[int] = None
+    ) -> "MerkleTree":
+        """Hash `data` split into `leaf_size` leaves."""
+        leaves = [data[i : i + leaf_size] for i in range(0, len(data), leaf_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return cls(list(executor.map(hash_leaf, leaves)))
+
+    @classmethod
+    def from_file(
+        cls, path: str, leaf_size: int = LEAF_SIZE, max_workers: Optional[int] = None
+    ) -> "MerkleTree":
+        """Hash the file at `path`; each worker reads its own leaves from the file."""
+        size = os.path.getsize(path)
+        offsets = range(0, size, leaf_size)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            leaves = executor.map(
+                _hash_file_leaf,
+                [path] * len(offsets),
+                offsets,
+                [leaf_size] * len(offsets),
+            )
+            return cls(list(leaves))
+
+    @property
+    def root(self) -> bytes:
+        """The root digest."""
+        return self.levels[-1][0]
+
+    def hexdigest(self) -> str:
+        """The root digest as a string of hexadecimal digits."""
+        return self.root.hex()
+
+    def proof(self, index: int) -> Proof:
+        """
+        Returns the inclusion proof for the leaf at `index`.
+
+        Args:
+            index (int): The position of the leaf.
+
+        Returns:
+            Proof: The sibling digests needed to recompute the root from that leaf.
+        """
+        if not 0 <= index < len(self.levels[0]):
+            raise IndexError(f"leaf index {index} out of range")
+        proof: Proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append((sibling < index, level[sibling]))
+            index //= 2
+        return proof
+
+
+def verify_proof(leaf: bytes, proof: Proof, root: bytes) -> bool:
+    """
+    Checks that `leaf` belongs to the tree with the given root.
+
+    Args:
+        leaf (bytes): The raw leaf data (not its digest).
+        proof (Proof): The proof returned by `MerkleTree.proof`.
+        root (bytes): The expected root digest.
+
+    Returns:
+        bool: True if the proof recomputes `root`, False otherwise.
+    """
+    digest = hash_leaf(leaf)
+    for sibling_is_left, sibling in proof:
+        if sibling_is_left:
+            digest = hash_node(sibling, digest)
+        else:
+            digest = hash_node(digest, sibling)
+    return digest == root
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Tuple
+
+from .sha256 import SHA256
+
+NONCE_SIZE = 8  # Nonces are appended to the prefix as 64-bit big-endian integers
+CHECK_INTERVAL = 1024  # Nonces tried between two looks at the stop flag
+
+_stop_event = None
+
+
+class Solution(NamedTuple):
+    nonce: int
+    digest: bytes
+    hashes: int
+    elapsed: float
+
+    @property
+    def hashes_per_second(self) -> float:
+        return self.hashes / self.elapsed if self.elapsed else 0.0
+
+
+def leading_zero_bits(digest: bytes) -> int:
+    """Number of leading zero bits of `digest`."""
+    return len(digest) * 8 - int.from_bytes(digest, "big").bit_length()
+
+
+def verify(prefix: bytes, nonce: int, difficulty: int) -> bool:
+    """Check that sha256(prefix + nonce) has at least `difficulty` leading zero bits."""
+    digest = SHA256(prefix + nonce.to_bytes(NONCE_SIZE, "big")).digest()
+    return leading_zero_bits(digest) >= difficulty
+
+
+def _init_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def search_range(
+    prefix: bytes, difficulty: int, start: int, stop: int
+) -> Tuple[Optional[int], int]:
+    """
+    Search nonces in [start, stop) for a solution.
+
+    The full blocks of `prefix` are compressed once; every nonce only forks
+    that midstate and compresses the last block.
+
+    Returns:
+        Tuple[Optional[int], int]: The nonce found (or None) and the hashes tried.
+    """
+    midstate = SHA256(prefix)
+    target = 1 << (256 - difficulty)
+    for nonce in range(start, stop):
+        hasher = midstate.copy()
+        hasher.update(nonce.to_bytes(NONCE_SIZE, "big"))
+        if int.from_bytes(hasher.digest(), "big") < target:
+            if _stop_event is not None:
+                _stop_event.set()
+            return nonce, nonce - start + 1
+        if (
+            (nonce - start) % CHECK_INTERVAL == 0
+            and _stop_event is not None
+            and _stop_event.is_set()
+        ):
+            return None, nonce - start + 1
+    return None, stop - start
+
+
+def solve(
+    prefix: bytes,
+    difficulty: int,
+    workers: Optional[int] = None,
+    nonce_count: int = 1 << (NONCE_SIZE * 8),
+) -> Solution:
+    """
+    Find a nonce whose hash with `prefix` has `difficulty` leading zero bits.
+
+    The nonce space is split into one contiguous range per worker process.
+    The first worker to find a solution sets a shared stop flag, which the
+    others check every CHECK_INTERVAL nonces.
+
+    Args:
+        prefix (bytes): The constant header the nonce is appended to.
+        difficulty (int): The required number of leading zero bits.
+        workers (Optional[int]): The number of worker processes (default: CPU count).
+        nonce_count (int): The size of the nonce space to search.
+
+    Returns:
+        Solution: The nonce, its digest, and the hashes tried across all workers.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"At least one worker is needed, got {workers}.")
+    if nonce_count < 1:
+        raise ValueError(f"The nonce space must not be empty, got {nonce_count}.")
+    step = -(-nonce_count // workers)
+    ranges = [
+        (start, min(start + step, nonce_count)) for start in range(0, nonce_count, step)
+    ]
+    stop_event = multiprocessing.Event()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=len(ranges), initializer=_init_worker, initargs=(stop_event,)
+    ) as executor:
+        futures = [
+            executor.submit(search_range, prefix, difficulty, start, stop)
+            for start, stop in ranges
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    hashes = sum(tried for _, tried in results)
+    nonces = [nonce for nonce, _ in results if nonce is not None]
+    if not nonces:
+        raise ValueError(
+            f"No nonce in [0, {nonce_count}) reaches difficulty {difficulty}"
+        )
+    nonce = nonces[0]
+    digest = SHA256(prefix + nonce.to_bytes(NONCE_SIZE, "big")).digest()
+    return Solution(nonce, digest, hashes, elapsed)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Run from the parent directory: python -m sha256.proof_of_work
+    solution = solve(b"admission:client-42:" * 4, difficulty=16)
+    print(f"nonce {solution.nonce}, digest {solution.digest.hex()}")
+    print(f"{solution.hashes} hashes in {solution.elapsed:.2f}s")
+    print(f"{solution.hashes_per_second:,.0f} hashes/s")
@@ -1,3 +1,5 @@
+import mmap
+import os
 import struct
 from typing import List, Tuple
 
@@ -7,18 +9,18 @@ def right_rotate(value: int, shift: int) -> int:
     return (value >> shift) | (value << (32 - shift)) & 0xFFFFFFFF
 
 
+def padding(length: int) -> bytes:
+    """Returns the SHA-256 padding for a message of `length` bytes."""
+    return (
+        b"\x80"  # Append a single '1' bit (as 0x80)
+        + b"\x00" * ((55 - length) % 64)  # Zeros until length is 448 (mod 512) bits
+        + struct.pack(">Q", length * 8)  # Original length as 64-bit big-endian
+    )
+
+
 def pad_message(message: bytes) -> bytes:
     """Pads the message to be a multiple of 512 bits."""
-    original_length = len(message) * 8  # Length of message in bits
-    message += b"\x80"  # Append a single '1' bit (as 0x80)
-    while (
-        len(message) * 8 + 64
-    ) % 512 != 0:  # Pad with zeros until length is congruent to 448 (mod 512)
-        message += b"\x00"
-    message += struct.pack(
-        ">Q", original_length
-    )  # Append original message length as a 64-bit big-endian integer
-    return message
+    return message + padding(len(message))
 
 
 def split_into_blocks(message: bytes) -> List[bytes]:
@@ -110,6 +112,9 @@ def initialize_constants() -> List[int]:
     ]
 
 
+K = initialize_constants()
+
+
 def process_block(block: bytes, H: List[int], K: List[int]) -> List[int]:
     """Process a single 512-bit block."""
     w = (
@@ -142,14 +147,83 @@ def process_block(block: bytes, H: List[int], K: List[int]) -> List[int]:
     return [(x + y) & 0xFFFFFFFF for x, y in zip(H, [a, b, c, d, e, f, g, h])]
 
 
-def sha256(message: bytes) -> str:
-    """SHA-256 hashing algorithm."""
-    message = pad_message(message)
-    blocks = split_into_blocks(message)
-    H = initialize_hash_values()
-    K = initialize_constants()
+class SHA256:
+    """
+    Incremental SHA-256 hasher with a hashlib-style interface.
+
+    Only a tail of less than one block is buffered between `update()` calls;
+    full blocks are compressed straight from the caller's buffer and the
+    padding is applied on a copy of the state when the digest is requested.
+    """
+
+    name = "sha256"
+    digest_size = 32
+    block_size = 64
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._H: List[int] = initialize_hash_values()
+        self._buffer = bytearray()
+        self._length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> None:
+        """Feed `data` (any bytes-like object) into the hash state."""
+        with memoryview(data) as raw, raw.cast("B") as view:
+            size = len(view)
+            self._length += size
+            offset = 0
+            if self._buffer:
+                offset = min(self.block_size - len(self._buffer), size)
+                self._buffer += view[:offset]
+                if len(self._buffer) < self.block_size:
+                    return
+                self._H = process_block(self._buffer, self._H, K)
+                self._buffer.clear()
+            end = size - (size - offset) % self.block_size
+            H = self._H
+            for i in range(offset, end, self.block_size):
+                H = process_block(view[i : i + self.block_size], H, K)
+            self._H = H
+            self._buffer += view[end:]
+
+    def copy(self) -> "SHA256":
+        """Return an independent hasher forked from the current state."""
+        other = SHA256.__new__(SHA256)
+        other._H = list(self._H)
+        other._buffer = bytearray(self._buffer)
+        other._length = self._length
+        return other
+
+    def digest(self) -> bytes:
+        """Return the digest of the data fed so far without altering the state."""
+        tail = bytes(self._buffer) + padding(self._length)
+        H = self._H
+        for i in range(0, len(tail), self.block_size):
+            H = process_block(tail[i : i + self.block_size], H, K)
+        return struct.pack(">8L", *H)
+
+    def hexdigest(self) -> str:
+        """Return the digest as a string of hexadecimal digits."""
+        return self.digest().hex()
 
-    for block in blocks:
-        H = process_block(block, H, K)
 
-    return "".join(f"{x:08x}" for x in H)
+def sha256(message: bytes) -> str:
+    """SHA-256 hashing algorithm."""
+    return SHA256(message).hexdigest()
+
+
+def sha256_file(path: str) -> str:
+    """
+    Hash a file through a read-only memory map in constant memory.
+
+    The mapping is fed to `SHA256.update` as a memoryview, so blocks are read
+    straight from the page cache without intermediate copies.
+    """
+    hasher = SHA256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # Empty files cannot be mapped
+            return hasher.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            hasher.update(mapped)
+    return hasher.hexdigest()
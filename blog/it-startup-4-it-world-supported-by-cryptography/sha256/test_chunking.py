@@ -0,0 +1,54 @@
+import io
+import random
+from hashlib import sha256 as hashlib_sha256
+
+from .chunking import DigestIndex, chunk_stream, dedup_stream, find_cut_point
+
+SIZES = {"min_size": 256, "avg_size": 1024, "max_size": 4096}
+
+
+def random_bytes(size: int, seed: int = 0) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+def test_find_cut_point_bounds():
+    data = memoryview(random_bytes(20_000))
+    cut = find_cut_point(data, **SIZES)
+    assert SIZES["min_size"] < cut <= SIZES["max_size"]
+    assert find_cut_point(data[:100], **SIZES) == 100
+    assert find_cut_point(memoryview(bytes(10_000)), **SIZES) == SIZES["max_size"]
+
+
+def test_chunk_stream_records():
+    data = random_bytes(100_000)
+    records = list(chunk_stream(io.BytesIO(data), **SIZES))
+    offset = 0
+    for record_offset, length, digest in records:
+        assert record_offset == offset
+        assert length <= SIZES["max_size"]
+        assert digest == hashlib_sha256(data[offset : offset + length]).hexdigest()
+        offset += length
+    assert offset == len(data)
+    assert list(chunk_stream(io.BytesIO(b""), **SIZES)) == []
+
+
+def test_chunk_boundaries_survive_insertions():
+    data = random_bytes(100_000)
+    edited = data[:50_000] + b"inserted" + data[50_000:]
+    before = {digest for _, _, digest in chunk_stream(io.BytesIO(data), **SIZES)}
+    after = {digest for _, _, digest in chunk_stream(io.BytesIO(edited), **SIZES)}
+    assert len(before - after) <= 2
+
+
+def test_dedup_stream_skips_known_chunks(tmp_path):
+    data = random_bytes(50_000)
+    with DigestIndex(str(tmp_path / "index")) as index:
+        first = list(dedup_stream(io.BytesIO(data), index, **SIZES))
+        assert sum(length for _, length, _ in first) == len(data)
+        assert list(dedup_stream(io.BytesIO(data), index, **SIZES)) == []
+
+    # The index persists across runs; only the changed region is new
+    edited = data[:40_000] + random_bytes(1000, seed=1) + data[41_000:]
+    with DigestIndex(str(tmp_path / "index")) as index:
+        new = list(dedup_stream(io.BytesIO(edited), index, **SIZES))
+    assert 0 < len(new) < len(first)
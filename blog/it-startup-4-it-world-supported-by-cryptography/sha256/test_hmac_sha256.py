@@ -0,0 +1,108 @@
+import pytest
+
+from .hmac_sha256 import hmac_sha256, key_midstates, pbkdf2_hmac_sha256
+
+
+@pytest.mark.parametrize(
+    "key, message, expected",
+    [
+        # RFC 4231 test cases 1-4, 6 and 7
+        (
+            b"\x0b" * 20,
+            b"Hi There",
+            "b0344c61d8db38535ca8afceaf0bf12b881dc200c9833da726e9376c2e32cff7",
+        ),
+        (
+            b"Jefe",
+            b"what do ya want for nothing?",
+            "5bdcc146bf60754e6a042426089575c75a003f089d2739839dec58b964ec3843",
+        ),
+        (
+            b"\xaa" * 20,
+            b"\xdd" * 50,
+            "773ea91e36800e46854db8ebd09181a72959098b3ef8c122d9635514ced565fe",
+        ),
+        (
+            bytes(range(1, 26)),
+            b"\xcd" * 50,
+            "82558a389a443c0ea4cc819899f2083a85f0faa3e578f8077a2e3ff46729665b",
+        ),
+        (
+            b"\xaa" * 131,
+            b"Test Using Larger Than Block-Size Key - Hash Key First",
+            "60e431591ee0b67f0d8a26aacbf5b77f8e0bc6213728c5140546040f0ee37f54",
+        ),
+        (
+            b"\xaa" * 131,
+            b"This is a test using a larger than block-size key and a larger than "
+            b"block-size data. The key needs to be hashed before being used by the "
+            b"HMAC algorithm.",
+            "9b09ffa71b942fcb27635fbcd5b0e944bfdc63644f0713938a7f51535c3a35e2",
+        ),
+    ],
+)
+def test_hmac_sha256_rfc4231(key, message, expected):
+    assert hmac_sha256(key, message).hex() == expected
+    # A second call is served from the cached midstates
+    assert hmac_sha256(key, message).hex() == expected
+
+
+def test_key_midstates_are_cached():
+    key_midstates.cache_clear()
+    hmac_sha256(b"key", b"one")
+    hmac_sha256(b"key", b"two")
+    info = key_midstates.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+@pytest.mark.parametrize(
+    "password, salt, iterations, dklen, expected",
+    [
+        # RFC 6070 inputs with their PBKDF2-HMAC-SHA256 outputs
+        (
+            b"password",
+            b"salt",
+            1,
+            32,
+            "120fb6cffcf8b32c43e7225256c4f837a86548c92ccc35480805987cb70be17b",
+        ),
+        (
+            b"password",
+            b"salt",
+            2,
+            32,
+            "ae4d0c95af6b46d32d0adff928f06dd02a303f8ef3c251dfd6e2d85a95474c43",
+        ),
+        (
+            b"password",
+            b"salt",
+            4096,
+            32,
+            "c5e478d59288c841aa530db6845c4c8d962893a001ce4e11a4963873aa98134a",
+        ),
+        (
+            b"pass\x00word",
+            b"sa\x00lt",
+            4096,
+            16,
+            "89b69d0516f829893c696226650a8687",
+        ),
+        # RFC 7914 section 11
+        (
+            b"passwd",
+            b"salt",
+            1,
+            64,
+            "55ac046e56e3089fec1691c22544b605f94185216dde0465e68b9d57c20dacbc"
+            "49ca9cccf179b645991664b39d77ef317c71b845b1e30bd509112041d3a19783",
+        ),
+    ],
+)
+def test_pbkdf2_hmac_sha256(password, salt, iterations, dklen, expected):
+    assert pbkdf2_hmac_sha256(password, salt, iterations, dklen).hex() == expected
+
+
+def test_pbkdf2_hmac_sha256_rejects_zero_iterations():
+    with pytest.raises(ValueError):
+        pbkdf2_hmac_sha256(b"password", b"salt", 0)
@@ -0,0 +1,46 @@
+from hashlib import sha256 as hashlib_sha256
+
+import pytest
+
+from .merkle import MerkleTree, hash_leaf, hash_node, verify_proof
+
+
+def test_hash_leaf_and_node():
+    assert hash_leaf(b"abc") == hashlib_sha256(b"\x00abc").digest()
+    left, right = hash_leaf(b"a"), hash_leaf(b"b")
+    assert hash_node(left, right) == hashlib_sha256(b"\x01" + left + right).digest()
+
+
+def test_merkle_root_small_tree():
+    data = b"aaaabbbbcccc"
+    tree = MerkleTree.from_bytes(data, leaf_size=4, max_workers=2)
+    a, b, c = hash_leaf(b"aaaa"), hash_leaf(b"bbbb"), hash_leaf(b"cccc")
+    assert tree.root == hash_node(hash_node(a, b), c)
+    assert tree.hexdigest() == tree.root.hex()
+
+
+def test_merkle_single_leaf_and_empty_input():
+    assert MerkleTree.from_bytes(b"abc", leaf_size=4).root == hash_leaf(b"abc")
+    assert MerkleTree.from_bytes(b"", leaf_size=4).root == hash_leaf(b"")
+
+
+def test_merkle_proofs():
+    data = bytes(range(256)) * 3
+    leaf_size = 64
+    tree = MerkleTree.from_bytes(data, leaf_size=leaf_size, max_workers=2)
+    leaves = [data[i : i + leaf_size] for i in range(0, len(data), leaf_size)]
+    for index, leaf in enumerate(leaves):
+        proof = tree.proof(index)
+        assert verify_proof(leaf, proof, tree.root)
+        assert not verify_proof(leaf + b"!", proof, tree.root)
+    with pytest.raises(IndexError):
+        tree.proof(len(leaves))
+
+
+def test_merkle_from_file(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    from_file = MerkleTree.from_file(str(path), leaf_size=1000, max_workers=2)
+    from_bytes = MerkleTree.from_bytes(data, leaf_size=1000, max_workers=2)
+    assert from_file.root == from_bytes.root
@@ -0,0 +1,46 @@
+from hashlib import sha256 as hashlib_sha256
+
+import pytest
+
+from .proof_of_work import leading_zero_bits, search_range, solve, verify
+
+
+def test_leading_zero_bits():
+    assert leading_zero_bits(b"\x00\x00\xff") == 16
+    assert leading_zero_bits(b"\x01" + b"\xff" * 31) == 7
+    assert leading_zero_bits(b"\x00" * 32) == 256
+
+
+def test_search_range_reuses_midstate():
+    prefix = b"p" * 100  # Spans a full block plus a tail
+    nonce, tried = search_range(prefix, 6, 0, 10_000)
+    assert nonce is not None
+    assert tried == nonce + 1
+    digest = hashlib_sha256(prefix + nonce.to_bytes(8, "big")).digest()
+    assert leading_zero_bits(digest) >= 6
+    for earlier in range(nonce):
+        assert not verify(prefix, earlier, 6)
+
+
+def test_solve():
+    prefix = b"header"
+    solution = solve(prefix, difficulty=8, workers=2)
+    assert verify(prefix, solution.nonce, 8)
+    assert (
+        solution.digest
+        == hashlib_sha256(prefix + solution.nonce.to_bytes(8, "big")).digest()
+    )
+    assert solution.hashes >= 1
+    assert solution.hashes_per_second > 0
+
+
+def test_solve_exhausted_nonce_space():
+    with pytest.raises(ValueError):
+        solve(b"header", difficulty=64, workers=2, nonce_count=16)
+
+
+def test_solve_rejects_empty_search():
+    with pytest.raises(ValueError, match="nonce space"):
+        solve(b"header", difficulty=1, workers=2, nonce_count=0)
+    with pytest.raises(ValueError, match="worker"):
+        solve(b"header", difficulty=1, workers=0)
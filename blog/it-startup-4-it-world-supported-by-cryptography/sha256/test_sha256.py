@@ -9,6 +9,8 @@ from .sha256 import (
     initialize_constants,
     process_block,
     sha256,
+    sha256_file,
+    SHA256,
 )
 
 
@@ -90,3 +92,53 @@ def test_sha256():
     computed_hash = sha256(message)
     expected_hash = hashlib_sha256(message).hexdigest()
     assert computed_hash == expected_hash
+
+
+def test_sha256_matches_hashlib_across_padding_boundaries():
+    for length in [0, 1, 55, 56, 63, 64, 65, 119, 120, 128, 1000]:
+        message = (bytes(range(256)) * 4)[:length]
+        assert sha256(message) == hashlib_sha256(message).hexdigest()
+
+
+def test_sha256_incremental_update():
+    message = bytes(range(256)) * 10
+    for chunk_size in [1, 7, 63, 64, 65, 500]:
+        hasher = SHA256()
+        for i in range(0, len(message), chunk_size):
+            hasher.update(message[i : i + chunk_size])
+        assert hasher.digest() == hashlib_sha256(message).digest()
+        assert hasher.hexdigest() == hashlib_sha256(message).hexdigest()
+
+
+def test_sha256_accepts_buffers():
+    message = bytearray(b"a" * 200)
+    hasher = SHA256(memoryview(message)[:100])
+    hasher.update(message[100:])
+    assert hasher.hexdigest() == hashlib_sha256(message).hexdigest()
+
+
+def test_sha256_digest_does_not_alter_state():
+    hasher = SHA256(b"abc")
+    assert hasher.digest() == hasher.digest()
+    hasher.update(b"def")
+    assert hasher.hexdigest() == hashlib_sha256(b"abcdef").hexdigest()
+
+
+def test_sha256_copy():
+    hasher = SHA256(b"x" * 100)
+    fork = hasher.copy()
+    hasher.update(b"left")
+    fork.update(b"right")
+    assert hasher.hexdigest() == hashlib_sha256(b"x" * 100 + b"left").hexdigest()
+    assert fork.hexdigest() == hashlib_sha256(b"x" * 100 + b"right").hexdigest()
+
+
+def test_sha256_file(tmp_path):
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert sha256_file(str(empty)) == hashlib_sha256(b"").hexdigest()
+
+    data = bytes(range(256)) * 1000 + b"tail"
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    assert sha256_file(str(path)) == hashlib_sha256(data).hexdigest()
@@ -0,0 +1,30 @@
+import random
+from hashlib import sha256 as hashlib_sha256
+
+import numpy as np
+
+from .sha256 import right_rotate, sha256
+from .vectorized import right_rotate_lanes, sha256_many
+
+
+def test_right_rotate_lanes():
+    values = [0x00000001, 0x80000000, 0x12345678]
+    rotated = right_rotate_lanes(np.array(values, dtype=np.uint32), 4)
+    assert rotated.tolist() == [right_rotate(value, 4) for value in values]
+
+
+def test_sha256_many_matches_hashlib():
+    rng = random.Random(0)
+    messages = [rng.randbytes(rng.randrange(0, 300)) for _ in range(200)]
+    messages += [b"", b"abc", b"a" * 55, b"a" * 56, b"a" * 64]
+    expected = [hashlib_sha256(message).hexdigest() for message in messages]
+    assert sha256_many(messages) == expected
+
+
+def test_sha256_many_matches_scalar():
+    messages = [f"record-{i}".encode() for i in range(20)]
+    assert sha256_many(messages) == [sha256(message) for message in messages]
+
+
+def test_sha256_many_empty():
+    assert sha256_many([]) == []
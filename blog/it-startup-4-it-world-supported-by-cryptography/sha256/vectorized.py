@@ -0,0 +1,99 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .sha256 import K, initialize_hash_values, padding
+
+K_LANES = np.array(K, dtype=np.uint32)
+H_LANES = np.array(initialize_hash_values(), dtype=np.uint32)
+
+
+def right_rotate_lanes(value: np.ndarray, shift: int) -> np.ndarray:
+    """Right rotate every 32-bit lane of `value` by shift."""
+    return (value >> np.uint32(shift)) | (value << np.uint32(32 - shift))
+
+
+def process_blocks(blocks: np.ndarray, H: np.ndarray) -> np.ndarray:
+    """
+    Process one 512-bit block per lane.
+
+    Args:
+        blocks (np.ndarray): uint32 array of shape (16, lanes), one column per message.
+        H (np.ndarray): uint32 array of shape (8, lanes) with the running hash values.
+
+    Returns:
+        np.ndarray: The updated (8, lanes) hash values.
+    """
+    w = np.empty((64, blocks.shape[1]), dtype=np.uint32)
+    w[:16] = blocks
+    for j in range(16, 64):
+        s0 = (
+            right_rotate_lanes(w[j - 15], 7)
+            ^ right_rotate_lanes(w[j - 15], 18)
+            ^ (w[j - 15] >> np.uint32(3))
+        )
+        s1 = (
+            right_rotate_lanes(w[j - 2], 17)
+            ^ right_rotate_lanes(w[j - 2], 19)
+            ^ (w[j - 2] >> np.uint32(10))
+        )
+        w[j] = w[j - 16] + s0 + w[j - 7] + s1  # Word expansion, wraps mod 2**32
+
+    a, b, c, d, e, f, g, h = H
+
+    for j in range(64):
+        S1 = (
+            right_rotate_lanes(e, 6)
+            ^ right_rotate_lanes(e, 11)
+            ^ right_rotate_lanes(e, 25)
+        )
+        ch = (e & f) ^ (~e & g)
+        temp1 = h + S1 + ch + K_LANES[j] + w[j]
+        S0 = (
+            right_rotate_lanes(a, 2)
+            ^ right_rotate_lanes(a, 13)
+            ^ right_rotate_lanes(a, 22)
+        )
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        temp2 = S0 + maj
+
+        h = g
+        g = f
+        f = e
+        e = d + temp1
+        d = c
+        c = b
+        b = a
+        a = temp1 + temp2
+
+    return H + np.stack([a, b, c, d, e, f, g, h])
+
+
+def sha256_many(messages: Iterable[bytes]) -> List[str]:
+    """
+    SHA-256 of many messages at once, computed across NumPy lanes.
+
+    Messages are grouped by their padded block count so that every lane of a
+    group runs the message schedule and the 64 rounds in lockstep.
+
+    Returns:
+        List[str]: The hex digests, in the same order as `messages`.
+    """
+    messages = [bytes(message) for message in messages]
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i, message in enumerate(messages):
+        groups[(len(message) + 8) // 64 + 1].append(i)
+
+    digests: List[str] = [""] * len(messages)
+    for block_count, indices in groups.items():
+        padded = b"".join(messages[i] + padding(len(messages[i])) for i in indices)
+        words = np.frombuffer(padded, dtype=">u4").astype(np.uint32)
+        words = words.reshape(len(indices), block_count, 16)
+        H = np.repeat(H_LANES[:, None], len(indices), axis=1)
+        for block in range(block_count):
+            H = process_blocks(words[:, block, :].T, H)
+        raw = H.T.astype(">u4").tobytes()
+        for lane, i in enumerate(indices):
+            digests[i] = raw[lane * 32 : lane * 32 + 32].hex()
+    return digests
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from .consistent_hashing import ConsistentHashing
+
+# Run from the parent directory: python -m consistent_hashing.bench_consistent_hashing
+
+
+def main() -> None:
+    ch = ConsistentHashing(vnodes_by_node=100)
+    for i in range(100):
+        ch.add_node(f"node{i}")
+    keys = [f"key{i}" for i in range(200_000)]
+
+    started = time.perf_counter()
+    for key in keys:
+        ch.get_node(key)
+    elapsed = time.perf_counter() - started
+    print(f"get_node:  {len(keys) / elapsed:,.0f} keys/s")
+
+    started = time.perf_counter()
+    ch.get_nodes(keys)
+    elapsed = time.perf_counter() - started
+    print(f"get_nodes: {len(keys) / elapsed:,.0f} keys/s")
+
+    started = time.perf_counter()
+    for key in keys:
+        ch.get_replicas(key)
+    elapsed = time.perf_counter() - started
+    print(f"get_replicas(n={ch.replication_factor}): {len(keys) / elapsed:,.0f} keys/s")
+
+    # Hot keys: the same 1,000 keys looked up over and over
+    hot = keys[:1000] * 200
+    for cache_size in (0, 10_000):
+        ch.cache_size = cache_size
+        started = time.perf_counter()
+        for key in hot:
+            ch.get_node(key)
+        elapsed = time.perf_counter() - started
+        print(f"hot keys, cache_size={cache_size}: {len(hot) / elapsed:,.0f} keys/s")
+
+    # Churn: one node joins and leaves rings of growing size
+    for node_count in (100, 1000, 5000):
+        ch = ConsistentHashing(vnodes_by_node=100)
+        ch.add_nodes(f"node{i}" for i in range(node_count))
+        started = time.perf_counter()
+        for i in range(10):
+            ch.add_node(f"extra{i}")
+            ch.remove_node(f"extra{i}")
+        elapsed = (time.perf_counter() - started) / 20
+        print(f"churn, {len(ch.positions):>7,} vnodes: {elapsed * 1000:.2f} ms/change")
+
+    # Lookups from reader threads while a writer thread churns the membership
+    ch = ConsistentHashing(vnodes_by_node=100)
+    ch.add_nodes(f"node{i}" for i in range(100))
+    stop = threading.Event()
+    lookups = []
+    changes = 0
+
+    def read() -> None:
+        count = 0
+        while not stop.is_set():
+            for key in keys[:1000]:
+                ch.get_node(key)
+            count += 1000
+        lookups.append(count)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    started = time.perf_counter()
+    while time.perf_counter() - started < 2:
+        ch.add_node("extra")
+        ch.remove_node("extra")
+        changes += 2
+    stop.set()
+    for reader in readers:
+        reader.join()
+    elapsed = time.perf_counter() - started
+    print(
+        f"during churn: {sum(lookups) / elapsed:,.0f} lookups/s from "
+        f"{len(readers)} threads, {changes / elapsed:,.0f} changes/s"
+    )
+
+    # Migration: keys moved when one node joins a loaded ring
+    ch = ConsistentHashing(vnodes_by_node=100)
+    ch.add_nodes(f"node{i}" for i in range(100))
+    for key in keys:
+        ch.put(key)
+    started = time.perf_counter()
+    moved = sum(1 for _ in ch.add_node("extra"))
+    elapsed = time.perf_counter() - started
+    print(
+        f"migration: {moved:,} of {len(keys):,} keys moved in {elapsed * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple
+
+from .consistent_hashing import ConsistentHashing
+from .strategies import BoundedLoadConsistentHashing, JumpHash, RendezvousHashing
+
+# Run from the parent directory: python -m consistent_hashing.bench_strategies
+
+ENGINES: Dict[str, Callable[[], object]] = {
+    "ring, 3 vnodes": lambda: ConsistentHashing(vnodes_by_node=3),
+    "ring, 160 vnodes": lambda: ConsistentHashing(vnodes_by_node=160),
+    "jump hash": JumpHash,
+    "rendezvous": RendezvousHashing,
+    "bounded load": lambda: BoundedLoadConsistentHashing(vnodes_by_node=20),
+}
+
+
+class Report(NamedTuple):
+    lookup_us: float  # Mean get_node latency, in microseconds
+    memory: int  # Bytes allocated by the engine for its nodes
+    load_stdev: float  # Standard deviation of the keys per node
+    moved_on_add: int
+    moved_on_remove: int
+
+
+def measure(factory: Callable[[], object], nodes: List[str], keys: List[str]) -> Report:
+    tracemalloc.start()
+    engine = factory()
+    for node in nodes:
+        engine.add_node(node)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    before = [engine.get_node(key) for key in keys]
+    lookup_us = (time.perf_counter() - started) / len(keys) * 1e6
+    loads = Counter(before)
+    load_stdev = statistics.pstdev(loads.get(node, 0) for node in nodes)
+
+    engine.add_node("extra")
+    added = [engine.get_node(key) for key in keys]
+    engine.remove_node(nodes[len(nodes) // 2])
+    removed = [engine.get_node(key) for key in keys]
+    return Report(
+        lookup_us,
+        memory,
+        load_stdev,
+        sum(a != b for a, b in zip(before, added)),
+        sum(a != b for a, b in zip(added, removed)),
+    )
+
+
+def main() -> None:
+    nodes = [f"node{i}" for i in range(50)]
+    keys = [f"key{i}" for i in range(50_000)]
+    print(
+        f"{len(nodes)} nodes, {len(keys):,} keys ({len(keys) // len(nodes)} per node)"
+    )
+    print(
+        f"{'engine':<18}{'lookup':>10}{'memory':>12}{'load stdev':>12}"
+        f"{'moved +1':>10}{'moved -1':>10}"
+    )
+    for name, factory in ENGINES.items():
+        report = measure(factory, nodes, keys)
+        print(
+            f"{name:<18}{report.lookup_us:>8.2f}us{report.memory:>11,}B"
+            f"{report.load_stdev:>12.1f}{report.moved_on_add:>10,}"
+            f"{report.moved_on_remove:>10,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,487 @@
 import hashlib
-from typing import List, Tuple, Set
+import math
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+HASH_MAX = 2**64 - 1
+CACHE_HISTORY = 64  # Membership changes remembered to revalidate cached lookups
+
+# (start, end, from_node, to_node): the hashes in (start, end] changed owner;
+# start >= end means the arc wraps around zero
+Arc = Tuple[int, int, str, str]
+# (key, from_node, to_node)
+Migration = Tuple[str, str, str]
+
+
+def hash64(key: str) -> int:
+    """Generate a 64-bit hash for the given key from the first 8 bytes of MD5."""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+def _split_arc(start: int, end: int) -> List[Tuple[int, int]]:
+    """Split an arc (start, end] into ranges that do not wrap around zero."""
+    if start < end:
+        return [(start, end)]
+    return [(start, HASH_MAX), (-1, end)]
+
+
+def preference_lists(
+    owners: np.ndarray, count: int, rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    The first `count` distinct owners met walking clockwise from each position.
+
+    Column j is filled for all positions at once: every position advances its
+    own cursor past owners it already chose until all have found a new one.
+
+    Args:
+        owners (np.ndarray): The owner of each ring position.
+        count (int): The list length; at most the number of distinct owners.
+        rows (Optional[np.ndarray]): The positions to compute; all if omitted.
+
+    Returns:
+        np.ndarray: uint32 array of shape (len(rows), count).
+    """
+    size = len(owners)
+    rows = np.arange(size) if rows is None else rows.astype(np.int64)
+    preferences = np.empty((len(rows), count), dtype=np.uint32)
+    if not len(rows) or not count:
+        return preferences
+    preferences[:, 0] = owners[rows]
+    cursors = rows.copy()
+    for j in range(1, count):
+        cursors += 1
+        active = np.arange(len(rows))
+        while len(active):
+            candidates = owners[cursors[active] % size]
+            taken = (preferences[active, :j] == candidates[:, None]).any(axis=1)
+            preferences[active[~taken], j] = candidates[~taken]
+            active = active[taken]
+            cursors[active] += 1
+    return preferences
+
+
+def refresh_preference_lists(
+    owners: np.ndarray, preferences: np.ndarray, changes: Iterable[int]
+) -> None:
+    """
+    Recompute in place the preference lists that a membership change touched.
+
+    `changes` are the ring indexes of the new positions, and of the positions
+    that follow a removed one. A list is stale only if its clockwise walk
+    reaches a change before it has met `count` distinct owners, so each change
+    dirties just the few positions before it.
+
+    Args:
+        owners (np.ndarray): The owner of each position of the new ring.
+        preferences (np.ndarray): The lists of the old ring moved to the rows of
+            the new ring; the rows of new positions may hold anything.
+        changes (Iterable[int]): The ring indexes where positions were added or
+            removed.
+    """
+    size, count = preferences.shape
+    dirty = set()
+    for change in changes:
+        seen = set()
+        for i in range(change - 1, change - 1 - size, -1):
+            seen.add(owners[i % size])
+            if len(seen) >= count:
+                break
+            dirty.add(i % size)
+        dirty.add(change % size)
+    if dirty:
+        rows = np.fromiter(dirty, dtype=np.int64, count=len(dirty))
+        preferences[rows] = preference_lists(owners, count, rows)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class KeyIndex:
+    """The keys stored on one node, sorted by hash."""
+
+    def __init__(self) -> None:
+        self.hashes: List[int] = []
+        self.keys: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, hash_key: int, key: str) -> None:
+        low = bisect_left(self.hashes, hash_key)
+        high = bisect_right(self.hashes, hash_key, low)
+        if key not in self.keys[low:high]:
+            self.hashes.insert(high, hash_key)
+            self.keys.insert(high, key)
+
+    def discard(self, hash_key: int, key: str) -> bool:
+        low = bisect_left(self.hashes, hash_key)
+        high = bisect_right(self.hashes, hash_key, low)
+        for i in range(low, high):
+            if self.keys[i] == key:
+                del self.hashes[i], self.keys[i]
+                return True
+        return False
+
+    def pop_range(self, low: int, high: int) -> Tuple[List[int], List[str]]:
+        """Remove and return the (hashes, keys) with a hash in (low, high]."""
+        start = bisect_right(self.hashes, low)
+        end = bisect_right(self.hashes, high, start)
+        hashes, keys = self.hashes[start:end], self.keys[start:end]
+        del self.hashes[start:end], self.keys[start:end]
+        return hashes, keys
+
+    def insert_range(self, hashes: List[int], keys: List[str]) -> None:
+        """Insert sorted (hashes, keys) that no stored hash falls between."""
+        at = bisect_left(self.hashes, hashes[0])
+        self.hashes[at:at] = hashes
+        self.keys[at:at] = keys
+
+
+class RingSnapshot(NamedTuple):
+    """
+    One immutable version of the ring.
+
+    Membership changes build a new snapshot and publish it with a single
+    reference assignment, so a reader that holds a snapshot always sees a
+    complete, sorted ring.
+    """
+
+    positions: array  # Sorted 64-bit vnode positions
+    owners: array  # Index into node_names of the owner of each position
+    node_names: Tuple[str, ...]
+    nodes: FrozenSet[str]
+    epoch: int  # Bumped by every membership change
+    # Row-major (len(positions), replicas) preference lists (see preference_lists)
+    preferences: array
+    replicas: int
 
 
 class ConsistentHashing:
-    def __init__(self, vnodes_by_node: int = 3) -> None:
-        self.ring: List[Tuple[int, str]] = []  # List of (hash_key, node) tuples
+    def __init__(
+        self, vnodes_by_node: int = 3, cache_size: int = 0, replication_factor: int = 3
+    ) -> None:
         self.vnodes_by_node: int = vnodes_by_node
-        self.nodes: Set[str] = set()
+        self.replication_factor = replication_factor
+        self.snapshot = RingSnapshot(
+            array("Q"), array("I"), (), frozenset(), 0, array("I"), 0
+        )
+        self.node_ids: Dict[str, int] = {}
+        # Serializes membership changes and key store updates; lookups only read
+        # self.snapshot and do not take it
+        self._write_lock = threading.Lock()
+        # The key store: the keys owned by each node
+        self.key_index: Dict[str, KeyIndex] = {}
+        # Optional LRU lookup cache: key -> (hash, node, epoch it was checked at),
+        # and the (starts, ends) of the ranges each recent epoch changed
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[str, Tuple[int, str, int]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.changed_ranges: "OrderedDict[int, Tuple[List[int], List[int]]]" = (
+            OrderedDict()
+        )
+        self._cache_lock = threading.Lock()
+
+    @property
+    def nodes(self) -> FrozenSet[str]:
+        return self.snapshot.nodes
+
+    @property
+    def positions(self) -> array:
+        return self.snapshot.positions
+
+    @property
+    def owners(self) -> array:
+        return self.snapshot.owners
+
+    @property
+    def node_names(self) -> Tuple[str, ...]:
+        return self.snapshot.node_names
+
+    @property
+    def epoch(self) -> int:
+        return self.snapshot.epoch
+
+    @property
+    def ring(self) -> List[Tuple[int, str]]:
+        """The ring as a list of (hash_key, node) tuples."""
+        snapshot = self.snapshot
+        names = snapshot.node_names
+        return [(h, names[i]) for h, i in zip(snapshot.positions, snapshot.owners)]
 
     def _hash(self, key: str) -> int:
-        """Generate a hash for the given key using MD5."""
-        return int(hashlib.md5(key.encode("utf-8")).hexdigest(), 16)
+        """Generate a hash for the given key (see `hash64`)."""
+        return hash64(key)
+
+    def _vnode_positions(self, node: str, count: int) -> np.ndarray:
+        """Positions of the first `count` virtual nodes of `node`."""
+        return np.array(
+            [self._hash(f"{node}:{i}") for i in range(count)], dtype=np.uint64
+        )
+
+    def _publish(
+        self,
+        positions: np.ndarray,
+        owners: np.ndarray,
+        node_names: Tuple[str, ...],
+        nodes: FrozenSet[str],
+        arcs: Sequence[Arc],
+        preferences: Optional[np.ndarray] = None,
+        changes: Sequence[int] = (),
+    ) -> None:
+        """
+        Build the next snapshot and swap it in.
+
+        The preference lists are rebuilt in full unless `preferences` holds the
+        lists of the current snapshot moved to the rows of the new ring; then
+        only the rows near `changes` are recomputed (see
+        `refresh_preference_lists`).
+        """
+        replicas = min(self.replication_factor, len(nodes))
+        if preferences is None or preferences.shape[1] != replicas:
+            preferences = preference_lists(owners, replicas)
+        else:
+            refresh_preference_lists(owners, preferences, changes)
+        snapshot = RingSnapshot(
+            array("Q", positions.tobytes()),
+            array("I", owners.astype(np.uint32).tobytes()),
+            node_names,
+            nodes,
+            self.snapshot.epoch + 1,
+            array("I", preferences.tobytes()),
+            replicas,
+        )
+        with self._cache_lock:
+            self._ring_changed(snapshot, arcs)
+            self.snapshot = snapshot
 
-    def _sort_ring(self) -> None:
-        """Sort the ring based on hash keys."""
-        self.ring.sort()
+    def _ring_changed(self, snapshot: RingSnapshot, arcs: Sequence[Arc]) -> None:
+        """Remember which hash ranges changed owner in the epoch of `snapshot`."""
+        if not self.cache_size or not snapshot.positions:
+            # No ranges are recorded, so cached entries could not be revalidated
+            self.cache.clear()
+            self.changed_ranges.clear()
+            return
+        ranges = sorted(
+            (high, low)
+            for start, end, _, _ in arcs
+            for low, high in _split_arc(start, end)
+        )
+        starts = [low for _, low in ranges]
+        ends = [high for high, _ in ranges]
+        self.changed_ranges[snapshot.epoch] = (starts, ends)
+        if len(self.changed_ranges) > CACHE_HISTORY:
+            self.changed_ranges.popitem(last=False)
 
-    def add_node(self, node: str) -> None:
+    def _changed_since(self, hash_key: int, epoch: int, current: int) -> bool:
+        """Whether the owner of `hash_key` may have changed after `epoch`."""
+        if epoch < current - len(self.changed_ranges):
+            return True
+        for changed in range(epoch + 1, current + 1):
+            if changed not in self.changed_ranges:
+                return True
+            starts, ends = self.changed_ranges[changed]
+            i = bisect_left(ends, hash_key)
+            if i < len(ends) and starts[i] < hash_key:
+                return True
+        return False
+
+    def _preference_rows(self, snapshot: RingSnapshot) -> Optional[np.ndarray]:
+        """The preference lists of `snapshot`, one row per position."""
+        if not snapshot.positions:
+            return None
+        return np.frombuffer(snapshot.preferences, dtype=np.uint32).reshape(
+            -1, snapshot.replicas
+        )
+
+    def cache_info(self) -> CacheInfo:
+        """Hit and miss counts of the lookup cache, like functools.lru_cache."""
+        return CacheInfo(
+            self.cache_hits, self.cache_misses, self.cache_size, len(self.cache)
+        )
+
+    def add_node(self, node: str, weight: float = 1.0) -> Iterator[Migration]:
         """Add a node and its virtual nodes to the ring."""
-        self.nodes.add(node)
-        for i in range(self.vnodes_by_node):
-            vnode_key = f"{node}:{i}"
-            hash_key = self._hash(vnode_key)
-            self.ring.append((hash_key, node))
-            print(f"add_node: virtual node {vnode_key}, ring length: {len(self.ring)}")
-        self._sort_ring()
-        self.redistribute_keys(node)
-
-    def remove_node(self, node: str) -> None:
+        return self.add_nodes([node], [weight])
+
+    def add_nodes(
+        self, nodes: Iterable[str], weights: Optional[Sequence[float]] = None
+    ) -> Iterator[Migration]:
+        """
+        Add several nodes and their virtual nodes to the ring in one pass.
+
+        Only the new positions are sorted; they are then merged into the sorted
+        ring with a single insert, so the cost is O(R + V log V) for a ring of
+        R positions and V new virtual nodes instead of a full O(R log R) sort.
+
+        A node of weight w gets round(w * vnodes_by_node) virtual nodes, at
+        least one, so its share of the keys follows its capacity.
+
+        Args:
+            nodes (Iterable[str]): The nodes to add.
+            weights (Optional[Sequence[float]]): The capacity of each node;
+                1.0 for every node if omitted.
+
+        Returns:
+            Iterator[Migration]: The keys that moved to the new nodes (see
+                `redistribute_keys`).
+        """
+        nodes = list(nodes)
+        weights = [1.0] * len(nodes) if weights is None else list(weights)
+        if len(weights) != len(nodes):
+            raise ValueError("There must be one weight per node.")
+        if not all(math.isfinite(weight) and weight > 0 for weight in weights):
+            raise ValueError("Node weights must be positive and finite.")
+        if len(set(nodes)) != len(nodes):
+            raise ValueError("The nodes to add must be distinct.")
+        if not nodes:
+            return iter(())
+        with self._write_lock:
+            snapshot = self.snapshot
+            for node in nodes:
+                if node in snapshot.nodes:
+                    raise ValueError(f"Node {node} is already on the ring.")
+            names = list(snapshot.node_names)
+            new_positions = []
+            new_owners = []
+            for node, weight in zip(nodes, weights):
+                node_id = self.node_ids.setdefault(node, len(names))
+                if node_id == len(names):
+                    names.append(node)
+                count = max(1, round(self.vnodes_by_node * weight))
+                new_positions.append(self._vnode_positions(node, count))
+                new_owners.append(np.full(count, node_id, dtype=np.uint32))
+            new_positions = np.concatenate(new_positions)
+            order = np.argsort(new_positions, kind="stable")
+            new_positions = new_positions[order]
+            new_owners = np.concatenate(new_owners)[order]
+
+            positions = np.frombuffer(snapshot.positions, dtype=np.uint64)
+            owners = np.frombuffer(snapshot.owners, dtype=np.uint32)
+            at = np.searchsorted(positions, new_positions)
+            ring = np.insert(positions, at, new_positions)
+            inserted = at + np.arange(len(at))
+            arcs = []
+            preferences = None
+            if len(positions):
+                preferences = np.insert(self._preference_rows(snapshot), at, 0, axis=0)
+                # Each new vnode takes the arc from its predecessor on the new
+                # ring, which the old successor of the vnode owned before
+                previous = ring[at + np.arange(len(at)) - 1]
+                old_owners = owners[at % len(positions)]
+                arcs = [
+                    (start, end, names[source], names[target])
+                    for start, end, source, target in zip(
+                        previous.tolist(),
+                        new_positions.tolist(),
+                        old_owners.tolist(),
+                        new_owners.tolist(),
+                    )
+                ]
+            self._publish(
+                ring,
+                np.insert(owners, at, new_owners),
+                tuple(names),
+                snapshot.nodes.union(nodes),
+                arcs,
+                preferences,
+                inserted.tolist(),
+            )
+            return self.redistribute_keys(arcs)
+
+    def remove_node(self, node: str) -> Iterator[Migration]:
         """Remove a node and its virtual nodes from the ring."""
-        self.nodes.remove(node)
-        self.ring = [(hash_key, n) for hash_key, n in self.ring if n != node]
-        print(f"remove_node: node {node}, ring length: {len(self.ring)}")
-        self._sort_ring()
-        self.redistribute_keys(node)
+        return self.remove_nodes([node])
+
+    def remove_nodes(self, nodes: Iterable[str]) -> Iterator[Migration]:
+        """
+        Remove several nodes and their virtual nodes from the ring in one pass.
+
+        The ring stays sorted when positions are dropped, so this is a single
+        O(R) filter over the owner array.
+
+        Args:
+            nodes (Iterable[str]): The nodes to remove.
+
+        Returns:
+            Iterator[Migration]: The keys of the removed nodes and where they
+                moved (see `redistribute_keys`).
+        """
+        nodes = list(nodes)
+        if not nodes:
+            return iter(())
+        with self._write_lock:
+            snapshot = self.snapshot
+            for node in nodes:
+                if node not in snapshot.nodes:
+                    raise ValueError(f"Node {node} is not on the ring.")
+            node_ids = [self.node_ids[node] for node in nodes]
+            positions = np.frombuffer(snapshot.positions, dtype=np.uint64)
+            owners = np.frombuffer(snapshot.owners, dtype=np.uint32)
+            keep = ~np.isin(owners, node_ids)
+            arcs = []
+            preferences = None
+            successors = np.empty(0, dtype=np.int64)
+            if keep.any():
+                # Each removed vnode hands its arc to its successor on the new ring
+                removed = np.flatnonzero(~keep)
+                kept_positions = positions[keep]
+                successors = np.searchsorted(kept_positions, positions[removed])
+                preferences = self._preference_rows(snapshot)[keep]
+                new_owners = owners[keep][successors % len(kept_positions)]
+                names = snapshot.node_names
+                arcs = [
+                    (start, end, names[source], names[target])
+                    for start, end, source, target in zip(
+                        positions[removed - 1].tolist(),
+                        positions[removed].tolist(),
+                        owners[removed].tolist(),
+                        new_owners.tolist(),
+                    )
+                ]
+            elif any(self.key_index.get(node) for node in nodes):
+                raise ValueError("Cannot remove every node while keys are stored.")
+
+            self._publish(
+                positions[keep],
+                owners[keep],
+                snapshot.node_names,
+                snapshot.nodes.difference(nodes),
+                arcs,
+                preferences,
+                np.unique(successors).tolist(),
+            )
+            migrations = self.redistribute_keys(arcs)
+            for node in nodes:
+                self.key_index.pop(node, None)
+            return migrations
 
-    def get_node(self, key: str) -> None | int | tuple[int, str]:
+    def get_node(self, key: str) -> Optional[str]:
         """
         Get the node responsible for the given key.
 
-        This method uses binary search to find the node responsible for the given key.
+        This method uses binary search (bisect) over the sorted vnode positions to
+        find the node responsible for the given key.
 
         The time complexity of this operation is as follows:
         - T(N) = O(log N): N is the number of nodes in the ring.
@@ -50,65 +492,191 @@ class ConsistentHashing:
 
         Also, when adding or deleting key-value data, Only node search costs and I/O as overhead, so the complexity is O(log N).
 
+        The lookup reads one ring snapshot and takes no lock, so it is safe to
+        call from many threads while another thread changes the membership.
+
+        With `cache_size` set, hot keys are served from an LRU cache. An entry
+        from an older epoch stays valid unless its hash falls in a range that a
+        later membership change handed to another node.
         """
-        if not self.ring:
+        snapshot = self.snapshot
+        if not snapshot.positions:
             return None
-        hash_key = self._hash(key)
-        print(f"get_node: key {key}, hash_key {hash_key}")
-        # Perform binary search
-        low, high = 0, len(self.ring) - 1
-        while low <= high:
-            mid = (low + high) // 2
-            print(f"low {low}, high {high}, mid {mid}, ring[mid] {self.ring[mid]}")
-            if self.ring[mid][0] >= hash_key:
-                high = mid - 1
+        if not self.cache_size:
+            return self._lookup(snapshot, self._hash(key))
+
+        # Hits of the current epoch take no lock: OrderedDict.get and
+        # move_to_end are atomic under the GIL, and an entry stamped with the
+        # epoch of the snapshot read above was looked up in that snapshot. The
+        # hit counter may then miss an increment under contention.
+        entry = self.cache.get(key)
+        if entry is not None and entry[2] == snapshot.epoch:
+            self.cache_hits += 1
+            try:
+                self.cache.move_to_end(key)
+            except KeyError:  # Evicted by another thread meanwhile
+                pass
+            return entry[1]
+
+        # Revalidating an older entry, or inserting and evicting one, reads
+        # changed_ranges and resizes the cache, so it is serialized
+        with self._cache_lock:
+            snapshot = self.snapshot
+            entry = self.cache.get(key)
+            if entry is not None:
+                hash_key, node, epoch = entry
+                if epoch == snapshot.epoch:
+                    self.cache_hits += 1
+                    self.cache.move_to_end(key)
+                    return node
+                if not self._changed_since(hash_key, epoch, snapshot.epoch):
+                    self.cache_hits += 1
+                    self.cache[key] = (hash_key, node, snapshot.epoch)
+                    self.cache.move_to_end(key)
+                    return node
             else:
-                low = mid + 1
-        target_node = self.ring[low % len(self.ring)][1]
-        print(f"get_node: target_node {target_node}")
+                hash_key = self._hash(key)
+            self.cache_misses += 1
+            node = self._lookup(snapshot, hash_key)
+            self.cache[key] = (hash_key, node, snapshot.epoch)
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            return node
+
+    @staticmethod
+    def _lookup(snapshot: RingSnapshot, hash_key: int) -> str:
+        index = bisect_left(snapshot.positions, hash_key)
+        return snapshot.node_names[snapshot.owners[index % len(snapshot.positions)]]
+
+    def get_replicas(self, key: str, n: Optional[int] = None) -> List[str]:
+        """
+        Get the n distinct nodes that store replicas of the given key.
+
+        The nodes are the first n distinct owners clockwise from the key, with
+        the primary owner (`get_node`) first. The lists are precomputed for every
+        ring position when the membership changes, so a lookup is one bisect and
+        one slice.
+
+        Args:
+            key (str): The key.
+            n (Optional[int]): The number of replicas, at most the replication
+                factor; the replication factor if omitted. Fewer nodes are
+                returned when the ring has fewer than n nodes.
+
+        Returns:
+            List[str]: The replica nodes in preference order.
+        """
+        if n is None:
+            n = self.replication_factor
+        if not 0 < n <= self.replication_factor:
+            raise ValueError(
+                f"The number of replicas must be between 1 and "
+                f"{self.replication_factor}."
+            )
+        snapshot = self.snapshot
+        if not snapshot.positions:
+            return []
+        index = bisect_left(snapshot.positions, self._hash(key))
+        start = index % len(snapshot.positions) * snapshot.replicas
+        names = snapshot.node_names
+        owners = snapshot.preferences[start : start + min(n, snapshot.replicas)]
+        return [names[owner] for owner in owners]
+
+    def get_nodes(self, keys: Iterable[str]) -> List[Optional[str]]:
+        """
+        Get the node responsible for each of the given keys.
 
-        return target_node
+        The keys are hashed into one uint64 array and routed together with a
+        single numpy.searchsorted over the ring.
+        """
+        keys = list(keys)
+        snapshot = self.snapshot
+        if not snapshot.positions:
+            return [None] * len(keys)
+        hashes = np.fromiter(map(self._hash, keys), dtype=np.uint64, count=len(keys))
+        positions = np.frombuffer(snapshot.positions, dtype=np.uint64)
+        indexes = np.searchsorted(positions, hashes, side="left") % len(positions)
+        owners = np.frombuffer(snapshot.owners, dtype=np.uint32)[indexes]
+        names = snapshot.node_names
+        return [names[owner] for owner in owners.tolist()]
+
+    def put(self, key: str) -> Optional[str]:
+        """Store a key on the node responsible for it and return that node."""
+        with self._write_lock:
+            node = self.get_node(key)
+            if node is not None:
+                index = self.key_index.setdefault(node, KeyIndex())
+                index.add(self._hash(key), key)
+            return node
+
+    def delete(self, key: str) -> bool:
+        """Remove a key from the store; return whether it was stored."""
+        with self._write_lock:
+            index = self.key_index.get(self.get_node(key))
+            return bool(index) and index.discard(self._hash(key), key)
 
-    def redistribute_keys(self, node: str) -> None:
+    def keys_of(self, node: str) -> List[str]:
+        """The keys stored on `node`, in hash order."""
+        index = self.key_index.get(node)
+        return list(index.keys) if index else []
+
+    def redistribute_keys(self, arcs: Sequence[Arc]) -> Iterator[Migration]:
         """
-        Redistribute keys when a node is added or removed.
+        Move the stored keys of the arcs that changed owner.
 
-        This method is called after adding or removing a node to redistribute keys.
+        This method is called after adding or removing nodes with the arcs whose
+        owner changed. The keys of each arc are cut out of the old owner's index
+        as one slice and spliced into the new owner's index, so the key store is
+        up to date when this method returns; the migration plan is then yielded
+        lazily, one (key, from_node, to_node) at a time.
 
         The time complexity of this operation is as follows:
-        - T(N, M) = O(N/M * log N): N is the number of keys and M is the number of nodes.
+        - T(K, A, N) = O(K + A * log N): K is the number of keys that move, A the
+          number of changed arcs and N the number of keys on a node.
 
         Explanation:
-        1. Assuming that the number of keys is evenly distributed across nodes, the operation to move all keys of one
-           node is O(N/M) on average, where N is the number of keys and M is the number of nodes.
-        2. Finding the correct node for each key during redistribution takes O(log N) time because it uses a binary search.
-           Therefore, the overall time complexity of this operation is O(N/M * log N).
+        1. Each arc boundary is found by binary search in the sorted key index.
+        2. Only the keys inside the changed arcs are copied; keys that keep their
+           owner are never visited.
 
         Args:
-            node (str): The node to redistribute keys for.
+            arcs (Sequence[Arc]): The (start, end, from_node, to_node) arcs.
+
+        Returns:
+            Iterator[Migration]: The (key, from_node, to_node) of every moved key.
         """
-        keys_to_move = []
-        for hash_key, n in self.ring:
-            if n == node:
-                keys_to_move.append(hash_key)
-        for key_hash in keys_to_move:
-            new_node = self.get_node(f"key:{key_hash}")
-            print(f"Moving key {key_hash} to {new_node}")
+        moved = []
+        for start, end, source, target in arcs:
+            index = self.key_index.get(source)
+            if not index:
+                continue
+            for low, high in _split_arc(start, end):
+                hashes, keys = index.pop_range(low, high)
+                if keys:
+                    target_index = self.key_index.setdefault(target, KeyIndex())
+                    target_index.insert_range(hashes, keys)
+                    moved.append((keys, source, target))
+        return ((key, source, target) for keys, source, target in moved for key in keys)
 
 
 # Example usage:
 if __name__ == "__main__":
     ch = ConsistentHashing()
 
-    # Add nodes
+    # Add nodes and store some keys
     ch.add_node("node1")
     ch.add_node("node2")
+    for i in range(10):
+        ch.put(f"key{i}")
 
     # Add a new node and redistribute keys
-    ch.add_node("node3")
+    for key, source, target in ch.add_node("node3"):
+        print(f"Moving key {key} from {source} to {target}")
 
     # Remove a node and redistribute keys
-    ch.remove_node("node2")
+    for key, source, target in ch.remove_node("node2"):
+        print(f"Moving key {key} from {source} to {target}")
 
     # Get node for a key
     node = ch.get_node("my_key")
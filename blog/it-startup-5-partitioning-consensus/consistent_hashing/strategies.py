@@ -0,0 +1,187 @@
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from .consistent_hashing import ConsistentHashing, hash64
+
+MASK64 = 2**64 - 1
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """
+    Jump consistent hash (Lamping and Veach): map a 64-bit key to a bucket.
+
+    When the number of buckets grows from n to n + 1, only the keys that land
+    in the new bucket move.
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & MASK64
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def mix64(values: np.ndarray) -> np.ndarray:
+    """The SplitMix64 finalizer over a uint64 array."""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class JumpHash:
+    """
+    Placement by jump consistent hash; no ring is kept in memory.
+
+    Nodes are numbered buckets, so removing the last node added is free. Removing
+    any other node moves the last node into its bucket, which also moves the
+    keys of the last bucket.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: List[str] = []
+        self.bucket_of: Dict[str, int] = {}
+
+    @property
+    def nodes(self) -> Set[str]:
+        return set(self.buckets)
+
+    def add_node(self, node: str) -> None:
+        if node in self.bucket_of:
+            raise ValueError(f"Node {node} is already placed.")
+        self.bucket_of[node] = len(self.buckets)
+        self.buckets.append(node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.bucket_of:
+            raise ValueError(f"Node {node} is not placed.")
+        bucket = self.bucket_of.pop(node)
+        last = self.buckets.pop()
+        if last != node:
+            self.buckets[bucket] = last
+            self.bucket_of[last] = bucket
+
+    def get_node(self, key: str) -> Optional[str]:
+        if not self.buckets:
+            return None
+        return self.buckets[jump_hash(hash64(key), len(self.buckets))]
+
+
+class RendezvousHashing:
+    """
+    Highest random weight (rendezvous) hashing.
+
+    Every node scores the key and the highest score wins, so removing a node
+    only moves its own keys. A lookup is O(N), vectorized over the nodes.
+    """
+
+    def __init__(self) -> None:
+        self.node_list: List[str] = []
+        self.seeds = np.empty(0, dtype=np.uint64)
+
+    @property
+    def nodes(self) -> Set[str]:
+        return set(self.node_list)
+
+    def add_node(self, node: str) -> None:
+        if node in self.node_list:
+            raise ValueError(f"Node {node} is already placed.")
+        self.node_list.append(node)
+        self.seeds = np.append(self.seeds, np.uint64(hash64(node)))
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.node_list:
+            raise ValueError(f"Node {node} is not placed.")
+        index = self.node_list.index(node)
+        del self.node_list[index]
+        self.seeds = np.delete(self.seeds, index)
+
+    def get_node(self, key: str) -> Optional[str]:
+        if not self.node_list:
+            return None
+        scores = mix64(self.seeds ^ np.uint64(hash64(key)))
+        return self.node_list[int(scores.argmax())]
+
+
+class BoundedLoadConsistentHashing:
+    """
+    Consistent hashing with bounded loads (Mirrokni, Thorup and Zadimoghaddam).
+
+    A key is assigned on its first lookup to the first node clockwise on the
+    ring whose load is below ceil(load_factor * average load), and keeps that
+    node until it is released or the node leaves.
+    """
+
+    def __init__(self, vnodes_by_node: int = 100, load_factor: float = 1.25) -> None:
+        if load_factor <= 1:
+            raise ValueError("The load factor must be greater than 1.")
+        self.ring = ConsistentHashing(vnodes_by_node)
+        self.load_factor = load_factor
+        self.assignments: Dict[str, str] = {}
+        self.loads: Dict[str, int] = {}
+
+    @property
+    def nodes(self) -> Set[str]:
+        return self.ring.nodes
+
+    def capacity(self) -> int:
+        """The most keys a node may hold once one more key is assigned."""
+        average = (len(self.assignments) + 1) / len(self.nodes)
+        return math.ceil(self.load_factor * average)
+
+    def _place(self, key: str) -> str:
+        snapshot = self.ring.snapshot
+        positions, owners = snapshot.positions, snapshot.owners
+        names = snapshot.node_names
+        capacity = self.capacity()
+        start = bisect_left(positions, hash64(key))
+        for i in range(start, start + len(positions)):
+            node = names[owners[i % len(positions)]]
+            if self.loads[node] < capacity:
+                return node
+        raise AssertionError("Some node is always below the capacity.")
+
+    def get_node(self, key: str) -> Optional[str]:
+        if not self.nodes:
+            return None
+        node = self.assignments.get(key)
+        if node is None:
+            node = self.assignments[key] = self._place(key)
+            self.loads[node] += 1
+        return node
+
+    def release(self, key: str) -> None:
+        """Forget the assignment of a key that is no longer stored."""
+        node = self.assignments.pop(key, None)
+        if node is not None:
+            self.loads[node] -= 1
+
+    def add_node(self, node: str) -> None:
+        """Add a node; the keys whose ring owner it becomes move to it."""
+        self.ring.add_node(node)
+        self.loads[node] = 0
+        moving = [key for key in self.assignments if self.ring.get_node(key) == node]
+        for key in moving:
+            self.release(key)
+            self.get_node(key)
+
+    def remove_node(self, node: str) -> None:
+        """Remove a node and reassign its keys."""
+        moving = [key for key, owner in self.assignments.items() if owner == node]
+        for key in moving:
+            self.release(key)
+        self.ring.remove_node(node)
+        del self.loads[node]
+        for key in moving:
+            self.get_node(key)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Run from the parent directory: python -m consistent_hashing.strategies
+    for engine in (JumpHash(), RendezvousHashing(), BoundedLoadConsistentHashing()):
+        for i in range(5):
+            engine.add_node(f"node{i}")
+        print(type(engine).__name__, engine.get_node("my_key"))
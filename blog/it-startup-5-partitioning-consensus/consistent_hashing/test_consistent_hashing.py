@@ -1,6 +1,10 @@
+import threading
+
 import pytest
 
-from .consistent_hashing import ConsistentHashing
+import numpy as np
+
+from .consistent_hashing import CACHE_HISTORY, ConsistentHashing, preference_lists
 
 
 @pytest.fixture
@@ -51,13 +55,301 @@ def test_get_node(consistent_hashing):
     assert node in consistent_hashing.nodes
 
 
-def test_redistribute_keys(consistent_hashing, capsys):
+def test_ring_is_sorted_array(consistent_hashing):
+    for node in ["node1", "node2", "node3"]:
+        consistent_hashing.add_node(node)
+    positions = list(consistent_hashing.positions)
+    assert positions == sorted(positions)
+    assert all(0 <= position < 2**64 for position in positions)
+    assert {node for _, node in consistent_hashing.ring} == consistent_hashing.nodes
+
+
+def test_get_node_wraps_around(consistent_hashing):
     consistent_hashing.add_node("node1")
     consistent_hashing.add_node("node2")
-    consistent_hashing.add_node("node3")
-    consistent_hashing.redistribute_keys("node3")
-    captured = capsys.readouterr()
-    assert "Moving key" in captured.out
+    first_hash, first_node = consistent_hashing.ring[0]
+    consistent_hashing._hash = lambda key: int(key)
+    assert consistent_hashing.get_node(str(first_hash)) == first_node
+    assert consistent_hashing.get_node(str(2**64 - 1)) == first_node
+
+
+def test_get_nodes_matches_get_node(consistent_hashing):
+    assert consistent_hashing.get_nodes(["a", "b"]) == [None, None]
+    for node in ["node1", "node2", "node3"]:
+        consistent_hashing.add_node(node)
+    keys = [f"key{i}" for i in range(1000)]
+    assert consistent_hashing.get_nodes(keys) == [
+        consistent_hashing.get_node(key) for key in keys
+    ]
+
+
+def test_add_nodes_matches_add_node():
+    one_by_one = ConsistentHashing(vnodes_by_node=20)
+    for i in range(10):
+        one_by_one.add_node(f"node{i}")
+    batched = ConsistentHashing(vnodes_by_node=20)
+    batched.add_nodes(f"node{i}" for i in range(10))
+    assert batched.ring == one_by_one.ring
+    assert batched.nodes == one_by_one.nodes
+
+
+def test_remove_nodes_keeps_ring_sorted():
+    ch = ConsistentHashing(vnodes_by_node=20)
+    ch.add_nodes(f"node{i}" for i in range(10))
+    ch.remove_nodes(["node2", "node5", "node7"])
+    ch.add_node("node5")
+    positions = list(ch.positions)
+    assert positions == sorted(positions)
+    assert len(positions) == 20 * 8
+    assert {node for _, node in ch.ring} == ch.nodes
+    assert "node2" not in ch.nodes
+
+
+def test_membership_errors(consistent_hashing):
+    consistent_hashing.add_node("node1")
+    with pytest.raises(ValueError):
+        consistent_hashing.add_node("node1")
+    with pytest.raises(ValueError):
+        consistent_hashing.remove_node("node2")
+    with pytest.raises(ValueError):
+        consistent_hashing.add_nodes(["node2", "node2"])
+    assert consistent_hashing.nodes == {"node1"}
+
+
+def assert_keys_placed(ch, keys):
+    stored = [key for node in ch.nodes for key in ch.keys_of(node)]
+    assert sorted(stored) == sorted(keys)
+    for node in ch.nodes:
+        assert all(ch.get_node(key) == node for key in ch.keys_of(node))
+
+
+def test_put_and_delete(consistent_hashing):
+    assert consistent_hashing.put("orphan") is None
+    consistent_hashing.add_nodes(["node1", "node2", "node3"])
+    keys = [f"key{i}" for i in range(500)]
+    for key in keys + keys[:10]:
+        assert consistent_hashing.put(key) == consistent_hashing.get_node(key)
+    assert_keys_placed(consistent_hashing, keys)
+    assert consistent_hashing.delete("key0")
+    assert not consistent_hashing.delete("key0")
+    assert_keys_placed(consistent_hashing, keys[1:])
+
+
+def test_redistribute_keys_on_add():
+    ch = ConsistentHashing(vnodes_by_node=10)
+    ch.add_nodes(["node1", "node2", "node3"])
+    keys = [f"key{i}" for i in range(2000)]
+    for key in keys:
+        ch.put(key)
+    before = {key: ch.get_node(key) for key in keys}
+
+    plan = list(ch.add_nodes(["node4", "node5"]))
+    after = {key: ch.get_node(key) for key in keys}
+    assert sorted(plan) == sorted(
+        (key, before[key], after[key]) for key in keys if before[key] != after[key]
+    )
+    assert all(target in ("node4", "node5") for _, _, target in plan)
+    assert_keys_placed(ch, keys)
+
+
+def test_redistribute_keys_on_remove():
+    ch = ConsistentHashing(vnodes_by_node=10)
+    ch.add_nodes([f"node{i}" for i in range(5)])
+    keys = [f"key{i}" for i in range(2000)]
+    for key in keys:
+        ch.put(key)
+    removed = ch.keys_of("node1") + ch.keys_of("node3")
+
+    plan = list(ch.remove_nodes(["node1", "node3"]))
+    assert sorted(key for key, _, _ in plan) == sorted(removed)
+    assert all(key_to in ch.nodes for _, _, key_to in plan)
+    assert "node1" not in ch.key_index
+    assert_keys_placed(ch, keys)
+
+
+def test_redistribute_keys_single_vnode_wraps():
+    ch = ConsistentHashing(vnodes_by_node=1)
+    ch.add_node("node1")
+    keys = [f"key{i}" for i in range(200)]
+    for key in keys:
+        ch.put(key)
+    plan = list(ch.add_node("node2"))
+    assert len(plan) == len(ch.keys_of("node2")) > 0
+    assert_keys_placed(ch, keys)
+    with pytest.raises(ValueError):
+        ch.remove_nodes(["node1", "node2"])
+
+
+def test_get_node_cache_hits_and_eviction():
+    ch = ConsistentHashing(vnodes_by_node=10, cache_size=100)
+    ch.add_nodes(["node1", "node2", "node3"])
+    keys = [f"key{i}" for i in range(100)]
+    expected = [ch.get_node(key) for key in keys]
+    assert [ch.get_node(key) for key in keys] == expected
+    assert ch.cache_info() == (100, 100, 100, 100)
+    ch.get_node("one more")
+    assert ch.cache_info().currsize == 100
+    assert "key0" not in ch.cache
+
+
+def test_get_node_cache_invalidates_changed_arcs_only():
+    ch = ConsistentHashing(vnodes_by_node=10, cache_size=1000)
+    uncached = ConsistentHashing(vnodes_by_node=10)
+    for ring in (ch, uncached):
+        ring.add_nodes(["node1", "node2", "node3"])
+    keys = [f"key{i}" for i in range(1000)]
+    for key in keys:
+        ch.get_node(key)
+
+    for change in (
+        lambda ring: ring.add_node("node4"),
+        lambda ring: ring.remove_nodes(["node1", "node3"]),
+        lambda ring: ring.add_nodes(["node1", "node5"]),
+    ):
+        before = {key: uncached.get_node(key) for key in keys}
+        for ring in (ch, uncached):
+            list(change(ring))
+        hits, misses, _, _ = ch.cache_info()
+        assert [ch.get_node(key) for key in keys] == [
+            uncached.get_node(key) for key in keys
+        ]
+        moved = sum(before[key] != uncached.get_node(key) for key in keys)
+        assert ch.cache_info().misses - misses == moved
+        assert ch.cache_info().hits - hits == len(keys) - moved
+
+
+def test_get_node_cache_forgets_old_epochs():
+    ch = ConsistentHashing(vnodes_by_node=10, cache_size=10)
+    ch.add_node("node1")
+    assert ch.get_node("key") == "node1"
+    for i in range(CACHE_HISTORY + 1):
+        ch.add_node(f"extra{i}")
+        ch.remove_node(f"extra{i}")
+    assert ch.get_node("key") == "node1"
+    assert ch.cache_info().misses == 2
+    ch.remove_node("node1")
+    assert not ch.cache
+    assert ch.get_node("key") is None
+
+
+def test_get_node_cache_survives_being_disabled():
+    ch = ConsistentHashing(vnodes_by_node=10, cache_size=1024)
+    ch.add_node("node1")
+    assert ch.get_node("key") == "node1"
+    ch.cache_size = 0
+    ch.add_node("node2")
+    ch.cache_size = 1024
+    uncached = ConsistentHashing(vnodes_by_node=10)
+    uncached.add_nodes(["node1", "node2"])
+    assert ch.get_node("key") == uncached.get_node("key")
+    assert ch.cache_info().misses == 2
+
+
+@pytest.mark.parametrize("cache_size", [0, 100])
+def test_concurrent_lookups_during_churn(cache_size):
+    ch = ConsistentHashing(vnodes_by_node=20, cache_size=cache_size)
+    base = [f"node{i}" for i in range(5)]
+    extra = [f"extra{i}" for i in range(5)]
+    ch.add_nodes(base)
+    keys = [f"key{i}" for i in range(200)]
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        try:
+            while not stop.is_set():
+                snapshot = ch.snapshot
+                positions = list(snapshot.positions)
+                assert positions == sorted(positions)
+                assert len(positions) == 20 * len(snapshot.nodes)
+                for key in keys:
+                    assert ch.get_node(key) in base + extra
+                assert None not in ch.get_nodes(keys)
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(50):
+        ch.add_nodes(extra)
+        ch.remove_nodes(extra)
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert ch.epoch == 101
+    assert [ch.get_node(key) for key in keys] == ch.get_nodes(keys)
+
+
+def walk_replicas(ch, key, n):
+    """Reference: walk the ring clockwise from the key, skipping chosen nodes."""
+    ring = ch.ring
+    start = next(
+        (i for i, (position, _) in enumerate(ring) if position >= ch._hash(key)), 0
+    )
+    replicas = []
+    for i in range(len(ring)):
+        node = ring[(start + i) % len(ring)][1]
+        if node not in replicas:
+            replicas.append(node)
+        if len(replicas) == n:
+            break
+    return replicas
+
+
+def test_get_replicas_matches_ring_walk():
+    ch = ConsistentHashing(vnodes_by_node=5, replication_factor=3)
+    assert ch.get_replicas("key") == []
+    ch.add_nodes(["node1", "node2"])
+    assert sorted(ch.get_replicas("key")) == ["node1", "node2"]
+    ch.add_nodes(f"node{i}" for i in range(3, 9))
+    ch.remove_node("node5")
+    for i in range(300):
+        key = f"key{i}"
+        replicas = ch.get_replicas(key)
+        assert replicas == walk_replicas(ch, key, 3)
+        assert replicas[0] == ch.get_node(key)
+        assert ch.get_replicas(key, 2) == replicas[:2]
+    with pytest.raises(ValueError):
+        ch.get_replicas("key", 4)
+    with pytest.raises(ValueError):
+        ch.get_replicas("key", 0)
+
+
+def test_weighted_nodes_get_proportional_vnodes():
+    ch = ConsistentHashing(vnodes_by_node=100)
+    ch.add_node("small", weight=0.5)
+    ch.add_nodes(["large", "tiny"], weights=[3, 0.001])
+    owners = [node for _, node in ch.ring]
+    assert owners.count("small") == 50
+    assert owners.count("large") == 300
+    assert owners.count("tiny") == 1
+    keys = ch.get_nodes(f"key{i}" for i in range(10_000))
+    assert keys.count("large") > 4 * keys.count("small")
+    ch.remove_node("large")
+    assert len(ch.positions) == 51
+    with pytest.raises(ValueError):
+        ch.add_node("zero", weight=0)
+    with pytest.raises(ValueError):
+        ch.add_nodes(["a", "b"], weights=[1])
+    for weight in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            ch.add_node("bad", weight=weight)
+
+
+def test_preference_lists_updated_incrementally():
+    ch = ConsistentHashing(vnodes_by_node=4, replication_factor=3)
+    ch.add_node("node0")
+    for i in range(1, 40):
+        ch.add_nodes([f"node{i}", f"big{i}"], weights=[1, 3])
+        if i % 3 == 0:
+            ch.remove_nodes([f"node{i - 2}", f"big{i - 1}"])
+        snapshot = ch.snapshot
+        owners = np.frombuffer(snapshot.owners, dtype=np.uint32)
+        expected = preference_lists(owners, snapshot.replicas)
+        assert snapshot.preferences.tolist() == expected.ravel().tolist()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+import pytest
+
+from .strategies import (
+    BoundedLoadConsistentHashing,
+    JumpHash,
+    RendezvousHashing,
+    jump_hash,
+)
+
+KEYS = [f"key{i}" for i in range(2000)]
+
+
+def build(engine, count=8):
+    for i in range(count):
+        engine.add_node(f"node{i}")
+    return engine
+
+
+def owners(engine):
+    return {key: engine.get_node(key) for key in KEYS}
+
+
+def test_jump_hash_only_moves_keys_to_the_new_bucket():
+    for key in range(1000):
+        before = jump_hash(key, 10)
+        after = jump_hash(key, 11)
+        assert 0 <= before < 10
+        assert after in (before, 10)
+    assert jump_hash(12345, 1) == 0
+
+
+@pytest.mark.parametrize(
+    "engine", [JumpHash, RendezvousHashing, BoundedLoadConsistentHashing]
+)
+def test_engine_interface(engine):
+    engine = engine()
+    assert engine.get_node("key") is None
+    build(engine)
+    assert set(owners(engine).values()) == engine.nodes
+    assert owners(engine) == owners(engine)
+    with pytest.raises(ValueError):
+        engine.add_node("node0")
+    with pytest.raises(ValueError):
+        engine.remove_node("missing")
+
+
+def test_jump_hash_remove_moves_last_bucket():
+    engine = build(JumpHash())
+    before = owners(engine)
+    engine.remove_node("node3")
+    after = owners(engine)
+    assert "node3" not in engine.nodes
+    for key in KEYS:
+        if before[key] not in ("node3", "node7"):
+            assert after[key] == before[key]
+
+
+def test_rendezvous_moves_only_affected_keys():
+    engine = build(RendezvousHashing())
+    before = owners(engine)
+    engine.remove_node("node3")
+    after = owners(engine)
+    assert all(after[key] == before[key] for key in KEYS if before[key] != "node3")
+    engine.add_node("node8")
+    added = owners(engine)
+    assert all(added[key] in (after[key], "node8") for key in KEYS)
+
+
+def test_bounded_load_respects_capacity():
+    engine = build(BoundedLoadConsistentHashing(vnodes_by_node=3, load_factor=1.1))
+    owners(engine)
+    limit = -(-11 * len(KEYS) // (10 * len(engine.nodes)))
+    assert max(engine.loads.values()) <= limit
+    assert sum(engine.loads.values()) == len(KEYS)
+
+    engine.remove_node("node2")
+    assert sum(engine.loads.values()) == len(KEYS)
+    assert "node2" not in set(engine.assignments.values())
+    engine.add_node("node9")
+    assert engine.loads["node9"] > 0
+    engine.release(KEYS[0])
+    assert sum(engine.loads.values()) == len(KEYS) - 1
+    with pytest.raises(ValueError):
+        BoundedLoadConsistentHashing(load_factor=1.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
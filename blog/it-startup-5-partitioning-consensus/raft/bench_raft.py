@@ -0,0 +1,73 @@
+import time
+from collections import deque
+from typing import List
+
+from .raft import RaftNode
+
+# Run from the parent directory: python -m raft.bench_raft
+
+ENTRIES = 20_000
+
+
+def make_cluster(size: int, batch_size: int, max_inflight: int) -> List[RaftNode]:
+    nodes = [
+        RaftNode(i, [], batch_size, max_inflight, verbose=False) for i in range(size)
+    ]
+    for node in nodes:
+        node.peers = [peer for peer in nodes if peer is not node]
+        node.current_term = 1
+    nodes[0].become_leader()
+    return nodes
+
+
+def committed_per_second(batch_size: int) -> float:
+    """Entries committed per second with direct calls between the nodes."""
+    leader = make_cluster(5, batch_size, max_inflight=4)[0]
+    started = time.perf_counter()
+    for i in range(ENTRIES):
+        leader.propose(i)
+        if len(leader.log) - leader.commit_index >= 4 * batch_size:
+            leader.replicate()
+    while leader.commit_index < ENTRIES:
+        leader.replicate()
+    return ENTRIES / (time.perf_counter() - started)
+
+
+def round_trips(batch_size: int, max_inflight: int) -> int:
+    """
+    Round trips to commit ENTRIES entries when responses arrive one round trip
+    after their request, so a leader waiting for each response sends one batch
+    per round trip.
+    """
+    nodes = make_cluster(5, batch_size, max_inflight)
+    leader = nodes[0]
+    for i in range(ENTRIES):
+        leader.propose(i)
+    responses: deque = deque()
+    rounds = 0
+    while leader.commit_index < ENTRIES:
+        rounds += 1
+        while responses:
+            leader.handle_append_entries_response(*responses.popleft())
+        for peer in leader.peers:
+            for request in leader.next_requests(peer.node_id):
+                response = peer.append_entries(*request)
+                responses.append((peer.node_id, request, response))
+    return rounds
+
+
+def main() -> None:
+    print(f"Committing {ENTRIES:,} entries on a 5-node cluster")
+    for batch_size in (1, 8, 64, 512):
+        rate = committed_per_second(batch_size)
+        print(f"batch_size={batch_size:>3}: {rate:>12,.0f} entries/s")
+    for batch_size, max_inflight in ((64, 1), (64, 4), (512, 1), (512, 4)):
+        rounds = round_trips(batch_size, max_inflight)
+        print(
+            f"batch_size={batch_size:>3}, max_inflight={max_inflight}: "
+            f"{rounds:,} round trips, {ENTRIES / rounds:,.0f} entries/round trip"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import time
+from typing import Tuple
+
+from .simulator import SimulationReport, Simulator
+
+# Run from the parent directory: python -m raft.bench_simulator
+
+DURATION = 300.0  # Simulated seconds per run
+
+
+def failovers(
+    size: int, election_timeout: Tuple[float, float], seed: int = 0
+) -> Tuple[SimulationReport, float]:
+    """
+    Crashes the leader every second for half a second, with 1% of messages
+    lost and a client proposing 100 commands per second.
+
+    Returns:
+        Tuple[SimulationReport, float]: The report and the wall-clock seconds.
+    """
+    simulator = Simulator(
+        size,
+        seed,
+        drop_rate=0.01,
+        election_timeout=election_timeout,
+        heartbeat_interval=election_timeout[0] / 3,
+    )
+    simulator.crash_leader_every(interval=1.0, downtime=0.5)
+    simulator.propose_every(0.01)
+    started = time.perf_counter()
+    report = simulator.run(DURATION)
+    return report, time.perf_counter() - started
+
+
+def cold_start_elections(size: int, runs: int) -> float:
+    """Elections per wall-clock second over independent seeded cold starts."""
+    started = time.perf_counter()
+    elections = sum(Simulator(size, seed).run(0.4).elections for seed in range(runs))
+    return elections / (time.perf_counter() - started)
+
+
+def main() -> None:
+    for size in (3, 5, 9):
+        rate = cold_start_elections(size, runs=2000)
+        print(f"{size} nodes: {rate:,.0f} cold-start elections/s")
+    print(f"{DURATION:.0f} simulated seconds per run, leader crashed every second")
+    for size in (3, 5, 9, 31):
+        for election_timeout in ((0.05, 0.1), (0.15, 0.3), (0.15, 0.2)):
+            report, elapsed = failovers(size, election_timeout)
+            latencies = ", ".join(
+                f"p{p} {report.election_percentile(p) * 1000:>4.0f} ms"
+                for p in (50, 90, 99)
+            )
+            print(
+                f"{size:>2} nodes, timeout {election_timeout[0] * 1000:.0f}-"
+                f"{election_timeout[1] * 1000:.0f} ms: {latencies}, "
+                f"{report.messages_per_commit:5.1f} msgs/commit, "
+                f"{report.elections / elapsed:>6,.0f} elections/s, "
+                f"{len(report.violations)} violations"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,70 @@
-import random
-import time
-from typing import List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class AppendEntriesRequest(NamedTuple):
+    term: int
+    leader_id: int
+    entries: List[dict]
+    prev_log_index: int
+    prev_log_term: int
+    leader_commit: int
+
+
+class AppendEntriesResponse(NamedTuple):
+    term: int
+    success: bool
+    match_index: int = 0  # Index of the last entry known to match the leader's log
+    # On a failed consistency check: the term of the conflicting entry (0 if the
+    # log is too short) and the first index this node holds for that term
+    conflict_term: int = 0
+    conflict_index: int = 0
+
+    def __bool__(self) -> bool:
+        return self.success
 
 
 class RaftNode:
-    def __init__(self, node_id: int, peers: List["RaftNode"]) -> None:
+    def __init__(
+        self,
+        node_id: int,
+        peers: List["RaftNode"],
+        batch_size: int = 64,
+        max_inflight: int = 4,
+        verbose: bool = True,
+    ) -> None:
         """
         Initializes a Raft node.
 
         Args:
             node_id (int): The unique ID of the node.
             peers (List[RaftNode]): The list of peer nodes in the cluster.
+            batch_size (int): The most log entries sent in one AppendEntries.
+            max_inflight (int): The most AppendEntries a leader has outstanding
+                per follower.
+            verbose (bool): Whether to print election and heartbeat events.
         """
         self.node_id: int = node_id
         self.peers: List[RaftNode] = peers
         self.state: str = "follower"
         self.current_term: int = 0
         self.voted_for: Optional[int] = None
-        self.log: List[dict] = []
+        self.log: List[dict] = []  # Entry i (1-based) is self.log[i - 1]
         self.vote_count: int = 0
+        self.commit_index: int = 0
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        # Leader state, reset by become_leader(): by peer ID, the next log index
+        # to send, the highest index known to be replicated, and the
+        # AppendEntries awaiting a response, which are told apart from resent
+        # copies by identity
+        self.next_index: Dict[int, int] = {}
+        self.match_index: Dict[int, int] = {}
+        self.inflight: Dict[int, List[AppendEntriesRequest]] = {}
+        self.verbose = verbose
+
+    def _print(self, message: str) -> None:
+        if self.verbose:
+            print(message)
 
     def start_election(self) -> None:
         """
@@ -32,7 +78,7 @@ class RaftNode:
         self.current_term += 1
         self.voted_for = self.node_id
         self.vote_count = 1  # Vote for self
-        print(f"Node {self.node_id} starts election for term {self.current_term}")
+        self._print(f"Node {self.node_id} starts election for term {self.current_term}")
 
         # Request votes from peers
         for peer in self.peers:
@@ -43,11 +89,13 @@ class RaftNode:
 
         # Check if this node received the majority of votes
         if self.vote_count > len(self.peers) // 2:
-            self.state = "leader"
-            print(f"Node {self.node_id} becomes leader for term {self.current_term}")
+            self.become_leader()
+            self._print(
+                f"Node {self.node_id} becomes leader for term {self.current_term}"
+            )
             self.leader_append_entries()
         else:
-            print(
+            self._print(
                 f"Node {self.node_id} failed to become leader. Total votes: {self.vote_count}"
             )
             self.state = "follower"
@@ -71,10 +119,10 @@ class RaftNode:
         Returns:
             bool: True if the vote is granted, False otherwise.
         """
+        if term < self.current_term:
+            return False  # A candidate from an earlier term
         if term > self.current_term:
-            self.current_term = term
-            self.voted_for = None
-            self.state = "follower"
+            self.step_down(term)
 
         # Grant vote if the candidate's log is at least as up-to-date as the voter's log
         if (
@@ -83,7 +131,7 @@ class RaftNode:
             candidate_last_log_index, candidate_last_log_term
         ):
             self.voted_for = candidate_id
-            print(f"Node {self.node_id} votes for {candidate_id} in term {term}")
+            self._print(f"Node {self.node_id} votes for {candidate_id} in term {term}")
             return True
         return False
 
@@ -119,21 +167,214 @@ class RaftNode:
         else:
             return 0
 
+    def step_down(self, term: int) -> None:
+        """Adopt a newer term and return to the follower state."""
+        self.current_term = term
+        self.voted_for = None
+        self.state = "follower"
+
+    def become_leader(self) -> None:
+        """Switch to the leader state and reset the replication state of peers."""
+        self.state = "leader"
+        for peer in self.peers:
+            self.next_index[peer.node_id] = len(self.log) + 1
+            self.match_index[peer.node_id] = 0
+            self.inflight[peer.node_id] = []
+
+    def propose(self, command: Any) -> int:
+        """
+        Appends a client command to the leader's log.
+
+        The entry is replicated by the next AppendEntries to each follower and
+        is committed once a majority of the cluster stores it.
+
+        Args:
+            command (Any): The command to replicate.
+
+        Returns:
+            int: The log index of the new entry.
+        """
+        if self.state != "leader":
+            raise ValueError(f"Node {self.node_id} is not the leader.")
+        self.log.append({"term": self.current_term, "command": command})
+        return len(self.log)
+
+    def next_requests(self, peer_id: int) -> List[AppendEntriesRequest]:
+        """
+        Builds the AppendEntries requests to send to a follower now.
+
+        Entries are sent in batches of up to `batch_size`, and up to
+        `max_inflight` batches are sent without waiting for a response, each
+        one starting where the previous one ended. Without a batch to send, the
+        follower gets one empty request as a heartbeat, even while earlier
+        requests are outstanding: an idle pipeline is probed at `next_index`,
+        a busy one gets a heartbeat at `match_index`, which cannot fail.
+
+        Args:
+            peer_id (int): The ID of the follower.
+
+        Returns:
+            List[AppendEntriesRequest]: The requests, in log order.
+        """
+        requests = []
+        inflight = self.inflight[peer_id]
+        while len(inflight) < self.max_inflight:
+            next_index = self.next_index[peer_id]
+            entries = self.log[next_index - 1 : next_index - 1 + self.batch_size]
+            if not entries:
+                break
+            request = self._request(next_index - 1, entries)
+            requests.append(request)
+            inflight.append(request)
+            self.next_index[peer_id] = next_index + len(entries)
+
+        if not requests:
+            if inflight:
+                requests.append(self._request(self.match_index[peer_id], []))
+            else:
+                request = self._request(self.next_index[peer_id] - 1, [])
+                requests.append(request)
+                inflight.append(request)
+        return requests
+
+    def _request(
+        self, prev_log_index: int, entries: List[dict]
+    ) -> AppendEntriesRequest:
+        return AppendEntriesRequest(
+            self.current_term,
+            self.node_id,
+            entries,
+            prev_log_index,
+            self.log[prev_log_index - 1]["term"] if prev_log_index else 0,
+            self.commit_index,
+        )
+
+    def _settle(self, peer_id: int, request: AppendEntriesRequest) -> bool:
+        """Stops tracking `request`; returns whether it was outstanding."""
+        inflight = self.inflight[peer_id]
+        for i, outstanding in enumerate(inflight):
+            if outstanding is request:
+                del inflight[i]
+                return True
+        return False
+
+    def handle_append_entries_response(
+        self,
+        peer_id: int,
+        request: AppendEntriesRequest,
+        response: AppendEntriesResponse,
+    ) -> None:
+        """
+        Processes a follower's response to an AppendEntries request.
+
+        On success the follower's match index advances and the commit index
+        moves to the highest entry of the current term stored on a majority.
+        On a failed consistency check `next_index` backs off a whole term at a
+        time using the conflict information, and the pipeline restarts there.
+        A failure of a request sent before the last restart is ignored.
+
+        Args:
+            peer_id (int): The ID of the follower.
+            request (AppendEntriesRequest): The request answered.
+            response (AppendEntriesResponse): The follower's response.
+        """
+        if response.term > self.current_term:
+            self.step_down(response.term)
+            return
+        if self.state != "leader" or response.term < self.current_term:
+            return  # A response to a request from an earlier term
+        outstanding = self._settle(peer_id, request)
+
+        if response.success:
+            if response.match_index > self.match_index[peer_id]:
+                self.match_index[peer_id] = response.match_index
+                self.advance_commit_index()
+            return
+        if not outstanding:
+            return
+
+        next_index = response.conflict_index
+        if response.conflict_term:
+            # Skip past the leader's entries of the conflicting term, if it has any
+            for index in range(min(response.conflict_index, len(self.log)), 0, -1):
+                term = self.log[index - 1]["term"]
+                if term == response.conflict_term:
+                    next_index = index + 1
+                    break
+                if term < response.conflict_term:
+                    break
+        self.next_index[peer_id] = max(
+            1, min(next_index, self.next_index[peer_id], len(self.log) + 1)
+        )
+        self.inflight[peer_id].clear()
+
+    def handle_append_entries_failure(
+        self, peer_id: int, request: AppendEntriesRequest
+    ) -> None:
+        """
+        Processes an AppendEntries request that got no response.
+
+        The request and everything pipelined after it are sent again.
+
+        Args:
+            peer_id (int): The ID of the follower.
+            request (AppendEntriesRequest): The lost request.
+        """
+        if self.state != "leader" or request.term != self.current_term:
+            return
+        if not self._settle(peer_id, request):
+            return  # A heartbeat, or a request of a restarted pipeline
+        self.next_index[peer_id] = min(
+            self.next_index[peer_id], request.prev_log_index + 1
+        )
+
+    def advance_commit_index(self) -> None:
+        """Commits the highest entry of the current term stored on a majority."""
+        matched = sorted([len(self.log), *self.match_index.values()], reverse=True)
+        majority = matched[len(matched) // 2]
+        if (
+            majority > self.commit_index
+            and self.log[majority - 1]["term"] == self.current_term
+        ):
+            self.commit_index = majority
+
+    def replicate(self) -> None:
+        """
+        Sends AppendEntries to every follower and processes the responses.
+
+        Peers are called directly, so each request is answered before the next
+        one is built; a transport that delivers messages asynchronously uses
+        `next_requests` and `handle_append_entries_response` instead.
+        """
+        for peer in self.peers:
+            for request in self.next_requests(peer.node_id):
+                response = peer.append_entries(*request)
+                self.handle_append_entries_response(peer.node_id, request, response)
+                if self.state != "leader":
+                    return
+
     def leader_append_entries(self) -> None:
         """
         Sends heartbeat (AppendEntries RPC) to all follower nodes periodically.
         - This simulates the leader sending heartbeats to maintain its authority.
+        - Each heartbeat also carries any log entries the followers are missing.
         - The method runs a few iterations to simulate the behavior.
         """
         for _ in range(3):
             if self.state != "leader":
                 break
-            print(f"Leader {self.node_id} sending heartbeats to followers")
-            for peer in self.peers:
-                peer.append_entries(self.current_term, self.node_id, [])
-            time.sleep(1)
+            self._print(f"Leader {self.node_id} sending heartbeats to followers")
+            self.replicate()
 
-    def append_entries(self, term: int, leader_id: int, entries: List[dict]) -> bool:
+    def append_entries(
+        self,
+        term: int,
+        leader_id: int,
+        entries: List[dict],
+        prev_log_index: int = 0,
+        prev_log_term: int = 0,
+        leader_commit: int = 0,
+    ) -> AppendEntriesResponse:
         """
         Handles the AppendEntries RPC (heartbeat or log replication) from the leader.
 
@@ -141,16 +382,56 @@ class RaftNode:
             term (int): The term of the leader sending the entries.
             leader_id (int): The ID of the leader.
             entries (List[dict]): The log entries to be appended (empty for heartbeats).
+            prev_log_index (int): The index of the entry preceding `entries`.
+            prev_log_term (int): The term of the entry at `prev_log_index`.
+            leader_commit (int): The leader's commit index.
 
         Returns:
-            bool: True if the entries were accepted, False otherwise.
+            AppendEntriesResponse: The response; it is truthy if the entries
+                were accepted, False otherwise.
         """
-        if term >= self.current_term:
-            self.current_term = term
-            self.state = "follower"
-            print(f"Node {self.node_id} accepts entries from leader {leader_id}")
-            return True
-        return False
+        if term < self.current_term:
+            return AppendEntriesResponse(self.current_term, False)
+        if term > self.current_term:
+            self.step_down(term)
+        self.state = "follower"
+        if not entries:
+            self._print(f"Node {self.node_id} accepts entries from leader {leader_id}")
+
+        # Consistency check: the log must contain the entry preceding `entries`
+        if prev_log_index > len(self.log):
+            return AppendEntriesResponse(term, False, conflict_index=len(self.log) + 1)
+        if prev_log_index and self.log[prev_log_index - 1]["term"] != prev_log_term:
+            conflict_term = self.log[prev_log_index - 1]["term"]
+            conflict_index = prev_log_index
+            while (
+                conflict_index > 1
+                and self.log[conflict_index - 2]["term"] == conflict_term
+            ):
+                conflict_index -= 1
+            return AppendEntriesResponse(
+                term,
+                False,
+                conflict_term=conflict_term,
+                conflict_index=conflict_index,
+            )
+
+        # Skip the entries already present; truncate at the first conflict
+        index = prev_log_index
+        for offset, entry in enumerate(entries):
+            if index + offset >= len(self.log):
+                self.log.extend(entries[offset:])
+                break
+            if self.log[index + offset]["term"] != entry["term"]:
+                del self.log[index + offset :]
+                self.log.extend(entries[offset:])
+                break
+
+        match_index = prev_log_index + len(entries)
+        # A heartbeat may vouch for less of the log than earlier requests did;
+        # the commit index never moves backwards
+        self.commit_index = max(self.commit_index, min(leader_commit, match_index))
+        return AppendEntriesResponse(term, True, match_index)
 
 
 # Example usage:
@@ -162,3 +443,9 @@ if __name__ == "__main__":
 
     # Simulate the election process by starting an election on one of the nodes
     nodes[0].start_election()
+
+    # Replicate a few commands from the leader
+    for command in ["x = 1", "y = 2", "x = 3"]:
+        nodes[0].propose(command)
+    nodes[0].replicate()
+    print(f"Commit index: {[node.commit_index for node in nodes]}")
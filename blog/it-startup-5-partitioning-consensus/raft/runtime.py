@@ -0,0 +1,304 @@
+import asyncio
+import random
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .raft import AppendEntriesRequest, RaftNode
+
+
+class InProcessTransport:
+    """
+    Delivers RPCs between the nodes of one event loop as coroutine calls.
+
+    A call to or from a node that is down is lost: it returns None, as a
+    request that timed out would.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Args:
+            latency (float): One-way delay of every message, in seconds.
+        """
+        self.latency = latency
+        self.nodes: Dict[int, "AsyncRaftNode"] = {}
+        self.down: Set[int] = set()
+
+    def register(self, node: "AsyncRaftNode") -> None:
+        self.nodes[node.node_id] = node
+
+    async def call(self, sender: int, target: int, method: str, *args: Any) -> Any:
+        """Delivers one RPC and returns its result, or None if it was lost."""
+        if sender in self.down or target in self.down:
+            return None
+        if self.latency:
+            await asyncio.sleep(self.latency)
+            if target in self.down:
+                return None
+        result = self.nodes[target].receive(method, *args)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return None if sender in self.down else result
+
+
+class AsyncRaftNode:
+    """
+    Runs a RaftNode on an asyncio event loop.
+
+    One task per node sleeps until its randomized election timeout expires
+    (followers and candidates) or until the next heartbeat is due (leaders).
+    Heartbeats and the log entries they carry are sent as separate tasks, so
+    AppendEntries to all followers are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        node: RaftNode,
+        transport: InProcessTransport,
+        election_timeout: Tuple[float, float] = (0.15, 0.3),
+        heartbeat_interval: float = 0.05,
+        seed: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            node (RaftNode): The node state; its peers are the other nodes.
+            transport (InProcessTransport): The transport to the peers.
+            election_timeout (Tuple[float, float]): Range of the randomized
+                election timeout, in seconds.
+            heartbeat_interval (float): Time between leader heartbeats, in seconds.
+            seed (Optional[float]): Seed of the election timeout randomness.
+        """
+        self.node = node
+        self.transport = transport
+        self.election_timeout = election_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.random = random.Random(seed)
+        self.timeout = self.random.uniform(*election_timeout)
+        self.last_contact = 0.0
+        self.task: Optional[asyncio.Task] = None
+        self.sends: Set[asyncio.Task] = set()
+        transport.register(self)
+
+    @property
+    def node_id(self) -> int:
+        return self.node.node_id
+
+    @property
+    def alive(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def receive(self, method: str, *args: Any) -> Any:
+        """Handles an RPC from a peer; hearing from a leader resets the timer."""
+        node = self.node
+        if method == "request_vote":
+            granted = node.request_vote(*args)
+            if granted:
+                self.last_contact = asyncio.get_running_loop().time()
+            return granted
+        response = node.append_entries(*args)
+        if args[0] == node.current_term:
+            self.last_contact = asyncio.get_running_loop().time()
+        return response
+
+    def start(self) -> None:
+        self.last_contact = asyncio.get_running_loop().time()
+        self.task = asyncio.create_task(self._run())
+
+    def kill(self) -> None:
+        """Stops the node: its tasks are cancelled and its messages are lost."""
+        self.transport.down.add(self.node_id)
+        for task in [self.task, *self.sends]:
+            if task is not None:
+                task.cancel()
+
+    def restart(self) -> None:
+        """
+        Restarts a killed node as a follower.
+
+        The term, vote and log survive, as if they had been persisted; the
+        leader state does not.
+        """
+        self.transport.down.discard(self.node_id)
+        self.node.state = "follower"
+        self.start()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.node.state == "leader":
+                self.last_contact = loop.time()
+                self._send_heartbeats()
+                await asyncio.sleep(self.heartbeat_interval)
+                continue
+            remaining = self.last_contact + self.timeout - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            else:
+                await self._run_election()
+
+    async def _run_election(self) -> None:
+        """Requests votes from all peers at once; wins on a majority."""
+        node = self.node
+        node.state = "candidate"
+        node.current_term += 1
+        node.voted_for = node.node_id
+        node.vote_count = 1
+        term = node.current_term
+        self.last_contact = asyncio.get_running_loop().time()
+        self.timeout = self.random.uniform(*self.election_timeout)
+
+        calls = [
+            self.transport.call(
+                self.node_id,
+                peer.node_id,
+                "request_vote",
+                term,
+                node.node_id,
+                len(node.log),
+                node.get_last_log_term(),
+            )
+            for peer in node.peers
+        ]
+        for call in asyncio.as_completed(calls):
+            granted = await call
+            if node.state != "candidate" or node.current_term != term:
+                return
+            if granted:
+                node.vote_count += 1
+            if node.vote_count > len(node.peers) // 2:
+                node.become_leader()
+                self._send_heartbeats()
+                return
+
+    def _send_heartbeats(self) -> None:
+        for peer in self.node.peers:
+            for request in self.node.next_requests(peer.node_id):
+                task = asyncio.create_task(self._append_entries(peer.node_id, request))
+                self.sends.add(task)
+                task.add_done_callback(self.sends.discard)
+
+    async def _append_entries(
+        self, peer_id: int, request: AppendEntriesRequest
+    ) -> None:
+        response = await self.transport.call(
+            self.node_id, peer_id, "append_entries", *request
+        )
+        if response is None:
+            self.node.handle_append_entries_failure(peer_id, request)
+        else:
+            self.node.handle_append_entries_response(peer_id, request, response)
+
+
+class Cluster:
+    """A Raft cluster whose nodes all run on the current event loop."""
+
+    def __init__(
+        self,
+        size: int,
+        latency: float = 0.0,
+        election_timeout: Tuple[float, float] = (0.15, 0.3),
+        heartbeat_interval: float = 0.05,
+        seed: Optional[int] = None,
+        **node_options: Any,
+    ) -> None:
+        """
+        Args:
+            size (int): The number of nodes.
+            latency (float): One-way message delay, in seconds.
+            election_timeout (Tuple[float, float]): Range of the randomized
+                election timeout, in seconds.
+            heartbeat_interval (float): Time between leader heartbeats, in seconds.
+            seed (Optional[int]): Seed of the election timeouts.
+            **node_options: Extra RaftNode arguments, e.g. batch_size.
+        """
+        self.transport = InProcessTransport(latency)
+        cores = [RaftNode(i, [], verbose=False, **node_options) for i in range(size)]
+        for core in cores:
+            core.peers = [peer for peer in cores if peer is not core]
+        seeds = random.Random(seed)
+        self.nodes: List[AsyncRaftNode] = [
+            AsyncRaftNode(
+                core,
+                self.transport,
+                election_timeout,
+                heartbeat_interval,
+                seeds.random(),
+            )
+            for core in cores
+        ]
+
+    def start(self) -> None:
+        for node in self.nodes:
+            node.start()
+
+    def stop(self) -> None:
+        for node in self.nodes:
+            node.kill()
+
+    def revive(self) -> None:
+        """Restarts every killed node."""
+        for node in self.nodes:
+            if not node.alive:
+                node.restart()
+
+    def leader(self) -> Optional[AsyncRaftNode]:
+        """The live leader of the highest term, if any."""
+        leaders = [
+            node for node in self.nodes if node.alive and node.node.state == "leader"
+        ]
+        return max(leaders, key=lambda node: node.node.current_term, default=None)
+
+    async def wait_for_leader(
+        self, after_term: int = 0, timeout: float = 10.0, poll: float = 0.001
+    ) -> AsyncRaftNode:
+        """Waits until a live node leads a term later than `after_term`."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            leader = self.leader()
+            if leader is not None and leader.node.current_term > after_term:
+                return leader
+            await asyncio.sleep(poll)
+        raise TimeoutError(f"No leader elected within {timeout} seconds.")
+
+    async def measure_failover(self) -> float:
+        """
+        Kills the current leader and times the election of its successor.
+
+        Returns:
+            float: Seconds from the kill until a new leader is elected.
+        """
+        leader = await self.wait_for_leader()
+        term = leader.node.current_term
+        started = asyncio.get_running_loop().time()
+        leader.kill()
+        await self.wait_for_leader(after_term=term)
+        return asyncio.get_running_loop().time() - started
+
+
+async def failover_times(size: int, failovers: int, **options: Any) -> List[float]:
+    """
+    Runs a cluster and measures `failovers` successive leader failovers.
+
+    The killed leader is restarted after each failover, so every measurement
+    starts from a full cluster.
+    """
+    cluster = Cluster(size, **options)
+    cluster.start()
+    try:
+        times = []
+        for _ in range(failovers):
+            times.append(await cluster.measure_failover())
+            cluster.revive()
+        return times
+    finally:
+        cluster.stop()
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Run from the parent directory: python -m raft.runtime
+    for size in (5, 101, 301):
+        times = asyncio.run(failover_times(size, failovers=5, seed=0))
+        print(
+            f"{size} nodes: failover in {min(times) * 1000:.0f}-"
+            f"{max(times) * 1000:.0f} ms"
+        )
@@ -0,0 +1,423 @@
+import heapq
+import math
+import random
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .raft import AppendEntriesRequest, AppendEntriesResponse, RaftNode
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """The nearest-rank p-th percentile of `values` (0 <= p <= 100)."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class SimulationReport(NamedTuple):
+    simulated_time: float  # Seconds of virtual time
+    events: int
+    messages: int  # Messages sent, requests and responses
+    committed: int  # Entries committed cluster-wide
+    elections: int  # Leaders elected
+    # Seconds without a leader before each election: from the crash, partition
+    # or step-down of the last live leader; 0 if the old leader still believed
+    # it led when its successor won
+    election_latencies: List[float]
+    violations: List[str]
+
+    @property
+    def messages_per_commit(self) -> float:
+        return self.messages / self.committed if self.committed else math.inf
+
+    def election_percentile(self, p: float) -> float:
+        return percentile(self.election_latencies, p)
+
+
+class Simulator:
+    """
+    Deterministic discrete-event simulation of a Raft cluster.
+
+    Timer expiries, message deliveries and scheduled faults are events in a
+    priority queue ordered by virtual time; processing one event may schedule
+    others. All randomness (timeouts, latencies, drops) comes from one seeded
+    generator, so a seed always replays the same run.
+
+    The nodes are RaftNode objects, driven as in the asyncio runtime: an
+    election timer per follower, a heartbeat timer per leader, and
+    AppendEntries pipelined with `next_requests`.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        seed: int = 0,
+        latency: Tuple[float, float] = (0.001, 0.005),
+        drop_rate: float = 0.0,
+        election_timeout: Tuple[float, float] = (0.15, 0.3),
+        heartbeat_interval: float = 0.05,
+        **node_options: Any,
+    ) -> None:
+        """
+        Args:
+            size (int): The number of nodes.
+            seed (int): Seed of all the randomness of the run.
+            latency (Tuple[float, float]): Range of the one-way message delay,
+                in seconds.
+            drop_rate (float): Probability that a message is lost.
+            election_timeout (Tuple[float, float]): Range of the randomized
+                election timeout, in seconds.
+            heartbeat_interval (float): Time between leader heartbeats, in seconds.
+            **node_options: Extra RaftNode arguments, e.g. batch_size.
+        """
+        self.random = random.Random(seed)
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.election_timeout = election_timeout
+        self.heartbeat_interval = heartbeat_interval
+        # A lost AppendEntries is noticed by its sender after this long
+        self.rpc_timeout = 2 * heartbeat_interval
+
+        self.nodes = [
+            RaftNode(i, [], verbose=False, **node_options) for i in range(size)
+        ]
+        for node in self.nodes:
+            node.peers = [peer for peer in self.nodes if peer is not node]
+        self.crashed: Set[int] = set()
+        self.groups: Optional[Dict[int, int]] = None  # Node ID -> partition group
+        self.timers = [0] * size  # Generation of the live timer of each node
+
+        self.now = 0.0
+        self.queue: List[Tuple[float, int, Callable[..., None], tuple]] = []
+        self.sequence = 0
+        self.events = 0
+        self.messages = 0
+        self.proposals = 0
+
+        self.elections = 0
+        self.election_latencies: List[float] = []
+        self.leaderless_since: Optional[float] = 0.0
+        self.leaders: Dict[int, int] = {}  # Term -> leader
+        self.committed: List[dict] = []  # Entries committed on any node
+        self.checked = [0] * size  # Commit index checked on each node
+        self.violations: List[str] = []
+
+        for node in self.nodes:
+            self._reset_election_timer(node)
+
+    # Scheduling
+
+    def schedule(self, delay: float, handler: Callable[..., None], *args: Any) -> None:
+        """Runs `handler(*args)` after `delay` seconds of virtual time."""
+        self.sequence += 1
+        heapq.heappush(self.queue, (self.now + delay, self.sequence, handler, args))
+
+    def run(self, duration: float) -> SimulationReport:
+        """Processes events for `duration` seconds of virtual time."""
+        end = self.now + duration
+        queue = self.queue
+        while queue and queue[0][0] <= end:
+            self.now, _, handler, args = heapq.heappop(queue)
+            self.events += 1
+            handler(*args)
+        self.now = end
+        return self.report()
+
+    def report(self) -> SimulationReport:
+        return SimulationReport(
+            self.now,
+            self.events,
+            self.messages,
+            len(self.committed),
+            self.elections,
+            list(self.election_latencies),
+            list(self.violations),
+        )
+
+    # Faults and clients
+
+    def leader(self) -> Optional[RaftNode]:
+        """The live leader of the highest term, if any."""
+        leaders = [
+            node
+            for node in self.nodes
+            if node.state == "leader" and node.node_id not in self.crashed
+        ]
+        return max(leaders, key=lambda node: node.current_term, default=None)
+
+    def crash(self, node_id: int) -> None:
+        """Stops a node: it ignores its timers and the messages it receives."""
+        node = self.nodes[node_id]
+        if node is self.leader() and self.leaderless_since is None:
+            self.leaderless_since = self.now
+        self.crashed.add(node_id)
+
+    def restart(self, node_id: int) -> None:
+        """Restarts a crashed node as a follower with its term, vote and log."""
+        self.crashed.discard(node_id)
+        node = self.nodes[node_id]
+        node.state = "follower"
+        self._reset_election_timer(node)
+
+    def partition(self, *groups: Sequence[int]) -> None:
+        """Splits the network: messages only flow within each group."""
+        self.groups = {
+            node_id: i for i, group in enumerate(groups) for node_id in group
+        }
+        leader = self.leader()
+        if leader is not None and self.leaderless_since is None:
+            group = self.groups.get(leader.node_id)
+            reachable = sum(1 for g in self.groups.values() if g == group)
+            if reachable <= len(self.nodes) // 2:
+                self.leaderless_since = self.now
+
+    def heal(self) -> None:
+        self.groups = None
+
+    def crash_leader_every(self, interval: float, downtime: float) -> None:
+        """Crashes the current leader every `interval` seconds for `downtime`."""
+
+        def crash_leader() -> None:
+            leader = self.leader()
+            if leader is not None:
+                self.crash(leader.node_id)
+                self.schedule(downtime, self.restart, leader.node_id)
+            self.schedule(interval, crash_leader)
+
+        self.schedule(interval, crash_leader)
+
+    def propose_every(self, interval: float) -> None:
+        """Proposes a new command to the current leader every `interval` seconds."""
+
+        def propose() -> None:
+            leader = self.leader()
+            if leader is not None:
+                self.proposals += 1
+                leader.propose(self.proposals)
+            self.schedule(interval, propose)
+
+        self.schedule(interval, propose)
+
+    # Messages
+
+    def _send(self, source: int, target: int, handler: Callable, *args: Any) -> bool:
+        """Sends a message; returns False if it is lost."""
+        self.messages += 1
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            return False
+        if self.groups is not None and self.groups.get(source) != self.groups.get(
+            target
+        ):
+            return False
+        self.schedule(self.random.uniform(*self.latency), handler, target, *args)
+        return True
+
+    def _send_append_entries(self, leader: RaftNode) -> None:
+        for peer in leader.peers:
+            for request in leader.next_requests(peer.node_id):
+                if not self._send(
+                    leader.node_id,
+                    peer.node_id,
+                    self._on_append_entries,
+                    leader.node_id,
+                    request,
+                ):
+                    self.schedule(
+                        self.rpc_timeout,
+                        self._on_append_entries_lost,
+                        leader.node_id,
+                        peer.node_id,
+                        request,
+                    )
+
+    # Event handlers
+
+    def _reset_election_timer(self, node: RaftNode) -> None:
+        self.timers[node.node_id] += 1
+        timeout = self.random.uniform(*self.election_timeout)
+        self.schedule(timeout, self._on_timer, node.node_id, self.timers[node.node_id])
+
+    def _on_timer(self, node_id: int, generation: int) -> None:
+        if node_id in self.crashed or generation != self.timers[node_id]:
+            return
+        node = self.nodes[node_id]
+        if node.state == "leader":
+            self._send_append_entries(node)
+            self.timers[node_id] += 1
+            self.schedule(
+                self.heartbeat_interval, self._on_timer, node_id, self.timers[node_id]
+            )
+            return
+
+        node.state = "candidate"
+        node.current_term += 1
+        node.voted_for = node_id
+        node.vote_count = 1
+        for peer in node.peers:
+            self._send(
+                node_id,
+                peer.node_id,
+                self._on_request_vote,
+                node_id,
+                node.current_term,
+                len(node.log),
+                node.get_last_log_term(),
+            )
+        self._reset_election_timer(node)
+        self._count_vote(node)
+
+    def _on_request_vote(
+        self,
+        node_id: int,
+        candidate_id: int,
+        term: int,
+        last_index: int,
+        last_term: int,
+    ) -> None:
+        if node_id in self.crashed:
+            return
+        node = self.nodes[node_id]
+        was_leader = node.state == "leader"
+        granted = node.request_vote(term, candidate_id, last_index, last_term)
+        if was_leader and node.state != "leader":
+            self._stepped_down(node)
+        elif granted:
+            self._reset_election_timer(node)
+        self._send(
+            node_id,
+            candidate_id,
+            self._on_vote,
+            term,
+            granted,
+            node.current_term,
+        )
+
+    def _on_vote(self, node_id: int, term: int, granted: bool, voter_term: int) -> None:
+        if node_id in self.crashed:
+            return
+        node = self.nodes[node_id]
+        if voter_term > node.current_term:
+            was_leader = node.state == "leader"
+            node.step_down(voter_term)
+            if was_leader:
+                self._stepped_down(node)
+            return
+        if node.state != "candidate" or node.current_term != term:
+            return
+        if granted:
+            node.vote_count += 1
+            self._count_vote(node)
+
+    def _stepped_down(self, node: RaftNode) -> None:
+        """A leader became a follower; the cluster may now have no leader."""
+        self._reset_election_timer(node)
+        if self.leaderless_since is None and self.leader() is None:
+            self.leaderless_since = self.now
+
+    def _count_vote(self, node: RaftNode) -> None:
+        if node.state != "candidate" or node.vote_count <= len(node.peers) // 2:
+            return
+        node.become_leader()
+        self.elections += 1
+        if self.leaderless_since is None:
+            self.election_latencies.append(0.0)
+        else:
+            self.election_latencies.append(self.now - self.leaderless_since)
+            self.leaderless_since = None
+        leader = self.leaders.setdefault(node.current_term, node.node_id)
+        if leader != node.node_id:
+            self.violations.append(
+                f"Term {node.current_term} has two leaders: {leader} and {node.node_id}"
+            )
+        # Assert leadership at once rather than at the next heartbeat
+        self.timers[node.node_id] += 1
+        self._on_timer(node.node_id, self.timers[node.node_id])
+
+    def _on_append_entries(
+        self, node_id: int, leader_id: int, request: AppendEntriesRequest
+    ) -> None:
+        if node_id in self.crashed:
+            self.schedule(
+                self.rpc_timeout,
+                self._on_append_entries_lost,
+                leader_id,
+                node_id,
+                request,
+            )
+            return
+        node = self.nodes[node_id]
+        was_leader = node.state == "leader"
+        response = node.append_entries(*request)
+        if was_leader and node.state != "leader":
+            self._stepped_down(node)
+        elif request.term == node.current_term:
+            self._reset_election_timer(node)
+        self._check_commits(node)
+        if not self._send(
+            node_id,
+            leader_id,
+            self._on_append_entries_response,
+            node_id,
+            request,
+            response,
+        ):
+            self.schedule(
+                self.rpc_timeout,
+                self._on_append_entries_lost,
+                leader_id,
+                node_id,
+                request,
+            )
+
+    def _on_append_entries_response(
+        self,
+        node_id: int,
+        peer_id: int,
+        request: AppendEntriesRequest,
+        response: AppendEntriesResponse,
+    ) -> None:
+        if node_id in self.crashed:
+            return
+        node = self.nodes[node_id]
+        was_leader = node.state == "leader"
+        node.handle_append_entries_response(peer_id, request, response)
+        if was_leader and node.state != "leader":
+            self._stepped_down(node)
+        self._check_commits(node)
+
+    def _on_append_entries_lost(
+        self, node_id: int, peer_id: int, request: AppendEntriesRequest
+    ) -> None:
+        if node_id not in self.crashed:
+            self.nodes[node_id].handle_append_entries_failure(peer_id, request)
+
+    # Safety
+
+    def _check_commits(self, node: RaftNode) -> None:
+        """Checks newly committed entries against those committed elsewhere."""
+        checked = self.checked[node.node_id]
+        for index in range(checked + 1, node.commit_index + 1):
+            entry = node.log[index - 1]
+            if index > len(self.committed):
+                self.committed.append(entry)
+            elif self.committed[index - 1] != entry:
+                self.violations.append(
+                    f"Node {node.node_id} committed {entry} at index {index}, "
+                    f"others committed {self.committed[index - 1]}"
+                )
+        self.checked[node.node_id] = max(checked, node.commit_index)
+
+
+# Example usage:
+if __name__ == "__main__":
+    # Run from the parent directory: python -m raft.simulator
+    simulator = Simulator(5, seed=42, drop_rate=0.01)
+    simulator.crash_leader_every(interval=2.0, downtime=1.0)
+    simulator.propose_every(0.01)
+    report = simulator.run(600.0)
+    print(f"{report.elections} elections, {report.committed} entries committed")
+    for p in (50, 90, 99):
+        print(f"p{p} election latency: {report.election_percentile(p) * 1000:.0f} ms")
+    print(f"{report.messages_per_commit:.1f} messages per committed entry")
+    print(f"Safety violations: {report.violations or 'none'}")
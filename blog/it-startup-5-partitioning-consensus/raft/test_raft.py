@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from .raft import RaftNode
+from .raft import AppendEntriesResponse, RaftNode
 
 
 # Import the RaftNode class from the module where it is defined
@@ -20,8 +20,7 @@ def setup_nodes():
 def test_election_process(setup_nodes):
     nodes = setup_nodes
 
-    with patch("time.sleep", return_value=None):  # Patch sleep to speed up the test
-        nodes[0].start_election()
+    nodes[0].start_election()
 
     # Check that node 0 became the leader
     assert nodes[0].state == "leader"
@@ -44,13 +43,11 @@ def test_vote_request_and_grant(setup_nodes):
 def test_leader_append_entries(setup_nodes):
     nodes = setup_nodes
 
-    with patch("time.sleep", return_value=None):  # Patch sleep to speed up the test
-        nodes[0].start_election()
+    nodes[0].start_election()
 
     # After becoming leader, node 0 should send heartbeats
     assert nodes[0].state == "leader"
-    with patch("time.sleep", return_value=None):  # Patch sleep to speed up the test
-        nodes[0].leader_append_entries()
+    nodes[0].leader_append_entries()
 
     # Ensure that all followers received the append_entries call
     for node in nodes[1:]:
@@ -86,8 +83,175 @@ def test_log_consistency_during_election(setup_nodes):
     nodes[4].log = [{"term": 1}]
 
     # Node 1 has the most up-to-date log and should win the election
-    with patch("time.sleep", return_value=None):  # Patch sleep to speed up the test
-        nodes[1].start_election()
+    nodes[1].start_election()
 
     assert nodes[1].state == "leader"
     assert all(node.state == "follower" for node in nodes if node != nodes[1])
+
+
+def make_leader(nodes, term=1):
+    leader = nodes[0]
+    for node in nodes:
+        node.current_term = term
+    leader.become_leader()
+    return leader
+
+
+def test_propose_replicates_and_commits(setup_nodes):
+    nodes = setup_nodes
+    nodes[0].start_election()
+    leader = nodes[0]
+    leader.batch_size = 16
+    indexes = [leader.propose(f"set x {i}") for i in range(100)]
+    assert indexes == list(range(1, 101))
+    while leader.commit_index < 100:
+        leader.replicate()
+    leader.replicate()  # Heartbeat carrying the commit index
+    for node in nodes:
+        assert node.log == leader.log
+        assert node.commit_index == 100
+    with pytest.raises(ValueError):
+        nodes[1].propose("set y 1")
+
+
+def test_next_requests_pipelines_batches():
+    nodes = [RaftNode(i, [], batch_size=10, max_inflight=3) for i in range(3)]
+    nodes[0].peers = nodes[1:]
+    leader = make_leader(nodes)
+    for i in range(50):
+        leader.propose(i)
+    requests = leader.next_requests(1)
+    assert [request.prev_log_index for request in requests] == [0, 10, 20]
+    assert all(len(request.entries) == 10 for request in requests)
+    # A full pipeline still gets a heartbeat, at the last index known to match
+    (heartbeat,) = leader.next_requests(1)
+    assert heartbeat.entries == [] and heartbeat.prev_log_index == 0
+
+    for request in requests:
+        leader.handle_append_entries_response(
+            1, request, nodes[1].append_entries(*request)
+        )
+    assert leader.match_index[1] == 30
+    assert leader.commit_index == 30
+    assert [request.prev_log_index for request in leader.next_requests(1)] == [30, 40]
+
+
+def test_heartbeat_never_lowers_follower_commit_index():
+    nodes = [RaftNode(i, [], batch_size=4, max_inflight=2) for i in range(3)]
+    nodes[0].peers = nodes[1:]
+    leader = make_leader(nodes)
+    for i in range(12):
+        leader.propose(i)
+    while leader.match_index[2] < 12:
+        for request in leader.next_requests(2):
+            leader.handle_append_entries_response(
+                2, request, nodes[2].append_entries(*request)
+            )
+    assert leader.commit_index == 12
+
+    # Node 1 applies two pipelined batches whose responses are still in flight
+    for request in leader.next_requests(1):
+        nodes[1].append_entries(*request)
+    assert nodes[1].commit_index == 8
+    (heartbeat,) = leader.next_requests(1)
+    assert heartbeat.prev_log_index == 0 and heartbeat.leader_commit == 12
+    assert nodes[1].append_entries(*heartbeat)
+    assert nodes[1].commit_index == 8
+
+
+def test_conflicting_log_backs_off_by_term(setup_nodes):
+    nodes = setup_nodes
+    for node in nodes:
+        node.log = [{"term": 1}] * 10
+    nodes[1].log = nodes[1].log + [{"term": 2}] * 40  # From a deposed leader
+    nodes[0].log = nodes[0].log + [{"term": 3}] * 5
+    leader = make_leader(nodes, term=3)
+
+    calls = []
+    append_entries = nodes[1].append_entries
+
+    def counted(*args):
+        calls.append(args)
+        return append_entries(*args)
+
+    nodes[1].append_entries = counted
+    while leader.commit_index < 15 or leader.match_index[1] < 15:
+        leader.replicate()
+    assert nodes[1].log == leader.log
+    # One rejected request skips all 40 stale entries, the next one repairs
+    assert len(calls) == 2
+    assert calls[1][3] == 10
+
+
+def test_commit_needs_majority_of_current_term(setup_nodes):
+    nodes = setup_nodes
+    for node in nodes:
+        node.log = [{"term": 1}]
+    leader = make_leader(nodes, term=2)
+    for peer_id in (1, 2):
+        for request in leader.next_requests(peer_id):
+            response = nodes[peer_id].append_entries(*request)
+            leader.handle_append_entries_response(peer_id, request, response)
+    assert leader.match_index[1] == 1
+    assert leader.commit_index == 0  # Only entries of the current term count
+
+    leader.propose("x")
+    for request in leader.next_requests(1):
+        leader.handle_append_entries_response(
+            1, request, nodes[1].append_entries(*request)
+        )
+    assert leader.commit_index == 0  # Two of five nodes
+    for request in leader.next_requests(2):
+        leader.handle_append_entries_response(
+            2, request, nodes[2].append_entries(*request)
+        )
+    assert leader.commit_index == 2
+
+
+def test_leader_steps_down_on_newer_term(setup_nodes):
+    nodes = setup_nodes
+    leader = make_leader(nodes, term=2)
+    assert not nodes[1].append_entries(1, 3, [])
+    assert nodes[1].append_entries(2, 0, [])
+    (request,) = leader.next_requests(1)
+    leader.handle_append_entries_response(1, request, AppendEntriesResponse(5, False))
+    assert leader.state == "follower"
+    assert leader.current_term == 5
+
+
+def test_vote_refused_to_stale_term(setup_nodes):
+    nodes = setup_nodes
+    # Node 1 learned term 3 from a heartbeat and has not voted in it
+    nodes[1].append_entries(3, 0, [])
+    assert nodes[1].voted_for is None
+    assert not nodes[1].request_vote(2, 4, 0, 0)
+    assert nodes[1].voted_for is None
+    assert nodes[1].request_vote(3, 4, 0, 0)
+
+
+def test_failure_from_restarted_pipeline_is_ignored():
+    nodes = [RaftNode(i, [], batch_size=5, max_inflight=2) for i in range(3)]
+    nodes[0].peers = nodes[1:]
+    leader = make_leader(nodes)
+    for i in range(30):
+        leader.propose(i)
+    first, second = leader.next_requests(1)
+    leader.handle_append_entries_response(
+        1, first, AppendEntriesResponse(1, False, conflict_index=1)
+    )
+    restarted = leader.next_requests(1)
+    assert [request.prev_log_index for request in restarted] == [0, 5]
+
+    # The old pipeline's second failure neither restarts nor frees a slot
+    leader.handle_append_entries_response(
+        1, second, AppendEntriesResponse(1, False, conflict_index=1)
+    )
+    leader.handle_append_entries_failure(1, second)
+    assert len(leader.inflight[1]) == 2
+    assert leader.next_requests(1)[0].entries == []
+    for request in restarted:
+        leader.handle_append_entries_response(
+            1, request, nodes[1].append_entries(*request)
+        )
+    assert leader.match_index[1] == 10
+    assert [request.prev_log_index for request in leader.next_requests(1)] == [10, 15]
@@ -0,0 +1,93 @@
+import asyncio
+
+from .raft import RaftNode
+from .runtime import Cluster, failover_times
+
+FAST = {"election_timeout": (0.03, 0.06), "heartbeat_interval": 0.01}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_cluster_elects_one_leader():
+    async def scenario():
+        cluster = Cluster(5, seed=1, **FAST)
+        cluster.start()
+        leader = await cluster.wait_for_leader()
+        await asyncio.sleep(0.1)  # Heartbeats keep the leader in place
+        assert cluster.leader() is leader
+        term = leader.node.current_term
+        assert all(node.node.current_term == term for node in cluster.nodes)
+        assert [node.node.state for node in cluster.nodes].count("leader") == 1
+        cluster.stop()
+
+    run(scenario())
+
+
+def test_proposals_replicate_through_the_runtime():
+    async def scenario():
+        cluster = Cluster(5, seed=2, latency=0.001, batch_size=8, **FAST)
+        cluster.start()
+        leader = await cluster.wait_for_leader()
+        for i in range(100):
+            leader.node.propose(i)
+        while min(node.node.commit_index for node in cluster.nodes) < 100:
+            await asyncio.sleep(0.01)
+        assert all(node.node.log == leader.node.log for node in cluster.nodes)
+        cluster.stop()
+
+    run(scenario())
+
+
+def test_failover_after_leader_is_killed():
+    async def scenario():
+        cluster = Cluster(5, seed=3, **FAST)
+        cluster.start()
+        leader = await cluster.wait_for_leader()
+        elapsed = await cluster.measure_failover()
+        assert not leader.alive
+        new_leader = cluster.leader()
+        assert new_leader is not leader
+        assert new_leader.node.current_term > leader.node.current_term
+        assert 0 < elapsed < 1
+
+        # The old leader rejoins as a follower of the new term
+        cluster.revive()
+        await asyncio.sleep(0.05)
+        assert leader.node.state == "follower"
+        assert leader.node.current_term == new_leader.node.current_term
+        cluster.stop()
+
+    run(scenario())
+
+
+def test_repeated_failovers():
+    # A small cluster with a wide timeout spread, so a slow event loop does not
+    # make every node time out at once; large clusters are covered by the
+    # simulator tests instead of wall-clock timing
+    times = run(
+        failover_times(
+            9,
+            failovers=2,
+            seed=4,
+            election_timeout=(0.05, 0.25),
+            heartbeat_interval=0.01,
+        )
+    )
+    assert len(times) == 2
+    assert all(0 < elapsed < 5 for elapsed in times)
+
+
+def test_lost_request_is_sent_again():
+    nodes = [RaftNode(i, [], batch_size=2, verbose=False) for i in range(3)]
+    nodes[0].peers = nodes[1:]
+    nodes[0].become_leader()
+    for i in range(6):
+        nodes[0].propose(i)
+    first, second, third = nodes[0].next_requests(1)
+    nodes[0].handle_append_entries_response(1, first, nodes[1].append_entries(*first))
+    nodes[0].handle_append_entries_failure(1, second)
+    nodes[0].handle_append_entries_failure(1, third)
+    requests = nodes[0].next_requests(1)
+    assert [request.prev_log_index for request in requests] == [2, 4]
@@ -0,0 +1,114 @@
+import math
+
+from .simulator import Simulator, percentile
+
+
+def test_percentile():
+    values = [0.4, 0.1, 0.3, 0.2]
+    assert percentile(values, 50) == 0.2
+    assert percentile(values, 100) == 0.4
+    assert percentile(values, 0) == 0.1
+    assert math.isnan(percentile([], 50))
+
+
+def test_same_seed_replays_the_same_run():
+    def run(seed):
+        simulator = Simulator(5, seed, drop_rate=0.05)
+        simulator.crash_leader_every(interval=1.0, downtime=0.5)
+        simulator.propose_every(0.05)
+        return simulator.run(20.0)
+
+    assert run(1) == run(1)
+    assert run(1) != run(2)
+
+
+def test_cold_start_elects_one_leader():
+    simulator = Simulator(5, seed=3)
+    report = simulator.run(1.0)
+    assert report.elections == 1
+    assert 0.15 <= report.election_latencies[0] < 0.5
+    leader = simulator.leader()
+    assert [node.state for node in simulator.nodes].count("leader") == 1
+    assert all(node.current_term == leader.current_term for node in simulator.nodes)
+
+
+def test_leader_crashes_keep_the_cluster_safe():
+    simulator = Simulator(5, seed=4, drop_rate=0.02)
+    simulator.crash_leader_every(interval=1.0, downtime=0.5)
+    simulator.propose_every(0.01)
+    report = simulator.run(60.0)
+    assert report.elections >= 60
+    assert len(report.election_latencies) == report.elections
+    assert report.election_percentile(50) < 0.5
+    assert report.committed > 4000
+    assert report.violations == []
+
+
+def test_partitioned_leader_is_replaced():
+    simulator = Simulator(5, seed=5)
+    simulator.propose_every(0.01)
+    simulator.run(1.0)
+    old = simulator.leader()
+    minority = [old.node_id, (old.node_id + 1) % 5]
+    simulator.partition(minority, [i for i in range(5) if i not in minority])
+    simulator.run(1.0)
+
+    # The old leader cannot commit; the majority elects a new one
+    new = simulator.leader()
+    assert new is not old and new.current_term > old.current_term
+    assert old.state == "leader" and old.commit_index < new.commit_index
+
+    simulator.heal()
+    report = simulator.run(1.0)
+    assert old.state == "follower"
+    assert report.elections == 2
+    assert len(report.election_latencies) == 2
+    assert report.violations == []
+    for node in simulator.nodes:
+        assert node.commit_index > 0
+        assert node.log[: node.commit_index] == new.log[: node.commit_index]
+
+
+def test_divergent_commit_is_a_violation():
+    simulator = Simulator(3, seed=6)
+    simulator.propose_every(0.01)
+    simulator.run(1.0)
+    node = simulator.nodes[0]
+    node.log[0] = {"term": node.log[0]["term"], "command": "forged"}
+    simulator.checked[0] = 0
+    simulator._check_commits(node)
+    assert len(simulator.violations) == 1
+
+
+def test_every_election_has_a_latency():
+    # Lost messages depose live leaders without any crash or partition
+    simulator = Simulator(5, seed=1, drop_rate=0.2)
+    report = simulator.run(60.0)
+    assert report.elections > 1
+    assert len(report.election_latencies) == report.elections
+    assert report.violations == []
+
+
+def test_leader_deposed_by_vote_reply_starts_the_clock():
+    simulator = Simulator(5, seed=8)
+    simulator.run(1.0)
+    leader = simulator.leader()
+    term = leader.current_term
+
+    # A late vote reply from a peer that moved to a newer term
+    simulator._on_vote(leader.node_id, term, False, term + 1)
+    assert leader.state == "follower"
+    assert simulator.leaderless_since == simulator.now
+    report = simulator.run(1.0)
+    assert report.elections == 2
+    assert report.election_latencies[1] >= 0.15
+    assert report.violations == []
+
+
+def test_hundreds_of_nodes_fail_over():
+    simulator = Simulator(200, seed=7)
+    simulator.crash_leader_every(interval=1.0, downtime=0.5)
+    report = simulator.run(4.0)
+    assert report.elections >= 4
+    assert report.election_percentile(100) < 1
+    assert report.violations == []